@@ -0,0 +1,118 @@
+"""
+Bytes on the wire and wall-clock time of compressed model-file uploads.
+
+Each sample file type is uploaded to the stand-in server through a link
+paced to a fixed rate, as a stand-in for the WAN, once per encoding:
+
+    python -m benchmarks.compression --size 16MiB --link-rate 12.5MiB
+"""
+
+import json
+import os
+import random
+import struct
+import tempfile
+import time
+
+import click
+
+from src.utils.compression import CompressedBody, available_encodings
+from src.utils.helpers.byte_size import ByteSize, format_byte_size
+from src.utils.multipart import MultipartEncoder
+from test.api.stand_in_server import run_stand_in_server, stand_in_client
+
+
+def float16_weights(size):
+    """Normally distributed weights, as in a .safetensors shard."""
+    count = size // 2
+    return struct.pack(f"<{count}e", *(random.gauss(0, 0.02) for _ in range(count)))
+
+
+def quantized_weights(size):
+    """4-bit blocks with a float16 scale each, as in a Q4_0 .gguf file."""
+    blocks = []
+    for _ in range(size // 18):
+        blocks.append(struct.pack("<e", random.gauss(0, 0.01)) + os.urandom(16))
+    return b"".join(blocks)
+
+
+def tokenizer(size):
+    """A tokenizer.json vocabulary."""
+    vocab, index = {}, 0
+    text = ""
+    while len(text) < size:
+        for _ in range(5000):
+            word = "".join(random.choices("abcdefghijklmnopqrstuvwxyz", k=6))
+            vocab[f"Ġ{word}"] = index
+            index += 1
+        text = json.dumps({"model": {"type": "BPE", "vocab": vocab}})
+    return text.encode()[:size]
+
+
+SAMPLES = {
+    "model.safetensors": float16_weights,
+    "model-q4_0.gguf": quantized_weights,
+    "tokenizer.json": tokenizer,
+}
+
+
+def paced(blocks, rate, sent):
+    """Send `blocks` no faster than `rate` bytes a second; count them in `sent`."""
+    started = time.perf_counter()
+    for block in blocks:
+        sent[0] += len(block)
+        delay = sent[0] / rate - (time.perf_counter() - started)
+        if delay > 0:
+            time.sleep(delay)
+        yield block
+
+
+@click.command()
+@click.option("--size", default="16MiB", type=ByteSize(), help="Sample file size.")
+@click.option(
+    "--link-rate",
+    default="12.5MiB",
+    type=ByteSize(),
+    help="Simulated link speed per second; 12.5MiB is about 100 Mbit/s.",
+)
+def main(size, link_rate):
+    """Print bytes sent and upload time per file type and encoding."""
+    encodings = [None, *reversed(available_encodings())]
+    with tempfile.TemporaryDirectory() as directory, run_stand_in_server() as server:
+        server.state.encodings = set(available_encodings())
+        client = stand_in_client(server)
+        click.echo(
+            f"{format_byte_size(size)} samples over a "
+            f"{format_byte_size(link_rate)}/s link"
+        )
+        for name, make in SAMPLES.items():
+            path = os.path.join(directory, name)
+            with open(path, "wb") as file:
+                file.write(make(size))
+            click.echo(f"\n{name}")
+            for encoding in encodings:
+                encoder = MultipartEncoder("file", path)
+                headers = {"Content-Type": encoder.content_type}
+                body = encoder
+                if encoding:
+                    headers["Content-Encoding"] = encoding
+                    body = CompressedBody(encoder, encoding)
+                sent = [0]
+                started = time.perf_counter()
+                client.post(
+                    "models",
+                    params={"model_id": "bench"},
+                    headers=headers,
+                    body=paced(body, link_rate, sent),
+                )
+                elapsed = time.perf_counter() - started
+                ratio = sent[0] / len(encoder)
+                click.echo(
+                    f"  {encoding or 'none':>5}: {format_byte_size(sent[0]):>10} "
+                    f"({ratio:4.0%})  {elapsed:6.2f}s"
+                )
+                server.state.models.clear()
+
+
+if __name__ == "__main__":
+    main()
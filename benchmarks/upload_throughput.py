@@ -0,0 +1,55 @@
+"""
+Upload throughput of chunked model-file uploads against the stand-in server.
+
+    python -m benchmarks.upload_throughput --size 256MiB --part-size 8MiB \
+        --parallel 1,2,4,8,16
+"""
+
+import os
+import tempfile
+import time
+
+import click
+
+from src.api.chunked_upload import ChunkedUploader, UploadSessionStore
+from src.utils.helpers.byte_size import ByteSize, format_byte_size
+from test.api.stand_in_server import run_stand_in_server, stand_in_client
+
+
+def make_file(directory, size):
+    path = os.path.join(directory, "weights.bin")
+    block = os.urandom(1024**2)
+    with open(path, "wb") as file:
+        for offset in range(0, size, len(block)):
+            file.write(block[: size - offset])
+    return path
+
+
+@click.command()
+@click.option("--size", default="256MiB", type=ByteSize(), help="File size.")
+@click.option("--part-size", default="8MiB", type=ByteSize(), help="Part size.")
+@click.option(
+    "--parallel", default="1,2,4,8,16", help="Comma-separated parallelism levels."
+)
+@click.option("--repeat", default=3, type=click.IntRange(min=1), help="Runs each.")
+def main(size, part_size, parallel, repeat):
+    """Print the best throughput for each parallelism level."""
+    with tempfile.TemporaryDirectory() as directory, run_stand_in_server() as server:
+        path = make_file(directory, size)
+        client = stand_in_client(server)
+        store = UploadSessionStore(os.path.join(directory, "uploads"))
+        click.echo(f"{format_byte_size(size)} in {format_byte_size(part_size)} parts")
+        for level in [int(p) for p in parallel.split(",")]:
+            uploader = ChunkedUploader(client, part_size, level, store)
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                uploader.upload(path, model_id="bench", overwrite=True)
+                best = min(best, time.perf_counter() - started)
+                server.state.models.clear()
+            rate = format_byte_size(size / best)
+            click.echo(f"  parallel {level:>3}: {best:6.2f}s  {rate}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,61 @@
+import functools
+import time
+import uuid
 from io import BufferedReader
 import requests
-from typing import Optional, Dict, Any
-from src.config.settings import API_BASE_URL
+from typing import Optional, Dict, Any, Iterable, Tuple, Union
+from src.api.retry import RetryPolicy, RetryStats
+from src.api.session import create_session
+from src.config.settings import (
+    API_BASE_URL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+)
+from src.utils.credential_provider import CredentialProvider
+from src.utils.deadline import get_deadline
 from src.utils.password_handler import PasswordHandler
 
 SERVICE_NAME = "quack"
 
+Body = Union[bytes, memoryview, Iterable[bytes]]
+
 
 class APIClient:
-    def __init__(self, base_url: str = API_BASE_URL):
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        credentials: Optional[CredentialProvider] = None,
+        session: Optional[requests.Session] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        timeout: Tuple[float, float] = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT),
+    ):
         self.base_url: str = base_url
-        self.password_handler: PasswordHandler = PasswordHandler(SERVICE_NAME)
-        self.session: requests.Session = requests.Session()
-        self.api_key: Optional[str] = self.get_api_key()
-        self.access_token: Optional[str] = self.get_access_token()
+        # credentials are read from the keyring on first use, not here
+        self.credentials: CredentialProvider = credentials or CredentialProvider(
+            PasswordHandler(SERVICE_NAME)
+        )
+        self.password_handler: PasswordHandler = self.credentials.password_handler
+        self.session: requests.Session = session or create_session()
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.retry_stats: RetryStats = RetryStats()
+        # (connect, read) seconds, further capped by the command deadline
+        self.timeout: Tuple[float, float] = timeout
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return self.credentials.get("api_key")
+
+    @api_key.setter
+    def api_key(self, api_key: Optional[str]) -> None:
+        self.credentials.override("api_key", api_key)
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self.credentials.get("access_token")
+
+    @access_token.setter
+    def access_token(self, token: Optional[str]) -> None:
+        self.credentials.override("access_token", token)
 
     def _make_request(
         self,
@@ -23,7 +65,43 @@ class APIClient:
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
         files: Optional[Dict[str, BufferedReader]] = None,
+        idempotent: bool = False,
+        body: Optional[Body] = None,
     ) -> Dict[str, Any]:
+        response = self._send(
+            method, endpoint, data, params, headers, files, idempotent, body
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        files: Optional[Dict[str, BufferedReader]] = None,
+        idempotent: bool = False,
+        body: Optional[Body] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Send a request, retrying transient failures according to the policy.
+
+        Every attempt, and every wait between attempts, has to fit in the
+        remaining command deadline; `DeadlineExceeded` is raised once the
+        budget is spent.
+
+        :param idempotent: mark a non-idempotent method (POST) as safe to
+                           retry; an `Idempotency-Key` header is sent so the
+                           server can drop duplicates
+        :param body: raw request body, sent as is instead of JSON; an iterable
+                     of blocks is streamed, and iterated again on a retry
+        :param stream: leave the response body unread, for the caller to
+                       stream and close
+        :return: the last response, whatever its status
+        """
         url: str = f"{self.base_url}/{endpoint}"
         headers = headers or {}
 
@@ -31,18 +109,57 @@ class APIClient:
             headers["X-API-Key"] = self.api_key
         elif not self.api_key and self.access_token:
             headers["Authorization"] = f"Bearer {self.access_token}"
+        if idempotent:
+            headers.setdefault("Idempotency-Key", str(uuid.uuid4()))
 
-        response: requests.Response = self.session.request(
-            method,
-            url,
-            json=data if endpoint != "auth" else None,
-            data=data if endpoint == "auth" else None,
-            params=params,
-            headers=headers,
-            files=files,
-        )
-        response.raise_for_status()
-        return response.json()
+        retryable: bool = self.retry_policy.allows(method, idempotent)
+        deadline = get_deadline()
+        attempt: int = 0
+        while True:
+            remaining = deadline.check()
+            if attempt:
+                _rewind(files)
+            try:
+                response: requests.Response = self.session.request(
+                    method,
+                    url,
+                    json=data if endpoint != "auth" else None,
+                    data=data if endpoint == "auth" else body,
+                    params=params,
+                    headers=headers,
+                    files=files,
+                    timeout=self._timeout(remaining),
+                    stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if not retryable or attempt + 1 >= self.retry_policy.max_attempts:
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+                if not _has_time_for(delay):
+                    raise
+            else:
+                if (
+                    not retryable
+                    or attempt + 1 >= self.retry_policy.max_attempts
+                    or not self.retry_policy.retries_status(response.status_code)
+                ):
+                    break
+                delay = self.retry_policy.delay(
+                    attempt, response.headers.get("Retry-After")
+                )
+                if delay is None or not _has_time_for(delay):
+                    break
+                response.close()
+            self.retry_stats.record(delay)
+            time.sleep(delay)
+            attempt += 1
+        return response
+
+    def _timeout(self, remaining: Optional[float]) -> Tuple[float, float]:
+        if remaining is None:
+            return self.timeout
+        connect, read = self.timeout
+        return (min(connect, remaining), min(read, remaining))
 
     def get(
         self,
@@ -52,6 +169,27 @@ class APIClient:
     ) -> Dict[str, Any]:
         return self._make_request("GET", endpoint, params=params, headers=headers)
 
+    def stream(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> requests.Response:
+        """
+        GET a response whose body is read incrementally.
+
+        Close the response when done, e.g. by using it as a context manager.
+        """
+        response = self._send(
+            "GET", endpoint, params=params, headers=headers, stream=True
+        )
+        if not response.ok:
+            # read the error body so handlers can still parse it
+            response.content
+            response.close()
+            response.raise_for_status()
+        return response
+
     def post(
         self,
         endpoint: str,
@@ -59,9 +197,18 @@ class APIClient:
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
         files: Optional[Dict[str, BufferedReader]] = None,
+        idempotent: bool = False,
+        body: Optional[Body] = None,
     ) -> Dict[str, Any]:
         return self._make_request(
-            "POST", endpoint, data=data, params=params, headers=headers, files=files
+            "POST",
+            endpoint,
+            data=data,
+            params=params,
+            headers=headers,
+            files=files,
+            idempotent=idempotent,
+            body=body,
         )
 
     def put(
@@ -71,9 +218,16 @@ class APIClient:
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
         files: Optional[Dict[str, str]] = None,
+        body: Optional[Body] = None,
     ) -> Dict[str, Any]:
         return self._make_request(
-            "PUT", endpoint, data=data, params=params, headers=headers, files=files
+            "PUT",
+            endpoint,
+            data=data,
+            params=params,
+            headers=headers,
+            files=files,
+            body=body,
         )
 
     def delete(
@@ -88,33 +242,53 @@ class APIClient:
         )
 
     def set_access_token(self, token: str) -> None:
-        self.access_token = token
-        self.password_handler.set_password("access_token", token)
+        self.credentials.set("access_token", token)
 
     def get_access_token(self) -> Optional[str]:
-        return self.password_handler.get_password("access_token")
+        return self.credentials.get("access_token")
 
     def clear_access_token(self) -> bool:
-        if (
-            self.access_token is None
-            and self.password_handler.get_password("access_token") is None
-        ):
+        if self.access_token is None:
             return False
-        self.access_token = None
-        return self.password_handler.delete_password("access_token")
+        return self.credentials.delete("access_token")
 
     def set_api_key(self, api_key: str) -> None:
-        self.api_key = api_key
-        self.password_handler.set_password("api_key", api_key)
+        self.credentials.set("api_key", api_key)
 
     def get_api_key(self) -> Optional[str]:
-        return self.password_handler.get_password("api_key")
+        return self.credentials.get("api_key")
 
     def clear_api_key(self) -> bool:
-        if (
-            self.api_key is None
-            and self.password_handler.get_password("api_key") is None
-        ):
+        if self.api_key is None:
             return False
-        self.api_key = None
-        return self.password_handler.delete_password("api_key")
+        return self.credentials.delete("api_key")
+
+
+def _has_time_for(delay: float) -> bool:
+    remaining = get_deadline().remaining()
+    return remaining is None or delay < remaining
+
+
+def rejects_encoding(err: requests.HTTPError) -> bool:
+    """Whether the server refused a request for its Content-Encoding."""
+    return err.response is not None and err.response.status_code == 415
+
+
+def _rewind(files: Optional[Dict[str, Any]]) -> None:
+    """Seek upload file objects back to the start before re-sending them."""
+    for value in (files or {}).values():
+        fileobj = value[1] if isinstance(value, tuple) else value
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+
+
+@functools.cache
+def get_credential_provider() -> CredentialProvider:
+    """Process-wide credentials shared by every command."""
+    return CredentialProvider(PasswordHandler(SERVICE_NAME))
+
+
+@functools.cache
+def get_client() -> APIClient:
+    """Process-wide client, built on first use by a command."""
+    return APIClient(credentials=get_credential_provider())
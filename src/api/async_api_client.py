@@ -0,0 +1,75 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from src.api.api_client import APIClient, get_client
+from src.config.settings import HTTP_POOL_MAXSIZE
+
+T = TypeVar("T")
+
+
+class AsyncAPIClient:
+    """
+    asyncio interface to APIClient.
+
+    Requests run on a thread pool sized to the HTTP connection pool, so they
+    share the pooled session, retry policy and deadline of the wrapped client
+    while the event loop overlaps their network latency.
+    """
+
+    def __init__(
+        self, client: Optional[APIClient] = None, max_workers: int = HTTP_POOL_MAXSIZE
+    ):
+        self.client: APIClient = client or get_client()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="quack-http"
+        )
+
+    async def __aenter__(self) -> "AsyncAPIClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking call on the client's thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        return await self.run(self.client.get, endpoint, params=params, headers=headers)
+
+    async def post(self, endpoint: str, **kwargs) -> Dict[str, Any]:
+        return await self.run(self.client.post, endpoint, **kwargs)
+
+    async def put(self, endpoint: str, **kwargs) -> Dict[str, Any]:
+        return await self.run(self.client.put, endpoint, **kwargs)
+
+    async def delete(self, endpoint: str, **kwargs) -> Dict[str, Any]:
+        return await self.run(self.client.delete, endpoint, **kwargs)
+
+
+async def gather_limited(calls: Iterable[Awaitable[T]], limit: int) -> List[T]:
+    """
+    Await many calls concurrently, with at most `limit` in flight at once.
+
+    Results are returned in the order the calls were given.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def bounded(call: Awaitable[T]) -> T:
+        async with semaphore:
+            return await call
+
+    return await asyncio.gather(*(bounded(call) for call in calls))
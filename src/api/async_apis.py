@@ -0,0 +1,49 @@
+import functools
+import inspect
+from typing import Awaitable, Callable, Optional
+
+from src.api.async_api_client import AsyncAPIClient
+from src.api.auth_api import AuthAPI
+from src.api.machine_api import MachineAPI
+from src.api.model_file_api import ModelFileAPI
+
+
+class AsyncAPI:
+    """
+    Base for async versions of the API classes.
+
+    Subclasses set `sync_api`; each of its public methods is exposed as a
+    coroutine with the same name, signature and result dict.
+    """
+
+    sync_api: type = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, func in inspect.getmembers(cls.sync_api, inspect.isfunction):
+            if not name.startswith("_"):
+                setattr(cls, name, _coroutine_method(name, func))
+
+    def __init__(self, client: Optional[AsyncAPIClient] = None):
+        self.client: AsyncAPIClient = client or AsyncAPIClient()
+        self.api = self.sync_api(self.client.client)
+
+
+def _coroutine_method(name: str, func: Callable) -> Callable[..., Awaitable]:
+    @functools.wraps(func)
+    async def method(self, *args, **kwargs):
+        return await self.client.run(getattr(self.api, name), *args, **kwargs)
+
+    return method
+
+
+class AsyncAuthAPI(AsyncAPI):
+    sync_api = AuthAPI
+
+
+class AsyncMachineAPI(AsyncAPI):
+    sync_api = MachineAPI
+
+
+class AsyncModelFileAPI(AsyncAPI):
+    sync_api = ModelFileAPI
@@ -1,13 +1,13 @@
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 from datetime import datetime
-from src.api.api_client import APIClient
+from src.api.api_client import APIClient, get_client
 from src.utils.helpers.validity_enum import ValidityEnum
 from src.utils.helpers.handle_api_errors import handle_api_errors
 
 
 class AuthAPI:
-    def __init__(self, client: APIClient):
-        self.client = client
+    def __init__(self, client: Optional[APIClient] = None):
+        self.client = client or get_client()
 
     @handle_api_errors
     def login(self, username: str, password: str) -> Dict[str, str]:
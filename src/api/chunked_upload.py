@@ -0,0 +1,246 @@
+"""
+Chunked, resumable model-file uploads.
+
+A file is sent as fixed-size parts within an upload session:
+
+- ``POST models/uploads`` opens a session and returns its ``upload_id``
+- ``PUT models/uploads/{upload_id}/parts/{part}`` sends one part
+- ``GET models/uploads/{upload_id}`` lists the parts the server has stored
+- ``POST models/uploads/{upload_id}/complete`` assembles the file
+
+When the session is opened with the file's part digests, the server lists
+the parts it already stores as done, so only the missing ones are sent.
+
+Parts are sent concurrently, compressed when an encoding is given and the
+server accepts it. The session is recorded on disk so an
+interrupted upload resumes from the parts the server has already
+acknowledged.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Optional, Set
+
+from requests.exceptions import HTTPError
+
+from src.api.api_client import APIClient, rejects_encoding
+from src.config.settings import QUACK_HOME, UPLOAD_PARALLELISM, UPLOAD_PART_SIZE
+from src.utils.compression import CompressedBody
+from src.utils.helpers.mapped_file import mapped_file
+from src.utils.rate_limiter import TokenBucket, throttle
+
+UPLOAD_SESSION_DIR = os.path.join(QUACK_HOME, "uploads")
+
+
+class UploadSessionStore:
+    """Local record of in-progress chunked uploads."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory: str = directory or UPLOAD_SESSION_DIR
+
+    @staticmethod
+    def key(file_path: str, **fields: Any) -> str:
+        """Identify an upload by the file's identity and its destination."""
+        stat = os.stat(file_path)
+        identity = {
+            "path": os.path.abspath(file_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            **fields,
+        }
+        encoded = json.dumps(identity, sort_keys=True).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, key: str, session: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(session, file)
+        os.replace(tmp_path, self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class ChunkedUploader:
+    """
+    Send a file's parts over several connections at once.
+
+    Parts are sliced straight out of a read-only memory map of the file, so
+    at most `parallelism` parts are in flight and nothing is buffered whole.
+    """
+
+    def __init__(
+        self,
+        client: APIClient,
+        part_size: int = UPLOAD_PART_SIZE,
+        parallelism: int = UPLOAD_PARALLELISM,
+        store: Optional[UploadSessionStore] = None,
+        encoding: Optional[str] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+    ):
+        self.client: APIClient = client
+        self.part_size: int = part_size
+        self.parallelism: int = max(1, parallelism)
+        self.store: UploadSessionStore = store or UploadSessionStore()
+        self.encoding: Optional[str] = encoding
+        self.rate_limiter: Optional[TokenBucket] = rate_limiter
+
+    def upload(
+        self,
+        file_path: str,
+        model_name: Optional[str] = None,
+        model_id: Optional[str] = None,
+        file_name: Optional[str] = None,
+        overwrite: bool = False,
+        progress: Optional[Callable[[int], None]] = None,
+        digest: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Upload a file in parts, resuming a previous attempt if there is one.
+
+        :param overwrite: replace an existing file of the same name
+        :param progress: called with the number of bytes each stored part adds
+        :param digest: the file's `file_digest` at this part size; the server
+            marks parts whose digest it already stores as done
+        :return: the server's response to completing the upload
+        """
+        file_name = file_name or os.path.basename(file_path)
+        file_size = os.path.getsize(file_path)
+        key = self.store.key(
+            file_path,
+            model_name=model_name,
+            model_id=model_id,
+            file_name=file_name,
+            overwrite=overwrite,
+        )
+        session = self._resume(key)
+        if session is None:
+            session = self._start(
+                key, model_name, model_id, file_name, file_size, overwrite, digest
+            )
+
+        upload_id = session["upload_id"]
+        part_size = session["part_size"]
+        done: Set[int] = set(session["parts"])
+        part_count = max(1, -(-file_size // part_size))
+        lock = threading.Lock()
+
+        def stored(length: int) -> None:
+            if progress:
+                progress(length)
+
+        def send(view: memoryview, part: int) -> None:
+            offset = part * part_size
+            with view[offset : offset + part_size] as chunk:
+                self._put_part(upload_id, part, chunk)
+                length = len(chunk)
+            with lock:
+                done.add(part)
+                session["parts"] = sorted(done)
+                self.store.save(key, session)
+                stored(length)
+
+        for part in done:
+            stored(min(part_size, file_size - part * part_size))
+        pending = [part for part in range(part_count) if part not in done]
+        with mapped_file(file_path) as view:
+            with ThreadPoolExecutor(
+                max_workers=min(self.parallelism, max(1, len(pending))),
+                thread_name_prefix="quack-upload",
+            ) as executor:
+                futures = [executor.submit(send, view, part) for part in pending]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        result = self.client.post(
+            f"models/uploads/{upload_id}/complete", idempotent=True
+        )
+        self.store.delete(key)
+        return result
+
+    def _start(
+        self,
+        key: str,
+        model_name: Optional[str],
+        model_id: Optional[str],
+        file_name: str,
+        file_size: int,
+        overwrite: bool,
+        digest: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        data = {
+            "model_name": model_name,
+            "model_id": model_id,
+            "file_name": file_name,
+            "file_size": file_size,
+            "part_size": self.part_size,
+            "overwrite": overwrite,
+        }
+        if digest:
+            data.update(digest)
+        response = self.client.post("models/uploads", data=data)
+        session = {
+            "upload_id": response["upload_id"],
+            "part_size": response.get("part_size", self.part_size),
+            "parts": response.get("parts", []),
+        }
+        self.store.save(key, session)
+        return session
+
+    def _resume(self, key: str) -> Optional[Dict[str, Any]]:
+        session = self.store.load(key)
+        if session is None:
+            return None
+        try:
+            status = self.client.get(f"models/uploads/{session['upload_id']}")
+        except HTTPError as err:
+            if err.response is not None and err.response.status_code in (404, 410):
+                # the server expired the session, start over
+                self.store.delete(key)
+                return None
+            raise
+        # the server's list of stored parts is authoritative
+        session["parts"] = status.get("parts", [])
+        return session
+
+    def _put_part(self, upload_id: str, part: int, chunk: memoryview) -> Dict[str, Any]:
+        endpoint = f"models/uploads/{upload_id}/parts/{part}"
+        headers = {"Content-Type": "application/octet-stream"}
+        encoding = self.encoding
+        if encoding:
+            try:
+                return self.client.put(
+                    endpoint,
+                    headers={**headers, "Content-Encoding": encoding},
+                    body=throttle(CompressedBody(chunk, encoding), self.rate_limiter),
+                )
+            except HTTPError as err:
+                if not rejects_encoding(err):
+                    raise
+                # the server only takes parts as is
+                self.encoding = None
+        return self.client.put(
+            endpoint, headers=headers, body=throttle(chunk, self.rate_limiter)
+        )
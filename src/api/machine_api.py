@@ -1,11 +1,11 @@
-from typing import Dict
-from src.api.api_client import APIClient
+from typing import Dict, Optional
+from src.api.api_client import APIClient, get_client
 from src.utils.helpers.handle_api_errors import handle_api_errors
 
 
 class MachineAPI:
-    def __init__(self):
-        self.client = APIClient()
+    def __init__(self, client: Optional[APIClient] = None):
+        self.client = client or get_client()
 
     """FPGA REQUESTS"""
 
@@ -43,7 +43,9 @@ class MachineAPI:
             "machine_id": machine_id,
             "model_name": model_name,
         }
-        response = self.client.post("machine/gpu/pull_model", data=data)
+        response = self.client.post(
+            "machine/gpu/pull_model", data=data, idempotent=True
+        )
         return response
 
     @handle_api_errors
@@ -78,7 +80,9 @@ class MachineAPI:
             "machine_id": machine_id,
             "model_name": model_name,
         }
-        response = self.client.post("machine/cpu/pull_model", data=data)
+        response = self.client.post(
+            "machine/cpu/pull_model", data=data, idempotent=True
+        )
         return response
 
     @handle_api_errors
@@ -104,11 +108,11 @@ class MachineAPI:
 
     @handle_api_errors
     def start_machine(self, machine_id: str):
-        return self.client.post(f"machine/start/{machine_id}")
+        return self.client.post(f"machine/start/{machine_id}", idempotent=True)
 
     @handle_api_errors
     def stop_machine(self, machine_id: str):
-        return self.client.post(f"machine/stop/{machine_id}")
+        return self.client.post(f"machine/stop/{machine_id}", idempotent=True)
 
     @handle_api_errors
     def terminate_machine(self, machine_id: str):
@@ -1,24 +1,187 @@
-import os
-from typing import Dict
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
 
-from src.api.api_client import APIClient
+from requests import HTTPError, RequestException
+
+from src.api.api_client import APIClient, get_client, rejects_encoding
+from src.api.chunked_upload import ChunkedUploader
+from src.api.ranged_download import (
+    RangedDownloader,
+    download_endpoint,
+    probe,
+    read_file_range,
+    read_range,
+)
+from src.config.settings import (
+    DIGEST_ALGORITHM,
+    DOWNLOAD_PARALLELISM,
+    DOWNLOAD_SEGMENT_SIZE,
+    FILE_CACHE_MAX_BYTES,
+    UPLOAD_PARALLELISM,
+    UPLOAD_PART_SIZE,
+)
+from src.utils.compression import CompressedBody
+from src.utils.file_cache import FileCache, get_file_cache
+from src.utils.hash_index import HashIndex, get_hash_index
 from src.utils.helpers.handle_api_errors import handle_api_errors
+from src.utils.multipart import MultipartEncoder, MultipartStreamEncoder
+from src.utils.rate_limiter import TokenBucket, throttle
+from src.utils.tar_stream import TarStream
 
 
 class ModelFileAPI:
-    def __init__(self, client: APIClient):
-        self.client = client
+    def __init__(
+        self,
+        client: Optional[APIClient] = None,
+        hash_index: Optional[HashIndex] = None,
+        cache: Optional[FileCache] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+    ):
+        self.client = client or get_client()
+        self._hash_index = hash_index
+        self._cache = cache
+        # shared by every transfer, so concurrent ones stay under one cap
+        self.rate_limiter: Optional[TokenBucket] = rate_limiter
+        self._current: Dict[Tuple[str, str], Optional[str]] = {}
+
+    @property
+    def hash_index(self) -> HashIndex:
+        if self._hash_index is None:
+            self._hash_index = get_hash_index()
+        return self._hash_index
+
+    @property
+    def cache(self) -> Optional[FileCache]:
+        """The download cache, or None when FILE_CACHE_MAX_BYTES turns it off."""
+        if self._cache is None and FILE_CACHE_MAX_BYTES > 0:
+            self._cache = get_file_cache()
+        return self._cache
+
+    def cached_copy(self, model_id: str, file_name: str) -> Optional[str]:
+        """
+        Path of a cached copy of a file that is still current on the server.
+
+        The server is only asked when a copy exists, with a one-byte probe,
+        and at most once per file for the life of this object.
+        """
+        key = (model_id, file_name)
+        if key not in self._current:
+            path = None
+            cache = self.cache
+            if cache is not None and cache.validator(model_id, file_name):
+                try:
+                    _, validator, _ = probe(
+                        self.client, download_endpoint(model_id, file_name)
+                    )
+                except RequestException:
+                    validator = None
+                if validator:
+                    path = cache.lookup(model_id, file_name, validator)
+            self._current[key] = path
+        return self._current[key]
+
+    def digest_file(
+        self,
+        file_path: str,
+        part_size: Optional[int] = None,
+        algorithm: str = DIGEST_ALGORITHM,
+    ) -> Dict[str, Any]:
+        """Digest of a local file, re-hashed only if it changed since last time."""
+        return self.hash_index.digest(file_path, algorithm, part_size=part_size)
 
     @handle_api_errors
     def upload_model_file(
-        self, model_name: str, model_id: str, file_path: str
+        self,
+        model_name: str,
+        model_id: str,
+        file_path: str,
+        progress: Optional[Callable[[int], None]] = None,
+        encoding: Optional[str] = None,
+    ) -> Dict[str, str]:
+        encoder = MultipartEncoder("file", file_path, progress=progress)
+        params = {"model_name": model_name, "model_id": model_id}
+        return self._send_form(self.client.post, params, encoder, encoding)
+
+    @handle_api_errors
+    def upload_model_stream(
+        self,
+        model_name: str,
+        model_id: str,
+        stream: BinaryIO,
+        file_name: str,
+        overwrite: bool = False,
+        progress: Optional[Callable[[int], None]] = None,
+        encoding: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Upload a model file read from a stream of unknown length, such as
+        stdin. The body is sent chunked, as it is read.
+
+        A stream cannot be sent twice, so with an `encoding` the server has
+        to accept it; there is no falling back to an uncompressed body.
+        """
+        encoder = MultipartStreamEncoder("file", stream, file_name, progress=progress)
+        params = {"model_name": model_name, "model_id": model_id}
+        headers = {"Content-Type": encoder.content_type}
+        body = encoder
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            body = CompressedBody(encoder, encoding)
+        body = throttle(body, self.rate_limiter)
+        send = self.client.put if overwrite else self.client.post
+        return send("models", params=params, headers=headers, body=body)
+
+    @handle_api_errors
+    def upload_model_file_chunked(
+        self,
+        model_name: str,
+        model_id: str,
+        file_path: str,
+        overwrite: bool = False,
+        progress: Optional[Callable[[int], None]] = None,
+        part_size: int = UPLOAD_PART_SIZE,
+        parallelism: int = UPLOAD_PARALLELISM,
+        digest: Optional[Dict[str, Any]] = None,
+        encoding: Optional[str] = None,
     ) -> Dict[str, str]:
-        with open(file_path, "rb") as file:
-            files = {
-                "file": (os.path.basename(file_path), file, "application/octet-stream")
-            }
-            params = {"model_name": model_name, "model_id": model_id}
-            return self.client.post("models", params=params, files=files)
+        uploader = ChunkedUploader(
+            self.client,
+            part_size,
+            parallelism,
+            encoding=encoding,
+            rate_limiter=self.rate_limiter,
+        )
+        return uploader.upload(
+            file_path,
+            model_name=model_name,
+            model_id=model_id,
+            overwrite=overwrite,
+            progress=progress,
+            digest=digest,
+        )
+
+    @handle_api_errors
+    def check_model_file(
+        self,
+        model_name: str,
+        model_id: str,
+        file_name: str,
+        file_size: int,
+        digest: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Ask whether the server already stores this content under `file_name`.
+
+        The response has `exists`, and the stored file's details when true.
+        """
+        data = {
+            "model_name": model_name,
+            "model_id": model_id,
+            "file_name": file_name,
+            "file_size": file_size,
+            "algorithm": digest["algorithm"],
+            "digest": digest["digest"],
+        }
+        return self.client.post("models/uploads/check", data=data)
 
     @handle_api_errors
     def get_model(self, model_id: str):
@@ -30,18 +193,151 @@ class ModelFileAPI:
 
     @handle_api_errors
     def read_model_file(self, model_id: str, file_name: str):
+        cached = self.cached_copy(model_id, file_name)
+        if cached:
+            with open(cached, "r", errors="replace") as file:
+                return {"content": file.read()}
         return self.client.get(f"models/{model_id}/{file_name}")
 
+    @handle_api_errors
+    def read_model_file_range(
+        self,
+        model_id: str,
+        file_name: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+        tail: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Read part of a model file with an HTTP Range request, or from the
+        local cache when it holds the current version.
+
+        :param tail: read the last `length` bytes instead of from `offset`
+        :return: the bytes as `content`, their `offset` and the file `size`
+        """
+        cached = self.cached_copy(model_id, file_name)
+        if cached:
+            return read_file_range(cached, offset, length, suffix=tail)
+        return read_range(
+            self.client,
+            download_endpoint(model_id, file_name),
+            offset,
+            length,
+            suffix=tail,
+        )
+
+    @handle_api_errors
+    def download_model_file(
+        self,
+        model_id: str,
+        file_name: str,
+        dest_path: str,
+        progress: Optional[Callable[[int], None]] = None,
+        on_size: Optional[Callable[[Optional[int]], None]] = None,
+        segment_size: int = DOWNLOAD_SEGMENT_SIZE,
+        parallelism: int = DOWNLOAD_PARALLELISM,
+        use_cache: bool = True,
+        encoding: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        self._current.pop((model_id, file_name), None)
+        downloader = RangedDownloader(
+            self.client,
+            segment_size,
+            parallelism,
+            cache=self.cache if use_cache else None,
+            encoding=encoding,
+            rate_limiter=self.rate_limiter,
+        )
+        return downloader.download(
+            model_id, file_name, dest_path, progress=progress, on_size=on_size
+        )
+
     @handle_api_errors
     def update_model_file(
-        self, model_name: str, model_id: str, file_path: str
+        self,
+        model_name: str,
+        model_id: str,
+        file_path: str,
+        progress: Optional[Callable[[int], None]] = None,
+        encoding: Optional[str] = None,
     ) -> Dict[str, str]:
-        with open(file_path, "rb") as file:
-            files = {
-                "file": (os.path.basename(file_path), file, "application/octet-stream")
-            }
-            params = {"model_name": model_name, "model_id": model_id}
-            return self.client.put("models", params=params, files=files)
+        encoder = MultipartEncoder("file", file_path, progress=progress)
+        params = {"model_name": model_name, "model_id": model_id}
+        return self._send_form(self.client.put, params, encoder, encoding)
+
+    def _send_form(
+        self,
+        send: Callable[..., Dict[str, Any]],
+        params: Dict[str, Any],
+        encoder: MultipartEncoder,
+        encoding: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Send a multipart file body to `models`."""
+        return self._send_body(
+            send, "models", params, encoder, encoder.content_type, encoding
+        )
+
+    def _send_body(
+        self,
+        send: Callable[..., Dict[str, Any]],
+        endpoint: str,
+        params: Dict[str, Any],
+        body: Any,
+        content_type: str,
+        encoding: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a re-iterable body, compressed with `encoding` unless the server
+        turns that down, in which case it is sent as is.
+        """
+        headers = {"Content-Type": content_type}
+        if encoding:
+            try:
+                return send(
+                    endpoint,
+                    params=params,
+                    headers={**headers, "Content-Encoding": encoding},
+                    body=throttle(CompressedBody(body, encoding), self.rate_limiter),
+                )
+            except HTTPError as err:
+                if not rejects_encoding(err):
+                    raise
+        return send(
+            endpoint,
+            params=params,
+            headers=headers,
+            body=throttle(body, self.rate_limiter),
+        )
+
+    @handle_api_errors
+    def upload_model_archive(
+        self,
+        model_name: str,
+        model_id: str,
+        file_paths: List[str],
+        overwrite: bool = False,
+        progress: Optional[Callable[[int], None]] = None,
+        encoding: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Upload many files in one request, as a tar stream the server unpacks.
+
+        The response lists the stored `files` with the model's details.
+        """
+        archive = TarStream(file_paths, progress=progress)
+        params = {
+            "model_name": model_name,
+            "model_id": model_id,
+            "overwrite": str(overwrite).lower(),
+        }
+        return self._send_body(
+            self.client.post,
+            "models/archive",
+            params,
+            archive,
+            "application/x-tar",
+            encoding,
+        )
 
     @handle_api_errors
     def delete_model_file(self, model_id: str, file_name: str):
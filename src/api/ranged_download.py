@@ -0,0 +1,384 @@
+"""
+Streaming, resumable model-file downloads.
+
+``GET models/{model_id}/{file_name}/download`` returns the file's bytes and
+honours single ``Range`` requests. Large files are split into segments that
+are fetched in parallel and written straight into a preallocated
+``<path>.part`` file, which is renamed into place once complete.
+
+Progress is recorded in ``<path>.part.json``, so a rerun continues from
+where each segment stopped as long as the server still has the same version
+of the file, judged by its ``ETag`` or ``Last-Modified``.
+
+With an `encoding`, each request asks for the range compressed with it; a
+compressed response is decoded on the fly, with the network read on a
+background thread.
+
+With a `FileCache`, a file whose cached copy still matches that validator is
+copied from disk instead, at the cost of the one-byte probe every download
+starts with.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+import requests
+import urllib3
+
+from src.api.api_client import APIClient
+from src.config.settings import DOWNLOAD_PARALLELISM, DOWNLOAD_SEGMENT_SIZE
+from src.utils.compression import can_decode, decompress_blocks, in_background
+from src.utils.file_cache import FileCache
+from src.utils.rate_limiter import TokenBucket, throttled
+
+DOWNLOAD_BLOCK_SIZE = 1024**2
+
+# bytes written between saves of the download state
+STATE_SAVE_INTERVAL = 16 * 1024**2
+
+
+class IncompleteDownload(IOError):
+    """The server ended a response before sending every requested byte."""
+
+
+# failures after which a segment is fetched again from its current offset
+TRANSIENT_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    urllib3.exceptions.ProtocolError,
+    urllib3.exceptions.ReadTimeoutError,
+    IncompleteDownload,
+)
+
+
+class RangedDownloader:
+    def __init__(
+        self,
+        client: APIClient,
+        segment_size: int = DOWNLOAD_SEGMENT_SIZE,
+        parallelism: int = DOWNLOAD_PARALLELISM,
+        block_size: int = DOWNLOAD_BLOCK_SIZE,
+        cache: Optional[FileCache] = None,
+        encoding: Optional[str] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+    ):
+        self.client: APIClient = client
+        self.cache: Optional[FileCache] = cache
+        self.encoding: Optional[str] = encoding
+        self.rate_limiter: Optional[TokenBucket] = rate_limiter
+        self.segment_size: int = segment_size
+        self.parallelism: int = max(1, parallelism)
+        self.block_size: int = block_size
+
+    def download(
+        self,
+        model_id: str,
+        file_name: str,
+        dest_path: str,
+        progress: Optional[Callable[[int], None]] = None,
+        on_size: Optional[Callable[[Optional[int]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Download a model file to `dest_path`, resuming an earlier attempt.
+
+        :param progress: called with the number of bytes written as they land
+        :param on_size: called with the file size once it is known
+        :return: the file name, destination path, size and whether the file
+                 came from the local cache
+        """
+        endpoint = download_endpoint(model_id, file_name)
+        part_path = f"{dest_path}.part"
+        state_path = f"{part_path}.json"
+
+        size, validator, ranged = probe(self.client, endpoint)
+        if on_size:
+            on_size(size)
+        cached = (
+            validator
+            and self.cache
+            and self.cache.lookup(model_id, file_name, validator)
+        )
+        if cached:
+            # the cached blob may be a hard link to this very file
+            if not (os.path.exists(dest_path) and os.path.samefile(cached, dest_path)):
+                tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+                shutil.copyfile(cached, tmp_path)
+                os.replace(tmp_path, dest_path)
+            if progress:
+                progress(size or 0)
+            return {
+                "file_name": file_name,
+                "path": dest_path,
+                "size": os.path.getsize(dest_path),
+                "cached": True,
+            }
+
+        state = _load_state(state_path)
+        if not (
+            ranged
+            and state
+            and (state["size"], state["validator"]) == (size, validator)
+            and os.path.exists(part_path)
+        ):
+            segments = self._segments(size) if ranged else [[0, size, 0]]
+            state = {"size": size, "validator": validator, "segments": segments}
+            _preallocate(part_path, size)
+
+        lock = threading.Lock()
+        unsaved = 0
+
+        def record(segment: List[int], written: int) -> None:
+            nonlocal unsaved
+            with lock:
+                segment[2] += written
+                unsaved += written
+                if unsaved >= STATE_SAVE_INTERVAL:
+                    _save_state(state_path, state)
+                    unsaved = 0
+            if progress:
+                progress(written)
+
+        if progress:
+            progress(sum(done for _, _, done in state["segments"]))
+        pending = [seg for seg in state["segments"] if not _finished(seg)]
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(self.parallelism, max(1, len(pending))),
+                thread_name_prefix="quack-download",
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self._fetch, endpoint, part_path, segment, ranged, record
+                    )
+                    for segment in pending
+                ]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            with lock:
+                _save_state(state_path, state)
+
+        written = os.path.getsize(part_path)
+        if size is not None and written != size:
+            raise IncompleteDownload(f"expected {size} bytes, wrote {written}")
+        os.replace(part_path, dest_path)
+        os.remove(state_path)
+        if validator and self.cache is not None:
+            self.cache.put(model_id, file_name, validator, dest_path)
+        return {
+            "file_name": file_name,
+            "path": dest_path,
+            "size": written,
+            "cached": False,
+        }
+
+    def _segments(self, size: int) -> List[List[int]]:
+        """[start, end, bytes done] for each segment of the file."""
+        if size < 2 * self.segment_size:
+            return [[0, size, 0]]
+        return [
+            [start, min(start + self.segment_size, size), 0]
+            for start in range(0, size, self.segment_size)
+        ]
+
+    def _fetch(
+        self,
+        endpoint: str,
+        part_path: str,
+        segment: List[int],
+        ranged: bool,
+        record: Callable[[List[int], int], None],
+    ) -> None:
+        """Stream one segment into place, retrying from where it stopped."""
+        policy = self.client.retry_policy
+        attempt = 0
+        while True:
+            start, end, done = segment
+            if not ranged and done:
+                # without ranges the whole body has to be fetched again
+                record(segment, -done)
+                done = 0
+            headers = {}
+            if ranged:
+                headers["Range"] = f"bytes={start + done}-{end - 1}"
+            if self.encoding:
+                headers["Accept-Encoding"] = self.encoding
+            try:
+                with self.client.stream(endpoint, headers=headers) as response:
+                    with open(part_path, "r+b") as file:
+                        file.seek(start + done)
+                        for block in self._blocks(response):
+                            file.write(block)
+                            record(segment, len(block))
+                if end is not None and not _finished(segment):
+                    raise IncompleteDownload(f"segment at {start} ended early")
+                return
+            except TRANSIENT_ERRORS:
+                attempt += 1
+                if attempt >= policy.max_attempts:
+                    raise
+                time.sleep(policy.backoff(attempt - 1))
+
+    def _blocks(self, response: requests.Response) -> Iterator[bytes]:
+        """
+        The decoded body, decompressed here when the server compressed it.
+        With a rate limiter, the bytes read off the wire are capped.
+        """
+        encoding = response.headers.get("Content-Encoding", "").strip().lower()
+        if not can_decode(encoding):
+            return self._throttled(response.iter_content(self.block_size))
+        raw = self._throttled(response.raw.stream(self.block_size, False))
+        return decompress_blocks(in_background(raw), encoding)
+
+    def _throttled(self, blocks: Iterator[bytes]) -> Iterator[bytes]:
+        if self.rate_limiter is None:
+            return blocks
+        return throttled(blocks, self.rate_limiter)
+
+
+def _finished(segment: List[int]) -> bool:
+    start, end, done = segment
+    return end is not None and start + done >= end
+
+
+def download_endpoint(model_id: str, file_name: str) -> str:
+    return f"models/{model_id}/{quote(file_name)}/download"
+
+
+def probe(client: APIClient, endpoint: str) -> Tuple[Optional[int], str, bool]:
+    """
+    Fetch the first byte of a download to learn its size, version validator
+    and whether the server honours ranges.
+    """
+    try:
+        with client.stream(endpoint, headers={"Range": "bytes=0-0"}) as response:
+            return _describe(response)
+    except requests.HTTPError as err:
+        if err.response is None or err.response.status_code != 416:
+            raise
+        return 0, "", False  # only an empty file has no first byte
+
+
+def _describe(response: requests.Response) -> Tuple[Optional[int], str, bool]:
+    """Size, version validator and range support from a `bytes=0-0` probe."""
+    validator = response.headers.get("ETag") or response.headers.get(
+        "Last-Modified", ""
+    )
+    if response.status_code == 206:
+        total = response.headers.get("Content-Range", "").rpartition("/")[2]
+        if total.isdigit():
+            return int(total), validator, True
+    length = response.headers.get("Content-Length")
+    return (int(length) if length else None), validator, False
+
+
+def _preallocate(part_path: str, size: Optional[int]) -> None:
+    """Create the part file at its final size so segments write in place."""
+    with open(part_path, "wb") as file:
+        if not size:
+            return
+        file.truncate(size)
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(file.fileno(), 0, size)
+            except OSError:
+                pass  # not supported by every file system; sparse is fine
+
+
+def _load_state(state_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(state_path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(state_path: str, state: Dict[str, Any]) -> None:
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(state, file)
+    os.replace(tmp_path, state_path)
+
+
+def read_range(
+    client: APIClient,
+    endpoint: str,
+    start: int = 0,
+    length: Optional[int] = None,
+    suffix: bool = False,
+) -> Dict[str, Any]:
+    """
+    Read one byte range of a download endpoint without fetching the rest.
+
+    :param length: bytes to read, to the end of the file if None
+    :param suffix: read the last `length` bytes instead of from `start`
+    :return: the bytes as `content`, the `offset` they start at and the
+             file's `size`, None if the server does not say
+    """
+    if suffix:
+        header = f"bytes=-{length}"
+    else:
+        header = f"bytes={start}-{'' if length is None else start + length - 1}"
+    try:
+        response = client.stream(endpoint, headers={"Range": header})
+    except requests.HTTPError as err:
+        if err.response is None or err.response.status_code != 416:
+            raise
+        # the range starts past the end of the file
+        total = err.response.headers.get("Content-Range", "").rpartition("/")[2]
+        size = int(total) if total.isdigit() else None
+        return {"content": b"", "offset": size if suffix else start, "size": size}
+
+    with response:
+        if response.status_code == 206:
+            content_range = response.headers.get("Content-Range", "")
+            first, _, total = content_range.partition(" ")[2].partition("/")
+            return {
+                "content": response.content,
+                "offset": int(first.partition("-")[0]),
+                "size": int(total) if total.isdigit() else None,
+            }
+        # no range support: stream the body, keeping only the wanted bytes
+        length_header = response.headers.get("Content-Length")
+        size = int(length_header) if length_header else None
+        kept = bytearray()
+        seen = 0
+        for block in response.iter_content(DOWNLOAD_BLOCK_SIZE):
+            if suffix:
+                kept += block
+                del kept[: max(0, len(kept) - length)]
+            else:
+                lo, hi = max(start - seen, 0), len(block)
+                if length is not None:
+                    hi = min(hi, start + length - seen)
+                kept += block[lo:hi]
+                if length is not None and len(kept) >= length:
+                    break
+            seen += len(block)
+        offset = seen - len(kept) if suffix else start
+        return {"content": bytes(kept), "offset": offset, "size": size}
+
+
+def read_file_range(
+    file_path: str, start: int = 0, length: Optional[int] = None, suffix: bool = False
+) -> Dict[str, Any]:
+    """`read_range` over a local copy of a file."""
+    size = os.path.getsize(file_path)
+    if suffix:
+        start = max(0, size - length)
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        content = file.read(-1 if length is None else length)
+    return {"content": content, "offset": start, "size": size}
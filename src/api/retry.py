@@ -0,0 +1,91 @@
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+from src.config.settings import (
+    HTTP_RETRY_BACKOFF_BASE,
+    HTTP_RETRY_BACKOFF_MAX,
+    HTTP_RETRY_MAX_ATTEMPTS,
+)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before re-sending a failed request.
+
+    Delays use exponential backoff with full jitter unless the server asks
+    for a specific wait through a `Retry-After` header. A server that asks
+    for longer than `backoff_max` is not retried at all.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = HTTP_RETRY_MAX_ATTEMPTS,
+        backoff_base: float = HTTP_RETRY_BACKOFF_BASE,
+        backoff_max: float = HTTP_RETRY_BACKOFF_MAX,
+        retry_statuses: FrozenSet[int] = RETRY_STATUSES,
+        retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS,
+    ):
+        self.max_attempts: int = max(1, max_attempts)
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.retry_statuses: FrozenSet[int] = retry_statuses
+        self.retry_methods: FrozenSet[str] = retry_methods
+
+    def allows(self, method: str, idempotent: bool = False) -> bool:
+        return idempotent or method.upper() in self.retry_methods
+
+    def retries_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to stop retrying."""
+        wait = parse_retry_after(retry_after)
+        if wait is None:
+            return self.backoff(attempt)
+        return wait if wait <= self.backoff_max else None
+
+
+class RetryStats:
+    """Thread-safe counters for the retries a client has made."""
+
+    def __init__(self):
+        self.retries: int = 0
+        self.delay: float = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, delay: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self.delay += delay
+
+    def reset(self) -> None:
+        with self._lock:
+            self.retries = 0
+            self.delay = 0.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,23 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config.settings import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+
+
+def create_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+) -> requests.Session:
+    """
+    Build a keep-alive session backed by a sized connection pool.
+
+    :param pool_connections: number of hosts to keep connection pools for
+    :param pool_maxsize: connections kept open per host, should be at least
+                         the number of threads sharing the session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
@@ -1,10 +1,12 @@
-from src.api.api_client import APIClient
+from typing import Optional
+
+from src.api.api_client import APIClient, get_client
 from src.utils.helpers.handle_api_errors import handle_api_errors
 
 
 class UserAPI:
-    def __init__(self, client: APIClient):
-        self.client = client
+    def __init__(self, client: Optional[APIClient] = None):
+        self.client = client or get_client()
 
     @handle_api_errors
     def register(self, username, email, password):
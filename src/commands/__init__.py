@@ -1,7 +1,17 @@
-from src.commands import key
-from src.commands import user_auth
-from src.commands import machine
-from src.commands import metrics
-from src.commands import model_file
+"""
+Static manifest of the root `quack` commands.
 
-__all__ = [key, user_auth, machine, metrics, model_file]
+Maps each command name to the dotted path of its click object so that
+`QuackGroup` can import a command's module only when it is invoked.
+"""
+
+COMMANDS = {
+    "key": "src.commands.key.key",
+    "login": "src.commands.user_auth.login",
+    "logout": "src.commands.user_auth.logout",
+    "register": "src.commands.user_auth.register",
+    "machine": "src.commands.machine.machine",
+    "metrics": "src.commands.metrics.metrics",
+    "model": "src.commands.model_file.model",
+    "apply": "src.commands.fleet.apply",
+}
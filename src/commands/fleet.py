@@ -0,0 +1,271 @@
+import asyncio
+import json
+import os
+
+import click
+
+from src.api.api_client import get_client
+from src.api.async_api_client import AsyncAPIClient
+from src.api.machine_api import MachineAPI
+from src.commands.machine import machine_state, valid_machine_types
+from src.utils.deadline import get_deadline
+from src.utils.helpers.polling import AdaptiveInterval
+
+DEFAULT_MODELS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "models", "default_models.json"
+)
+
+
+def load_manifest(file_path):
+    """Read a fleet manifest from a JSON or YAML file."""
+    with open(file_path, "r") as file:
+        text = file.read()
+    if file_path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise click.ClickException(
+                "YAML manifests need PyYAML: pip install pyyaml, or use JSON."
+            )
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as err:
+            raise click.ClickException(f"Invalid YAML manifest: {err}")
+    try:
+        return json.loads(text)
+    except ValueError as err:
+        raise click.ClickException(f"Invalid JSON manifest: {err}")
+
+
+def validate_manifest(manifest, models_path=DEFAULT_MODELS_PATH):
+    """
+    Check a fleet manifest and return a list of problems, empty if valid.
+
+    A manifest holds a `machines` list; each entry needs a unique `name`, a
+    `hardware_type`, a `machine_type` valid for it, and optional `models`
+    available on that hardware type. FPGA machines cannot pull models yet.
+    """
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("machines"), list):
+        return ["Manifest must contain a 'machines' list."]
+    with open(models_path, "r") as file:
+        available = {m["name"]: m["available"] for m in json.load(file)}
+
+    errors = []
+    seen = set()
+    for index, spec in enumerate(manifest["machines"]):
+        name = spec.get("name") if isinstance(spec, dict) else None
+        if not name:
+            errors.append(f"machines[{index}]: missing name.")
+            continue
+        if name in seen:
+            errors.append(f"{name}: duplicate machine name.")
+        seen.add(name)
+        hardware_type = spec.get("hardware_type")
+        if hardware_type not in valid_machine_types:
+            errors.append(f"{name}: invalid hardware type {hardware_type!r}.")
+            continue
+        if spec.get("machine_type") not in valid_machine_types[hardware_type]:
+            errors.append(
+                f"{name}: invalid machine type {spec.get('machine_type')!r} "
+                f"for {hardware_type}."
+            )
+        if hardware_type == "fpga" and spec.get("models"):
+            errors.append(f"{name}: FPGA pull model not supported yet.")
+            continue
+        for model_name in spec.get("models", []):
+            if not available.get(model_name, {}).get(hardware_type):
+                errors.append(
+                    f"{name}: model {model_name} not available on {hardware_type}."
+                )
+    return errors
+
+
+class ReadyWatcher:
+    """
+    Resolve per-machine waits from one shared `list_user_machines` poll.
+
+    Every pending machine is checked in the same round, so the number of
+    requests per round does not grow with the size of the fleet. Waits end
+    with `timeout` or the command's --deadline, whichever comes first.
+    """
+
+    def __init__(self, call, list_machines, timeout):
+        self.call = call
+        self.list_machines = list_machines
+        self.timeout = timeout
+        self.waiters = {}
+        self.poller = None
+
+    async def wait(self, machine_id, target_state="running"):
+        future = asyncio.get_running_loop().create_future()
+        self.waiters[machine_id] = (target_state, future)
+        if self.poller is None or self.poller.done():
+            self.poller = asyncio.create_task(self._poll())
+        return await future
+
+    async def _poll(self):
+        loop = asyncio.get_running_loop()
+        timeout = self.timeout
+        deadline = get_deadline().remaining()
+        if deadline is not None:
+            timeout = min(timeout, deadline)
+        expires_at = loop.time() + timeout
+        interval = AdaptiveInterval()
+        last_states = {}
+        while self.waiters:
+            result = await self.call(self.list_machines)
+            states = {}
+            if result["success"]:
+                states = {m["machine_id"]: machine_state(m) for m in result["data"]}
+            elif result.get("error") == "Timeout":
+                self._give_up()
+                return
+            for machine_id, (target, future) in [*self.waiters.items()]:
+                state = states.get(machine_id)
+                if state == target or state == "terminated":
+                    future.set_result(state == target)
+                    del self.waiters[machine_id]
+            if not self.waiters:
+                return
+            remaining = expires_at - loop.time()
+            if remaining <= 0:
+                self._give_up()
+                return
+            progressed = states != last_states
+            last_states = states
+            await asyncio.sleep(min(interval.next(progressed), remaining))
+
+    def _give_up(self):
+        for _, future in self.waiters.values():
+            future.set_result(False)
+        self.waiters.clear()
+
+
+class FleetCommands:
+    def __init__(self):
+        self.endpoint = MachineAPI(get_client())
+
+    def plan(self, manifest):
+        """Split the manifest into machines to create and ones that exist."""
+        result = self.endpoint.list_user_machines()
+        if not result["success"]:
+            click.echo("Failed to retrieve list of machines.")
+            return None
+        existing = {m["machine_name"]: m for m in result["data"]}
+        to_create = [s for s in manifest["machines"] if s["name"] not in existing]
+        unchanged = [s for s in manifest["machines"] if s["name"] in existing]
+        return to_create, unchanged
+
+    def apply(self, manifest, workers=16, timeout=900.0, dry_run=False):
+        """
+        Create the machines of a manifest that do not exist yet, then pull
+        their models as soon as each machine is running.
+
+        :return: True if every machine was created and every model pulled
+        """
+        planned = self.plan(manifest)
+        if planned is None:
+            return False
+        to_create, unchanged = planned
+        for spec in unchanged:
+            click.echo(f"  = {spec['name']}: exists, unchanged")
+        for spec in to_create:
+            models = ", ".join(spec.get("models", [])) or "no models"
+            click.echo(
+                f"  + {spec['name']}: {spec['hardware_type']} {spec['machine_type']}"
+                f" ({models})"
+            )
+        if dry_run or not to_create:
+            click.echo(f"\n{len(to_create)} to create, {len(unchanged)} unchanged.")
+            return True
+
+        click.echo(f"\nCreating {len(to_create)} machines...\n")
+        results = asyncio.run(self._provision_all(to_create, workers, timeout))
+        failed = [name for name, ok in results if not ok]
+        click.echo(
+            f"\n{len(results) - len(failed)}/{len(results)} machines ready, "
+            f"{len(failed)} failed."
+        )
+        return not failed
+
+    async def _provision_all(self, specs, workers, timeout):
+        async with AsyncAPIClient(self.endpoint.client, max_workers=workers) as client:
+            semaphore = asyncio.Semaphore(workers)
+
+            async def call(func, *args):
+                async with semaphore:
+                    return await client.run(func, *args)
+
+            watcher = ReadyWatcher(call, self.endpoint.list_user_machines, timeout)
+            return await asyncio.gather(
+                *(self._provision(spec, call, watcher) for spec in specs)
+            )
+
+    async def _provision(self, spec, call, watcher):
+        name = spec["name"]
+        hardware_type = spec["hardware_type"]
+        create = getattr(self.endpoint, f"create_{hardware_type}_machine")
+        result = await call(create, name, spec["machine_type"])
+        if not result["success"]:
+            click.secho(
+                f"  ✘ {name}: create failed. {result.get('message', '')}", fg="red"
+            )
+            return name, False
+        machine_id = result["data"]["machine_id"]
+        click.echo(f"  ✔ {name}: created {machine_id}")
+
+        models = spec.get("models", [])
+        if not models:
+            return name, True
+        if not await watcher.wait(machine_id):
+            click.secho(f"  ✘ {name}: not running, models not pulled", fg="red")
+            return name, False
+
+        pull = getattr(self.endpoint, f"pull_{hardware_type}_model")
+        pulls = await asyncio.gather(*(call(pull, machine_id, m) for m in models))
+        ok = True
+        for model_name, pulled in zip(models, pulls):
+            if pulled["success"]:
+                click.echo(f"  ✔ {name}: pulled {model_name}")
+            else:
+                ok = False
+                click.secho(f"  ✘ {name}: failed to pull {model_name}", fg="red")
+        return name, ok
+
+
+@click.command()
+@click.option(
+    "--file",
+    "-f",
+    "file_path",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Fleet manifest (.json, .yaml or .yml).",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=16,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Requests in flight at once.",
+)
+@click.option(
+    "--timeout",
+    default=900.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds to wait for machines to start.",
+)
+@click.option("--dry-run", is_flag=True, help="Show the plan without applying it.")
+@click.pass_context
+def apply(ctx, file_path, workers, timeout, dry_run):
+    """Create machines and pull models from a fleet manifest."""
+    manifest = load_manifest(file_path)
+    errors = validate_manifest(manifest)
+    if errors:
+        for error in errors:
+            click.secho(error, fg="red")
+        ctx.exit(1)
+    if not FleetCommands().apply(manifest, workers, timeout, dry_run):
+        ctx.exit(1)
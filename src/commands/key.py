@@ -1,7 +1,7 @@
 import click
 import click_spinner
 
-from src.api.api_client import APIClient
+from src.api.api_client import get_client
 from src.api.auth_api import AuthAPI
 from src.utils.groups.subcommand_group import SubCommandGroup
 from src.utils.helpers.validity_enum import ValidityEnum
@@ -9,7 +9,7 @@ from src.utils.helpers.validity_enum import ValidityEnum
 
 class KeyCommands:
     def __init__(self):
-        self.client = APIClient()
+        self.client = get_client()
         self.endpoint = AuthAPI(self.client)
 
     def create_api_key(self, validity):
@@ -1,13 +1,34 @@
+import asyncio
+import fnmatch
 import json
+import time
 
 import click
 import click_spinner
 
+from src.api.api_client import get_client
+from src.api.async_api_client import AsyncAPIClient, gather_limited
 from src.api.machine_api import MachineAPI
+from src.utils.deadline import get_deadline
 from src.utils.groups.subcommand_group import SubCommandGroup
+from src.utils.helpers.polling import AdaptiveInterval
 
 
 machine_types = ["cpu", "gpu", "fpga"]
+valid_machine_types = {
+    "gpu": ["g4dn.xlarge"],
+    "fpga": ["f1.2xlarge", "f1.4xlarge", "f1.16xlarge"],
+    "cpu": ["t2.micro", "m5.xlarge", "m5.2xlarge"],
+}
+lifecycle_actions = {"start": "started", "stop": "stopped", "terminate": "terminated"}
+machine_states = ["running", "stopped", "terminated"]
+target_states = {"start": "running", "stop": "stopped", "terminate": "terminated"}
+
+
+def machine_state(machine):
+    """Lower-cased lifecycle state of a machine record, if it reports one."""
+    state = machine.get("machine_status") or machine.get("status")
+    return state.lower() if isinstance(state, str) else None
 
 
 class MachineCommands:
@@ -15,7 +36,7 @@ class MachineCommands:
         self.cpu = machine_types[0]
         self.gpu = machine_types[1]
         self.fpga = machine_types[2]
-        self.endpoint = MachineAPI()
+        self.endpoint = MachineAPI(get_client())
 
     def create(self, hardware_type, machine_name, machine_type):
         """
@@ -49,6 +70,7 @@ class MachineCommands:
         if result["success"]:
             click.echo("Machine created successfully. Details:")
             click.echo(json.dumps(result["data"], indent=2))
+            return result["data"]
         else:
             click.echo(
                 "Failed to create machine. Check machine name and type and try again."
@@ -137,6 +159,7 @@ class MachineCommands:
             click.echo(f"{result['data']['message']}")
         else:
             click.echo("Failed to stop machine. Check machine ID and try again.")
+        return result
 
     def start(self, machine_id):
         click.echo("\nAttempting to start machine...\n")
@@ -146,6 +169,7 @@ class MachineCommands:
             click.echo(f"{result['data']['message']}")
         else:
             click.echo("Failed to start machine. Check machine ID and try again.")
+        return result
 
     def terminate(self, machine_id):
         click.echo("\nAttempting to terminate machine...\n")
@@ -155,6 +179,145 @@ class MachineCommands:
             click.echo(f"{result['data']['message']}")
         else:
             click.echo("Failed to terminate machine. Check machine ID and try again.")
+        return result
+
+    def select(self, machine_ids=(), all_machines=False, names=()):
+        """
+        Resolve a machine selection to a list of unique machine IDs.
+
+        :param machine_ids: explicit machine IDs
+        :param all_machines: select every machine assigned to the user
+        :param names: glob patterns matched against machine names
+        """
+        # `list` is shadowed by the list command in this module
+        selected = [*machine_ids]
+        if all_machines or names:
+            with click_spinner.spinner():
+                result = self.endpoint.list_user_machines()
+            if not result["success"]:
+                click.echo("Failed to retrieve list of machines.")
+                return None
+            for machine in result["data"]:
+                if all_machines or any(
+                    fnmatch.fnmatchcase(machine["machine_name"], pattern)
+                    for pattern in names
+                ):
+                    selected.append(machine["machine_id"])
+        return [*dict.fromkeys(selected)]
+
+    def bulk(self, action, machine_ids, workers=16):
+        """
+        Run a lifecycle action on many machines concurrently.
+
+        :param action: one of start, stop or terminate
+        :param workers: maximum number of requests in flight
+        """
+        click.echo(f"\nAttempting to {action} {len(machine_ids)} machines...\n")
+        call = getattr(self.endpoint, f"{action}_machine")
+
+        async def run_all():
+            async with AsyncAPIClient(
+                self.endpoint.client, max_workers=workers
+            ) as client:
+                return await gather_limited(
+                    (client.run(call, machine_id) for machine_id in machine_ids),
+                    workers,
+                )
+
+        results = asyncio.run(run_all())
+        failed = 0
+        for machine_id, result in zip(machine_ids, results):
+            if result["success"]:
+                click.echo(f"  ✔ {machine_id}: {result['data']['message']}")
+            else:
+                failed += 1
+                detail = result.get("message", "unknown error")
+                click.secho(f"  ✘ {machine_id}: {detail}", fg="red")
+        succeeded = len(machine_ids) - failed
+        click.echo(
+            f"\n{succeeded}/{len(machine_ids)} machines {lifecycle_actions[action]}, "
+            f"{failed} failed."
+        )
+        return results
+
+    def wait(self, machine_ids, target_state, timeout=600.0):
+        """
+        Block until every machine reaches `target_state` or `timeout` expires.
+
+        Polls with an adaptive interval: short while states are changing,
+        backing off while they are not. Many machines are polled with one
+        `list_user_machines` call per round. The wait also ends with the
+        command's --deadline.
+
+        :return: True if every machine reached the target state
+        """
+        pending = [*dict.fromkeys(machine_ids)]
+        deadline = get_deadline().remaining()
+        if deadline is not None:
+            timeout = min(timeout, deadline)
+        expires_at = time.monotonic() + timeout
+        interval = AdaptiveInterval()
+        last_states = {}
+        click.echo(f"Waiting for {len(pending)} machine(s) to be {target_state}...")
+        while True:
+            states = self._poll_states(pending, target_state)
+            if states is None:
+                click.secho(
+                    f"Timed out waiting for {len(pending)} machine(s).", fg="red"
+                )
+                return False
+            reached = [m for m in pending if states.get(m) == target_state]
+            lost = [
+                m for m in pending if m not in reached and states.get(m) == "terminated"
+            ]
+            for machine_id in reached:
+                click.echo(f"  ✔ {machine_id}: {target_state}")
+            for machine_id in lost:
+                click.secho(f"  ✘ {machine_id}: terminated", fg="red")
+            if lost:
+                click.echo(f"{len(lost)} machine(s) terminated while waiting.")
+                return False
+            pending = [m for m in pending if m not in reached]
+            progressed = states != last_states
+            last_states = states
+            if not pending:
+                click.echo(f"All machines are {target_state}.")
+                return True
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                click.secho(
+                    f"Timed out waiting for {len(pending)} machine(s):", fg="red"
+                )
+                for machine_id in pending:
+                    click.echo(f"  • {machine_id}: {states.get(machine_id, 'unknown')}")
+                return False
+            time.sleep(min(interval.next(progressed), remaining))
+
+    def _poll_states(self, machine_ids, target_state):
+        """
+        Current states of `machine_ids`, empty when the poll failed, or None
+        when it timed out, as it does once the command's deadline is spent.
+        """
+        if len(machine_ids) == 1:
+            result = self.endpoint.get_machine(machine_ids[0])
+        else:
+            result = self.endpoint.list_user_machines()
+        if not result["success"]:
+            if result.get("error") == "Timeout":
+                return None
+            if result.get("status_code") != 404:
+                return {}
+            states = {}
+        elif len(machine_ids) == 1:
+            states = {machine_ids[0]: machine_state(result["data"])}
+        else:
+            states = {m["machine_id"]: machine_state(m) for m in result["data"]}
+        if target_state == "terminated":
+            # terminated machines may drop out of the listing, or be gone
+            # altogether when looked up by ID
+            for machine_id in machine_ids:
+                states.setdefault(machine_id, "terminated")
+        return states
 
     def get_details(self, machine_id):
         with click_spinner.spinner():
@@ -174,12 +337,91 @@ def machine(ctx):
     ctx.obj = MachineCommands()
 
 
+def machine_selection(func):
+    """Options for selecting one or many machines by ID, name glob or --all."""
+    options = [
+        click.option(
+            "--machine-id", "-id", multiple=True, help="Machine ID, may be repeated."
+        ),
+        click.option(
+            "--name",
+            "-n",
+            "names",
+            multiple=True,
+            help="Glob matched against machine names, may be repeated.",
+        ),
+        click.option("--all", "all_machines", is_flag=True, help="All machines."),
+        click.option(
+            "--stdin", "from_stdin", is_flag=True, help="Read machine IDs from stdin."
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+workers_option = click.option(
+    "--workers",
+    "-w",
+    default=16,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Requests in flight at once.",
+)
+
+
+def wait_options(func):
+    """Options for blocking until machines reach their target state."""
+    func = click.option(
+        "--wait-timeout",
+        default=600.0,
+        show_default=True,
+        type=click.FloatRange(min=0),
+        help="Seconds to wait with --wait.",
+    )(func)
+    return click.option(
+        "--wait", is_flag=True, help="Wait until the machines reach their state."
+    )(func)
+
+
+def selected_machine_ids(ctx, machine_id, names, all_machines, from_stdin):
+    machine_ids = [*machine_id]
+    if from_stdin:
+        machine_ids.extend(click.get_text_stream("stdin").read().split())
+    if not (machine_ids or names or all_machines):
+        machine_ids.append(click.prompt("Enter machine ID"))
+    return ctx.obj.select(machine_ids, all_machines, names)
+
+
+def run_lifecycle(ctx, action, workers, wait=False, wait_timeout=600.0, **selection):
+    machine_ids = selected_machine_ids(ctx, **selection)
+    if machine_ids is None:
+        return
+    if not machine_ids:
+        click.echo("No machines matched the selection.")
+        return
+    if len(machine_ids) == 1:
+        results = [getattr(ctx.obj, action)(machine_ids[0])]
+    else:
+        results = ctx.obj.bulk(action, machine_ids, workers)
+    failed = any(not result["success"] for result in results)
+    if wait:
+        succeeded = [m for m, r in zip(machine_ids, results) if r and r["success"]]
+        if succeeded and not ctx.obj.wait(
+            succeeded, target_states[action], wait_timeout
+        ):
+            ctx.exit(1)
+    if failed:
+        ctx.exit(1)
+
+
 @machine.command()
 @click.pass_context
 @click.argument("hardware-type", type=click.Choice(machine_types))
 @click.option("--machine-name", "-n", required=True, prompt="Enter machine name")
 @click.option("--machine-type", "-t", required=True, prompt="Choose machine type")
-def create(ctx, hardware_type, machine_name, machine_type):
+@wait_options
+def create(ctx, hardware_type, machine_name, machine_type, wait, wait_timeout):
     """Create a machine with name and type.
 
     Valid machine types:
@@ -190,12 +432,6 @@ def create(ctx, hardware_type, machine_name, machine_type):
 
     - FPGA: \t[f1.2xlarge, f1.4xlarge, f1.16xlarge]
     """
-    valid_machine_types = {
-        "gpu": ["g4dn.xlarge"],
-        "fpga": ["f1.2xlarge", "f1.4xlarge", "f1.16xlarge"],
-        "cpu": ["t2.micro", "m5.xlarge", "m5.2xlarge"],
-    }
-
     if machine_type not in valid_machine_types[hardware_type]:
         click.secho(
             f"Invalid machine type for {hardware_type}. See `quack machine create --help` for options.",
@@ -203,7 +439,10 @@ def create(ctx, hardware_type, machine_name, machine_type):
         )
         return
 
-    ctx.obj.create(hardware_type, machine_name, machine_type)
+    created = ctx.obj.create(hardware_type, machine_name, machine_type)
+    if wait and isinstance(created, dict):
+        if not ctx.obj.wait([created["machine_id"]], "running", wait_timeout):
+            ctx.exit(1)
 
 
 @machine.command()
@@ -257,27 +496,32 @@ def list(ctx):
 
 
 @machine.command()
-@click.option("--machine-id", "-id", required=True, prompt="Enter machine ID")
+@machine_selection
+@workers_option
+@wait_options
 @click.pass_context
-def stop(ctx, machine_id):
-    """Stop machine with machine ID."""
-    ctx.obj.stop(machine_id)
+def stop(ctx, workers, wait, wait_timeout, **selection):
+    """Stop machines by ID, name or --all."""
+    run_lifecycle(ctx, "stop", workers, wait, wait_timeout, **selection)
 
 
 @machine.command()
-@click.option("--machine-id", "-id", required=True, prompt="Enter machine ID")
+@machine_selection
+@workers_option
+@wait_options
 @click.pass_context
-def start(ctx, machine_id):
-    """Start machine with machine ID."""
-    ctx.obj.start(machine_id)
+def start(ctx, workers, wait, wait_timeout, **selection):
+    """Start machines by ID, name or --all."""
+    run_lifecycle(ctx, "start", workers, wait, wait_timeout, **selection)
 
 
 @machine.command()
-@click.option("--machine-id", "-id", required=True, prompt="Enter machine ID")
+@machine_selection
+@workers_option
 @click.pass_context
-def terminate(ctx, machine_id):
-    """Terminate machine with machine ID."""
-    ctx.obj.terminate(machine_id)
+def terminate(ctx, workers, **selection):
+    """Terminate machines by ID, name or --all."""
+    run_lifecycle(ctx, "terminate", workers, **selection)
 
 
 @machine.command()
@@ -286,3 +530,33 @@ def terminate(ctx, machine_id):
 def details(ctx, machine_id):
     """Get machine details with machine ID."""
     ctx.obj.get_details(machine_id)
+
+
+@machine.command()
+@machine_selection
+@click.option(
+    "--state",
+    "-s",
+    type=click.Choice(machine_states),
+    default="running",
+    show_default=True,
+    help="State to wait for.",
+)
+@click.option(
+    "--timeout",
+    default=600.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds to wait before giving up.",
+)
+@click.pass_context
+def wait(ctx, state, timeout, **selection):
+    """Wait until machines reach a state."""
+    machine_ids = selected_machine_ids(ctx, **selection)
+    if machine_ids is None:
+        ctx.exit(1)
+    if not machine_ids:
+        click.echo("No machines matched the selection.")
+        return
+    if not ctx.obj.wait(machine_ids, state, timeout):
+        ctx.exit(1)
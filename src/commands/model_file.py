@@ -1,39 +1,568 @@
-from datetime import datetime
+import asyncio
+import codecs
+from datetime import datetime, timezone
+import functools
+import glob
 import json
+import os
+import time
 
 import click
 import click_spinner
 
-from src.api.api_client import APIClient
+from src.api.api_client import get_client
+from src.api.async_api_client import AsyncAPIClient, gather_limited
 from src.api.model_file_api import ModelFileAPI
+from src.config.settings import (
+    CHUNKED_UPLOAD_THRESHOLD,
+    DIGEST_ALGORITHM,
+    DOWNLOAD_PARALLELISM,
+    DOWNLOAD_SEGMENT_SIZE,
+    MAX_TRANSFER_RATE,
+    READ_PAGE_SIZE,
+    TRANSFER_COMPRESSION,
+    UPLOAD_PARALLELISM,
+    UPLOAD_PART_SIZE,
+)
+from src.utils.compression import (
+    COMPRESSION_CHOICES,
+    CompressionUnavailable,
+    choose_encoding,
+)
+from src.utils.file_digest import digest_files
 from src.utils.groups.subcommand_group import SubCommandGroup
+from src.utils.helpers.byte_size import ByteSize, format_byte_size
+from src.utils.progress import transfer_progress
+from src.utils.rate_limiter import TokenBucket
+
+
+def file_size(file_path):
+    """Size of a local file, or None when it is not a regular file."""
+    return os.path.getsize(file_path) if os.path.isfile(file_path) else None
+
+
+def is_large_file(file_path, threshold=CHUNKED_UPLOAD_THRESHOLD):
+    """Whether a file is big enough to be sent as a chunked upload."""
+    return os.path.isfile(file_path) and os.path.getsize(file_path) >= threshold
+
+
+def decode_utf8(chunks):
+    """Decode a stream of byte chunks, even where a character spans two."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def error_detail(result):
+    """The most specific error message of a failed API result."""
+    return (result.get("response") or {}).get("detail") or result.get("message")
+
+
+def local_files(directory):
+    """Regular files directly in `directory`, by name; subdirectories are skipped."""
+    with os.scandir(directory) as entries:
+        return {
+            entry.name: entry.path
+            for entry in entries
+            if entry.is_file() and not entry.name.startswith(".")
+        }
+
+
+def expand_file_paths(pattern):
+    """Files named by a path, a directory (the files directly in it) or a glob."""
+    if os.path.isdir(pattern):
+        return sorted(local_files(pattern).values())
+    if any(char in pattern for char in "*?["):
+        return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+    return [pattern] if os.path.isfile(pattern) else []
+
+
+def remote_mtime(last_modified):
+    """Timestamp of a manifest's `last_modified`, or None if it cannot be read."""
+    try:
+        parsed = datetime.strptime(last_modified, "%Y-%m-%dT%H:%M:%SZ")
+    except (TypeError, ValueError):
+        return None
+    return parsed.replace(tzinfo=timezone.utc).timestamp()
+
+
+def plan_sync(local, remote, delete=False):
+    """
+    Compare local files with a model's remote manifest.
+
+    A file is changed when its size differs or it was modified locally after
+    the remote copy. Files that only look changed are still skipped by the
+    digest check when they are sent.
+
+    :param local: file name to local path
+    :param remote: the `files` of `ModelFileAPI.get_model`
+    :return: names to create, to update, unchanged, and to delete remotely
+    """
+    remote = {file["file_name"]: file for file in remote}
+    new, changed, unchanged = [], [], []
+    for name in sorted(local):
+        if name not in remote:
+            new.append(name)
+            continue
+        stat = os.stat(local[name])
+        modified = remote_mtime(remote[name].get("last_modified"))
+        if stat.st_size != remote[name].get("file_size") or (
+            modified is None or stat.st_mtime >= modified + 1
+        ):
+            changed.append(name)
+        else:
+            unchanged.append(name)
+    gone = sorted(name for name in remote if name not in local) if delete else []
+    return new, changed, unchanged, gone
+
+
+def file_mismatch(file_path, remote, digest_file):
+    """
+    Why a local file differs from its entry in a model's manifest, or None
+    when it matches. The digest is only compared when the manifest has one.
+
+    :param digest_file: `ModelFileAPI.digest_file`
+    """
+    size = file_size(file_path)
+    if size is None:
+        return "missing"
+    expected = remote.get("file_size")
+    if expected is not None and size != expected:
+        return f"size {size} does not match {expected}"
+    if remote.get("digest"):
+        algorithm = remote.get("algorithm") or DIGEST_ALGORITHM
+        if digest_file(file_path, algorithm=algorithm)["digest"] != remote["digest"]:
+            return f"{algorithm} digest does not match"
+    return None
 
 
 class ModelFileCommands:
     def __init__(self):
-        self.client = APIClient()
+        self.client = get_client()
         self.endpoint = ModelFileAPI(self.client)
 
+    def limit_rate(self, max_rate):
+        """Cap the bandwidth of every transfer made from now on."""
+        self.endpoint.rate_limiter = TokenBucket(max_rate) if max_rate else None
+
     def upload(
         self,
         file_path: str,
         model_name: str | None = None,
         model_id: str | None = None,
+        part_size: int = UPLOAD_PART_SIZE,
+        parallelism: int = UPLOAD_PARALLELISM,
+        dedup: bool = True,
+        compression: str = "none",
     ):
         click.echo("\nAttempting to upload model file...\n")
-        with click_spinner.spinner():
-            result = self.endpoint.upload_model_file(model_name, model_id, file_path)
+        name, size = os.path.basename(file_path), file_size(file_path)
+        with transfer_progress(name, size) as advance:
+            result, skipped = self._send(
+                file_path,
+                model_name,
+                model_id,
+                False,
+                part_size,
+                parallelism,
+                dedup,
+                compression,
+                progress=advance,
+            )
+        self._echo_uploaded(result, skipped)
+
+    def upload_stream(
+        self, stream, file_name, model_name=None, model_id=None, compression="none"
+    ):
+        """
+        Upload a model file read from a stream, such as a pipe on stdin.
+
+        :return: True if the file was uploaded
+        """
+        click.echo("\nAttempting to upload model file...\n")
+        with transfer_progress(file_name) as advance:
+            result = self.endpoint.upload_model_stream(
+                model_name,
+                model_id,
+                stream,
+                file_name,
+                progress=advance,
+                encoding=choose_encoding(compression, file_name),
+            )
+        self._echo_uploaded(result)
+        return result["success"]
+
+    def _echo_uploaded(self, result, skipped=False):
         if result["success"]:
             upload_date = datetime.strptime(
                 result["data"]["upload_date"], "%Y-%m-%dT%H:%M:%S.%f%z"
             )
             formatted_date = upload_date.astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
-            click.echo("Model file uploaded successfully:")
+            if skipped:
+                click.echo("Model file unchanged, upload skipped:")
+            else:
+                click.echo("Model file uploaded successfully:")
             click.echo(f"  Model Name: {result['data']['model_name']}")
             click.echo(f"  Model ID: {result['data']['model_id']}")
             click.echo(f"  Upload Date: {formatted_date}")
         else:
-            click.echo(f"Failed to upload model file: {result['response']['detail']}")
+            click.echo(f"Failed to upload model file: {error_detail(result)}")
+
+    def _send(
+        self,
+        file_path: str,
+        model_name: str | None,
+        model_id: str | None,
+        overwrite: bool,
+        part_size: int = UPLOAD_PART_SIZE,
+        parallelism: int = UPLOAD_PARALLELISM,
+        dedup: bool = True,
+        compression: str = "none",
+        progress=None,
+    ):
+        """
+        Send one model file, skipping bytes the server already stores.
+
+        With `dedup`, the file's digest is checked first: an identical stored
+        file is not sent at all, and a large file sends only missing parts.
+
+        :param compression: an encoding, "auto" to pick one by file type, or
+                            "none"
+        :param progress: called with the number of bytes sent as they go
+        :return: the API result and whether the upload was skipped
+        """
+        large = is_large_file(file_path)
+        encoding = choose_encoding(compression, os.path.basename(file_path))
+        digest = None
+        if dedup and os.path.isfile(file_path):
+            digest = self.endpoint.digest_file(
+                file_path, part_size=part_size if large else None
+            )
+            check = self.endpoint.check_model_file(
+                model_name,
+                model_id,
+                os.path.basename(file_path),
+                os.path.getsize(file_path),
+                digest,
+            )
+            if check["success"] and check["data"].get("exists"):
+                return check, True
+        if large:
+            result = self.endpoint.upload_model_file_chunked(
+                model_name,
+                model_id,
+                file_path,
+                overwrite=overwrite,
+                part_size=part_size,
+                parallelism=parallelism,
+                digest=digest,
+                progress=progress,
+                encoding=encoding,
+            )
+        elif overwrite:
+            result = self.endpoint.update_model_file(
+                model_name=model_name,
+                model_id=model_id,
+                file_path=file_path,
+                progress=progress,
+                encoding=encoding,
+            )
+        else:
+            result = self.endpoint.upload_model_file(
+                model_name, model_id, file_path, progress=progress, encoding=encoding
+            )
+        return result, False
+
+    def _run_all(self, calls, workers):
+        """Run blocking calls concurrently over the shared session, in order."""
+
+        async def run_all():
+            async with AsyncAPIClient(
+                self.endpoint.client, max_workers=workers
+            ) as client:
+                return await gather_limited((client.run(c) for c in calls), workers)
+
+        return asyncio.run(run_all())
+
+    def _send_all(self, jobs, model_name, model_id, workers, progress=None, **options):
+        """
+        Send many files concurrently, with one progress bar for their total.
+
+        :param jobs: (file_path, overwrite) pairs
+        :param progress: advance an existing progress bar instead
+        :return: `_send`'s (result, skipped) for each job, in order
+        """
+
+        def send(file_path, overwrite, progress):
+            try:
+                return self._send(
+                    file_path,
+                    model_name,
+                    model_id,
+                    overwrite,
+                    progress=progress,
+                    **options,
+                )
+            except OSError as err:
+                return {"success": False, "response": {"detail": str(err)}}, False
+
+        if progress is None:
+            total = sum(file_size(file_path) or 0 for file_path, _ in jobs)
+            with transfer_progress(f"{len(jobs)} files", total) as advance:
+                return self._send_all(
+                    jobs, model_name, model_id, workers, advance, **options
+                )
+        calls = [
+            functools.partial(send, file_path, overwrite, progress)
+            for file_path, overwrite in jobs
+        ]
+        return self._run_all(calls, workers)
+
+    def _echo_sent(self, name, result, skipped):
+        """Print the outcome of sending one file; True if it succeeded."""
+        if result["success"]:
+            click.echo(f"  ✔ {name}: {'unchanged' if skipped else 'uploaded'}")
+            return True
+        click.secho(f"  ✘ {name}: {error_detail(result)}", fg="red")
+        return False
+
+    def upload_many(
+        self, file_paths, model_name=None, model_id=None, workers=4, **options
+    ):
+        """
+        Upload many files to one model concurrently, largest first, so the
+        biggest shard does not start last.
+
+        Without a model ID, the smallest file is sent alone first to create
+        the model, and the rest are added to it by ID.
+
+        :param options: passed on to `_send`
+        :return: True if every file was uploaded
+        """
+        sizes = {file_path: file_size(file_path) or 0 for file_path in file_paths}
+        file_paths = sorted(file_paths, key=sizes.get, reverse=True)
+        if not model_id:
+            file_paths = file_paths[-1:] + file_paths[:-1]
+        total = sum(sizes.values())
+        click.echo(f"\nAttempting to upload {len(file_paths)} model files...\n")
+        started = time.monotonic()
+        with transfer_progress(f"{len(file_paths)} files", total) as advance:
+            sent = []
+            pending = file_paths
+            if not model_id:
+                sent = self._send_all(
+                    [(file_paths[0], False)], model_name, None, 1, advance, **options
+                )
+                result = sent[0][0]
+                model_id = result["data"]["model_id"] if result["success"] else None
+                pending = file_paths[1:] if model_id else []
+            if pending:
+                sent += self._send_all(
+                    [(file_path, False) for file_path in pending],
+                    model_name,
+                    model_id,
+                    workers,
+                    advance,
+                    **options,
+                )
+        elapsed = time.monotonic() - started
+
+        uploaded, sent_bytes = 0, 0
+        for file_path, (result, skipped) in zip(file_paths, sent):
+            if self._echo_sent(os.path.basename(file_path), result, skipped):
+                uploaded += 1
+                sent_bytes += 0 if skipped else sizes[file_path]
+        failed = len(file_paths) - uploaded
+        rate = sent_bytes / elapsed if elapsed > 0 else 0
+        click.echo(
+            f"\n{uploaded}/{len(file_paths)} files uploaded to model {model_id}, "
+            f"{failed} failed."
+        )
+        click.echo(
+            f"Sent {format_byte_size(sent_bytes)} in {elapsed:.1f}s "
+            f"({format_byte_size(rate)}/s)."
+        )
+        return not failed
+
+    def upload_archive(
+        self, file_paths, model_name=None, model_id=None, compression="none"
+    ):
+        """
+        Upload many files in a single request, packed into a tar stream on
+        the fly, so small files do not each pay for a round trip.
+
+        :return: True if every file was stored
+        """
+        total = sum(file_size(file_path) or 0 for file_path in file_paths)
+        encodings = [
+            choose_encoding(compression, os.path.basename(file_path))
+            for file_path in file_paths
+        ]
+        click.echo(
+            f"\nAttempting to upload {len(file_paths)} model files "
+            "in one request...\n"
+        )
+        started = time.monotonic()
+        with transfer_progress(f"{len(file_paths)} files", total) as advance:
+            result = self.endpoint.upload_model_archive(
+                model_name,
+                model_id,
+                file_paths,
+                progress=advance,
+                encoding=next(filter(None, encodings), None),
+            )
+        elapsed = time.monotonic() - started
+        if not result["success"]:
+            click.echo(f"Failed to upload model files. {error_detail(result)}")
+            return False
+        stored = result["data"].get("files", [])
+        click.echo(
+            f"Uploaded {len(stored)} files ({format_byte_size(total)}) to model "
+            f"{result['data']['model_id']} in one request, {elapsed:.1f}s."
+        )
+        return True
+
+    def sync(
+        self, directory, model_id, delete=False, dry_run=False, workers=4, **options
+    ):
+        """
+        Make a model's files match a local directory.
+
+        New and changed files are uploaded concurrently; with `delete`, remote
+        files missing locally are deleted.
+
+        :param options: passed on to `_send`
+        :return: True if every transfer succeeded
+        """
+        with click_spinner.spinner():
+            result = self.endpoint.get_model(model_id)
+        if not result["success"]:
+            click.echo(f"Failed to get model. {error_detail(result)}")
+            return False
+        local = local_files(directory)
+        new, changed, unchanged, gone = plan_sync(
+            local, result["data"]["files"], delete
+        )
+        for symbol, names in (("+", new), ("~", changed), ("-", gone)):
+            for name in names:
+                click.echo(f"  {symbol} {name}")
+        if dry_run or not (new or changed or gone):
+            click.echo(
+                f"\n{len(new)} new, {len(changed)} changed, {len(gone)} to delete, "
+                f"{len(unchanged)} unchanged."
+            )
+            return True
+
+        click.echo()
+        jobs = [(local[name], False) for name in new]
+        jobs += [(local[name], True) for name in changed]
+        sent = self._send_all(jobs, None, model_id, workers, **options)
+        deleted = self._run_all(
+            [
+                functools.partial(self.endpoint.delete_model_file, model_id, name)
+                for name in gone
+            ],
+            workers,
+        )
+
+        counts = {"uploaded": 0, "unchanged": len(unchanged), "deleted": 0}
+        failed = 0
+        for name, (result, skipped) in zip(new + changed, sent):
+            if self._echo_sent(name, result, skipped):
+                counts["unchanged" if skipped else "uploaded"] += 1
+            else:
+                failed += 1
+        for name, result in zip(gone, deleted):
+            if result["success"]:
+                counts["deleted"] += 1
+                click.echo(f"  ✔ {name}: deleted")
+            else:
+                failed += 1
+                click.secho(f"  ✘ {name}: {error_detail(result)}", fg="red")
+        click.echo(
+            f"\n{counts['uploaded']} uploaded, {counts['deleted']} deleted, "
+            f"{counts['unchanged']} unchanged, {failed} failed."
+        )
+        return not failed
+
+    def verify(self, model_id, directory, workers=None):
+        """
+        Check local files against a model's files on the server.
+
+        Sizes are compared first; files of matching size are hashed in a pool
+        of processes and compared with the server's digests.
+
+        :param workers: hashing processes, all cores by default
+        :return: True if every remote file is present locally and matches
+        """
+        with click_spinner.spinner():
+            result = self.endpoint.get_model(model_id)
+        if not result["success"]:
+            click.echo(f"Failed to get model. {error_detail(result)}")
+            return False
+        remote = {file["file_name"]: file for file in result["data"]["files"]}
+        local = local_files(directory)
+        shared = sorted(name for name in remote if name in local)
+        by_algorithm = {}
+        for name in shared:
+            file = remote[name]
+            # hash what file_mismatch will: sizes match or the remote has none
+            expected_size = file.get("file_size")
+            if file.get("digest") and expected_size in (None, file_size(local[name])):
+                algorithm = file.get("algorithm") or DIGEST_ALGORITHM
+                by_algorithm.setdefault(algorithm, []).append(local[name])
+        to_hash = [path for paths in by_algorithm.values() for path in paths]
+
+        total = sum(file_size(file_path) or 0 for file_path in to_hash)
+        started = time.monotonic()
+        digests = {}
+        with transfer_progress(f"Hashing {len(to_hash)} files", total) as advance:
+            for algorithm, file_paths in by_algorithm.items():
+                digests.update(
+                    digest_files(
+                        file_paths,
+                        algorithm,
+                        workers,
+                        on_done=lambda path: advance(file_size(path) or 0),
+                    )
+                )
+        elapsed = time.monotonic() - started
+
+        def digest_file(file_path, algorithm):
+            digest = digests[file_path]
+            if isinstance(digest, OSError):
+                raise digest
+            return digest
+
+        counts = {"verified": 0, "mismatched": 0}
+        for name in shared:
+            try:
+                problem = file_mismatch(local[name], remote[name], digest_file)
+            except OSError as err:
+                problem = str(err)
+            if problem:
+                counts["mismatched"] += 1
+                click.secho(f"  ✘ {name}: {problem}", fg="red")
+            else:
+                counts["verified"] += 1
+                click.echo(f"  ✔ {name}")
+        missing = sorted(name for name in remote if name not in local)
+        extra = sorted(name for name in local if name not in remote)
+        for name in missing:
+            click.secho(f"  - {name}: missing locally", fg="red")
+        for name in extra:
+            click.echo(f"  + {name}: not on the server")
+        rate = total / elapsed if elapsed > 0 else 0
+        click.echo(
+            f"\n{counts['verified']} verified, {counts['mismatched']} mismatched, "
+            f"{len(missing)} missing locally, {len(extra)} not on the server."
+        )
+        click.echo(
+            f"Hashed {format_byte_size(total)} in {elapsed:.1f}s "
+            f"({format_byte_size(rate)}/s)."
+        )
+        return not (counts["mismatched"] or missing)
 
     def list_default(self, file_path="src/models/default_models.json"):
         click.echo("Default Models:")
@@ -100,28 +629,253 @@ class ModelFileCommands:
         else:
             click.echo(f"Failed to read model file. {result['response']['detail']}")
 
+    def _read_range(self, model_id, file_name, offset=0, length=None, tail=False):
+        result = self.endpoint.read_model_file_range(
+            model_id, file_name, offset, length, tail
+        )
+        if not result["success"]:
+            raise click.ClickException(
+                f"Failed to read model file. {error_detail(result)}"
+            )
+        return result["data"]
+
+    def pages(self, model_id, file_name, offset=0, length=None, page_size=None):
+        """
+        Yield a file's bytes from `offset`, one ranged request per page.
+
+        Pages are fetched only as they are consumed, so the first one arrives
+        at the same speed whatever the size of the file.
+        """
+        page_size = page_size or READ_PAGE_SIZE
+        end = None if length is None else offset + length
+        while end is None or offset < end:
+            want = page_size if end is None else min(page_size, end - offset)
+            page = self._read_range(model_id, file_name, offset, want)
+            if page["content"]:
+                yield page["content"]
+            offset += len(page["content"])
+            size = page["size"]
+            if len(page["content"]) < want or (size is not None and offset >= size):
+                return
+
+    def head_lines(self, model_id, file_name, lines, page_size=None):
+        """The first `lines` lines of a file, fetching only the pages needed."""
+        data = bytearray()
+        for page in self.pages(model_id, file_name, page_size=page_size):
+            data += page
+            if data.count(b"\n") >= lines:
+                break
+        return b"".join(data.splitlines(keepends=True)[:lines])
+
+    def tail_lines(self, model_id, file_name, lines, page_size=None):
+        """The last `lines` lines of a file, fetching pages back from the end."""
+        page_size = page_size or READ_PAGE_SIZE
+        page = self._read_range(model_id, file_name, length=page_size, tail=True)
+        data, offset = page["content"], page["offset"] or 0
+        # a trailing newline ends the last line rather than starting a new one
+        while offset > 0 and data.rstrip(b"\n").count(b"\n") < lines:
+            start = max(0, offset - page_size)
+            data = (
+                self._read_range(model_id, file_name, start, offset - start)["content"]
+                + data
+            )
+            offset = start
+        return b"".join(data.splitlines(keepends=True)[-lines:]) if lines else b""
+
+    def read_paged(
+        self,
+        model_id,
+        file_name,
+        offset=0,
+        length=None,
+        head=None,
+        tail=None,
+        pager=False,
+    ):
+        """
+        Print part of a model file: a byte range, or its first or last lines.
+
+        With `pager`, the range is shown in the system pager, which pulls
+        pages from the server as the user scrolls.
+        """
+        if head is not None:
+            text = [self.head_lines(model_id, file_name, head)]
+        elif tail is not None:
+            text = [self.tail_lines(model_id, file_name, tail)]
+        else:
+            text = self.pages(model_id, file_name, offset, length)
+        chunks = decode_utf8(text)
+        if pager:
+            click.echo_via_pager(chunks)
+        else:
+            for chunk in chunks:
+                click.echo(chunk, nl=False)
+
+    def download(
+        self,
+        model_id,
+        file_name,
+        output=None,
+        segment_size=DOWNLOAD_SEGMENT_SIZE,
+        parallelism=DOWNLOAD_PARALLELISM,
+        use_cache=True,
+        compression="none",
+    ):
+        """
+        Download a model file to disk; an interrupted download resumes.
+
+        :param output: destination file or directory, the current directory
+                       by default
+        :param use_cache: copy the file from the local cache when the cached
+                          version is current
+        :return: True if the file was downloaded
+        """
+        dest_path = output or file_name
+        if os.path.isdir(dest_path):
+            dest_path = os.path.join(dest_path, file_name)
+        with transfer_progress(file_name) as progress:
+            result = self.endpoint.download_model_file(
+                model_id,
+                file_name,
+                dest_path,
+                progress=progress,
+                on_size=progress.set_total,
+                segment_size=segment_size,
+                parallelism=parallelism,
+                use_cache=use_cache,
+                encoding=choose_encoding(compression, file_name),
+            )
+        if not result["success"]:
+            click.echo(f"Failed to download model file. {error_detail(result)}")
+            return False
+        size = format_byte_size(result["data"]["size"])
+        source = " from cache" if result["data"].get("cached") else ""
+        click.echo(
+            f"Downloaded {file_name} ({size}){source} to {result['data']['path']}"
+        )
+        return True
+
+    def pull_files(
+        self,
+        model_id,
+        directory,
+        workers=4,
+        segment_size=DOWNLOAD_SEGMENT_SIZE,
+        parallelism=DOWNLOAD_PARALLELISM,
+        use_cache=True,
+        compression="none",
+    ):
+        """
+        Download every file of a model into a directory concurrently.
+
+        Files already in the directory that match the manifest are skipped,
+        interrupted downloads resume, and each downloaded file is checked
+        against the manifest's size and digest.
+
+        :return: True if every file is present and verified
+        """
+        with click_spinner.spinner():
+            result = self.endpoint.get_model(model_id)
+        if not result["success"]:
+            click.echo(f"Failed to get model. {error_detail(result)}")
+            return False
+        remote = result["data"]["files"]
+        os.makedirs(directory, exist_ok=True)
+
+        def current(file):
+            dest_path = os.path.join(directory, file["file_name"])
+            if file_size(dest_path) is None:
+                return False
+            modified = remote_mtime(file.get("last_modified"))
+            if not file.get("digest") and (
+                modified is None or os.path.getmtime(dest_path) < modified
+            ):
+                return False
+            return file_mismatch(dest_path, file, self.endpoint.digest_file) is None
+
+        def pull(file, progress):
+            name = file["file_name"]
+            if name != os.path.basename(name) or name in ("", ".", ".."):
+                return f"unsafe file name {name!r}"
+            dest_path = os.path.join(directory, name)
+            result = self.endpoint.download_model_file(
+                model_id,
+                name,
+                dest_path,
+                progress=progress,
+                segment_size=segment_size,
+                parallelism=parallelism,
+                use_cache=use_cache,
+                encoding=choose_encoding(compression, name),
+            )
+            if not result["success"]:
+                return error_detail(result)
+            mismatch = file_mismatch(dest_path, file, self.endpoint.digest_file)
+            if mismatch:
+                os.remove(dest_path)
+                # a bad copy must not be served from the cache next time
+                if self.endpoint.cache:
+                    self.endpoint.cache.discard(model_id, name)
+            return mismatch
+
+        unchanged = [file for file in remote if current(file)]
+        pending = [file for file in remote if file not in unchanged]
+        pending.sort(key=lambda file: file.get("file_size") or 0, reverse=True)
+        total = sum(file.get("file_size") or 0 for file in pending)
+        click.echo(f"\nPulling {len(pending)} files of model {model_id}...\n")
+        started = time.monotonic()
+        with transfer_progress(f"{len(pending)} files", total) as advance:
+            problems = self._run_all(
+                [functools.partial(pull, file, advance) for file in pending], workers
+            )
+        elapsed = time.monotonic() - started
+
+        received = 0
+        for file in unchanged:
+            click.echo(f"  = {file['file_name']}: unchanged")
+        for file, problem in zip(pending, problems):
+            if problem:
+                click.secho(f"  ✘ {file['file_name']}: {problem}", fg="red")
+            else:
+                received += file.get("file_size") or 0
+                click.echo(f"  ✔ {file['file_name']}: downloaded")
+        failed = sum(1 for problem in problems if problem)
+        rate = received / elapsed if elapsed > 0 else 0
+        click.echo(
+            f"\n{len(pending) - failed} downloaded, {len(unchanged)} unchanged, "
+            f"{failed} failed."
+        )
+        click.echo(
+            f"Received {format_byte_size(received)} in {elapsed:.1f}s "
+            f"({format_byte_size(rate)}/s)."
+        )
+        return not failed
+
     def update(
         self,
         file_path: str,
         model_name: str | None = None,
         model_id: str | None = None,
+        part_size: int = UPLOAD_PART_SIZE,
+        parallelism: int = UPLOAD_PARALLELISM,
+        dedup: bool = True,
+        compression: str = "none",
     ):
         click.echo("\nAttempting to update model file...\n")
-        with click_spinner.spinner():
-            result = self.endpoint.update_model_file(
-                model_name=model_name, model_id=model_id, file_path=file_path
+        name, size = os.path.basename(file_path), file_size(file_path)
+        with transfer_progress(name, size) as advance:
+            result, skipped = self._send(
+                file_path,
+                model_name,
+                model_id,
+                True,
+                part_size,
+                parallelism,
+                dedup,
+                compression,
+                progress=advance,
             )
-        if result["success"]:
-            upload_date = datetime.strptime(
-                result["data"]["upload_date"], "%Y-%m-%dT%H:%M:%S.%f%z"
-            )
-            formatted_date = upload_date.astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
-            click.echo("Model file uploaded successfully:")
-            click.echo(f"  Model Name: {result['data']['model_name']}")
-            click.echo(f"  Model ID: {result['data']['model_id']}")
-            click.echo(f"  Upload Date: {formatted_date}")
-        else:
-            click.echo(f"Failed to upload model file: {result['response']['detail']}")
+        self._echo_uploaded(result, skipped)
 
     def delete_file(self, model_id, file_name):
         click.echo("\nAttempting to delete model file...\n")
@@ -142,6 +896,73 @@ class ModelFileCommands:
             click.echo(f"Failed to delete model. {result['response']['detail']}")
 
 
+def check_compression(ctx, param, value):
+    """Reject an encoding this install cannot produce."""
+    try:
+        choose_encoding(value, "")
+    except CompressionUnavailable as err:
+        raise click.BadParameter(str(err), ctx, param)
+    return value
+
+
+def compression_option(func):
+    return click.option(
+        "--compress",
+        "compression",
+        type=click.Choice(COMPRESSION_CHOICES),
+        default=TRANSFER_COMPRESSION,
+        show_default=True,
+        callback=check_compression,
+        help="Compress transfers; auto picks by file type.",
+    )(func)
+
+
+def rate_option(func):
+    """A --max-rate option that caps the command's transfers as it is parsed."""
+
+    def limit_rate(ctx, param, value):
+        ctx.obj.limit_rate(value)
+
+    return click.option(
+        "--max-rate",
+        default=MAX_TRANSFER_RATE,
+        type=ByteSize(minimum=0),
+        expose_value=False,
+        callback=limit_rate,
+        help="Bandwidth cap per second across all connections, e.g. 20MiB; "
+        "0 for none.  [default: MAX_TRANSFER_RATE or 0]",
+    )(func)
+
+
+def transfer_options(func):
+    """Options tuning how large files are split and sent."""
+    func = rate_option(func)
+    func = compression_option(func)
+    func = click.option(
+        "--parallel",
+        "-p",
+        "parallelism",
+        default=UPLOAD_PARALLELISM,
+        show_default=True,
+        type=click.IntRange(min=1),
+        help="Parts of a large file sent at once.",
+    )(func)
+    func = click.option(
+        "--dedup/--no-dedup",
+        default=True,
+        show_default=True,
+        help="Skip bytes the server already stores, checked by content digest.",
+    )(func)
+    func = click.option(
+        "--part-size",
+        default=UPLOAD_PART_SIZE,
+        show_default=True,
+        type=ByteSize(),
+        help="Part size for large files, e.g. 16MiB.",
+    )(func)
+    return func
+
+
 @click.group(cls=SubCommandGroup)
 @click.pass_context
 def model(ctx):
@@ -158,14 +979,90 @@ def model(ctx):
     "-f",
     required=True,
     prompt="Enter file path",
-    type=click.Path(exists=True),
+    type=click.Path(),
     shell_complete=click.Path().shell_complete,
+    help="A file, a directory, a quoted glob such as 'model-*.safetensors', "
+    "or - to read the file from stdin.",
 )
-def upload(ctx, model_name, model_id, file_path):
-    """Upload a model file."""
+@click.option(
+    "--file-name",
+    help="Name of the uploaded file when reading from stdin.",
+)
+@click.option(
+    "--tar",
+    "as_tar",
+    is_flag=True,
+    help="Send all the files as one tar stream, in a single request.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Files transferred at once.",
+)
+@transfer_options
+def upload(
+    ctx,
+    model_name,
+    model_id,
+    file_path,
+    file_name,
+    as_tar,
+    workers,
+    part_size,
+    parallelism,
+    dedup,
+    compression,
+):
+    """
+    Upload a model file, or all files in a directory or matching a glob.
+
+    With -f -, the file is read from stdin and streamed as it arrives.
+    """
+    if file_path == "-":
+        if as_tar:
+            raise click.UsageError("--tar cannot be used with -f - (stdin).")
+        if not file_name:
+            raise click.UsageError("--file-name is required when reading from stdin.")
+        if not model_name and not model_id:
+            raise click.UsageError(
+                "--model-name or --model-id is required when reading from stdin."
+            )
+        stream = click.get_binary_stream("stdin")
+        if not ctx.obj.upload_stream(
+            stream, file_name, model_name, model_id, compression
+        ):
+            ctx.exit(1)
+        return
+    if file_name:
+        raise click.UsageError("--file-name is only used with -f - (stdin).")
+    file_paths = expand_file_paths(file_path)
+    if not file_paths:
+        raise click.BadParameter(
+            f"No files match {file_path!r}.", param_hint="'--file-path'"
+        )
     if not model_name and not model_id:
         model_name = click.prompt("Enter model name")
-    ctx.obj.upload(model_name=model_name, model_id=model_id, file_path=file_path)
+    if as_tar:
+        if not ctx.obj.upload_archive(file_paths, model_name, model_id, compression):
+            ctx.exit(1)
+        return
+    options = {
+        "part_size": part_size,
+        "parallelism": parallelism,
+        "dedup": dedup,
+        "compression": compression,
+    }
+    if file_paths == [file_path]:
+        ctx.obj.upload(
+            model_name=model_name, model_id=model_id, file_path=file_path, **options
+        )
+    elif not ctx.obj.upload_many(
+        file_paths, model_name, model_id, workers=workers, **options
+    ):
+        ctx.exit(1)
 
 
 @model.command()
@@ -187,9 +1084,76 @@ def get(ctx, model_id):
 @click.pass_context
 @click.option("--model-id", "-id", required=True, prompt="Enter model ID")
 @click.option("--file-name", "-f", required=True, prompt="Enter file name")
-def read(ctx, model_id, file_name):
+@click.option(
+    "--offset", type=click.IntRange(min=0), help="First byte to read, from 0."
+)
+@click.option("--length", type=click.IntRange(min=1), help="Bytes to read.")
+@click.option("--head", type=click.IntRange(min=0), help="Show the first N lines.")
+@click.option("--tail", type=click.IntRange(min=0), help="Show the last N lines.")
+@click.option(
+    "--pager", is_flag=True, help="Page through the file, fetching as you scroll."
+)
+def read(ctx, model_id, file_name, offset, length, head, tail, pager):
     """Read contents of a model file."""
-    ctx.obj.read_file(model_id, file_name)
+    ranged = offset is not None or length is not None
+    if sum((ranged, head is not None, tail is not None)) > 1:
+        raise click.UsageError("Use only one of --offset/--length, --head or --tail.")
+    if not (ranged or pager or head is not None or tail is not None):
+        ctx.obj.read_file(model_id, file_name)
+        return
+    ctx.obj.read_paged(
+        model_id, file_name, offset or 0, length, head, tail, pager=pager
+    )
+
+
+@model.command()
+@click.pass_context
+@click.option("--model-id", "-id", required=True, prompt="Enter model ID")
+@click.option("--file-name", "-f", required=True, prompt="Enter file name")
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(),
+    help="Destination file or directory.  [default: ./FILE_NAME]",
+)
+@click.option(
+    "--parallel",
+    "-p",
+    "parallelism",
+    default=DOWNLOAD_PARALLELISM,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Segments of a large file fetched at once.",
+)
+@click.option(
+    "--segment-size",
+    default=DOWNLOAD_SEGMENT_SIZE,
+    show_default=True,
+    type=ByteSize(),
+    help="Segment size for parallel downloads, e.g. 32MiB.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    show_default=True,
+    help="Reuse a current copy from the local download cache.",
+)
+@compression_option
+@rate_option
+def download(
+    ctx, model_id, file_name, output, parallelism, segment_size, cache, compression
+):
+    """Download a model file to disk."""
+    if not ctx.obj.download(
+        model_id,
+        file_name,
+        output,
+        segment_size,
+        parallelism,
+        use_cache=cache,
+        compression=compression,
+    ):
+        ctx.exit(1)
 
 
 @model.command()
@@ -204,11 +1168,22 @@ def read(ctx, model_id, file_name):
     type=click.Path(exists=True),
     shell_complete=click.Path().shell_complete,
 )
-def update(ctx, model_name, model_id, file_path):
+@transfer_options
+def update(
+    ctx, model_name, model_id, file_path, part_size, parallelism, dedup, compression
+):
     """Update a model file."""
     if not model_name and not model_id:
         model_name = click.prompt("Enter model name")
-    ctx.obj.update(model_name=model_name, model_id=model_id, file_path=file_path)
+    ctx.obj.update(
+        model_name=model_name,
+        model_id=model_id,
+        file_path=file_path,
+        part_size=part_size,
+        parallelism=parallelism,
+        dedup=dedup,
+        compression=compression,
+    )
 
 
 @model.command()
@@ -226,3 +1201,131 @@ def delete_file(ctx, model_id, file_name):
 def delete(ctx, model_id):
     """Delete a model."""
     ctx.obj.delete_model(model_id)
+
+
+@model.command()
+@click.pass_context
+@click.argument(
+    "directory", type=click.Path(exists=True, file_okay=False), required=True
+)
+@click.option("--model-id", "-id", required=True, prompt="Enter model ID")
+@click.option(
+    "--delete", is_flag=True, help="Delete remote files that are not in DIRECTORY."
+)
+@click.option("--dry-run", is_flag=True, help="Show the changes without making them.")
+@click.option(
+    "--workers",
+    "-w",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Files transferred at once.",
+)
+@transfer_options
+def sync(
+    ctx,
+    directory,
+    model_id,
+    delete,
+    dry_run,
+    workers,
+    part_size,
+    parallelism,
+    dedup,
+    compression,
+):
+    """Upload new and changed files in DIRECTORY to a model."""
+    ok = ctx.obj.sync(
+        directory,
+        model_id,
+        delete=delete,
+        dry_run=dry_run,
+        workers=workers,
+        part_size=part_size,
+        parallelism=parallelism,
+        dedup=dedup,
+        compression=compression,
+    )
+    if not ok:
+        ctx.exit(1)
+
+
+@model.command("pull-files")
+@click.pass_context
+@click.option("--model-id", "-id", required=True, prompt="Enter model ID")
+@click.option(
+    "--dir",
+    "directory",
+    required=True,
+    type=click.Path(file_okay=False),
+    help="Directory to download the files into.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Files transferred at once.",
+)
+@click.option(
+    "--parallel",
+    "-p",
+    "parallelism",
+    default=DOWNLOAD_PARALLELISM,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Segments of each large file fetched at once.",
+)
+@click.option(
+    "--segment-size",
+    default=DOWNLOAD_SEGMENT_SIZE,
+    show_default=True,
+    type=ByteSize(),
+    help="Segment size for parallel downloads, e.g. 32MiB.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    show_default=True,
+    help="Reuse current copies from the local download cache.",
+)
+@compression_option
+@rate_option
+def pull_files(
+    ctx, model_id, directory, workers, parallelism, segment_size, cache, compression
+):
+    """Download every file of a model into a directory."""
+    ok = ctx.obj.pull_files(
+        model_id,
+        directory,
+        workers=workers,
+        segment_size=segment_size,
+        parallelism=parallelism,
+        use_cache=cache,
+        compression=compression,
+    )
+    if not ok:
+        ctx.exit(1)
+
+
+@model.command()
+@click.pass_context
+@click.option("--model-id", "-id", required=True, prompt="Enter model ID")
+@click.option(
+    "--dir",
+    "directory",
+    required=True,
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory holding the local copies of the model's files.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    help="Files hashed at once.  [default: number of CPUs]",
+)
+def verify(ctx, model_id, directory, workers):
+    """Check local files against a model's files on the server."""
+    if not ctx.obj.verify(model_id, directory, workers):
+        ctx.exit(1)
@@ -3,12 +3,17 @@ import subprocess
 import click
 import click_spinner
 
-from src.api.api_client import APIClient
+from src.api.api_client import get_client
 from src.api.auth_api import AuthAPI
 from src.api.user_api import UserAPI
 
-endpoint = AuthAPI(APIClient())
-user_endpoint = UserAPI(APIClient())
+
+def get_auth_endpoint() -> AuthAPI:
+    return AuthAPI(get_client())
+
+
+def get_user_endpoint() -> UserAPI:
+    return UserAPI(get_client())
 
 
 @click.command()
@@ -17,7 +22,7 @@ user_endpoint = UserAPI(APIClient())
 def login(email, password):
     """Login to the application."""
     with click_spinner.spinner():
-        result = endpoint.login(email, password)
+        result = get_auth_endpoint().login(email, password)
     if result["success"]:
         click.echo(f"Successfully logged in. {result['data']}")
         subprocess.run("quack", shell=True)
@@ -29,7 +34,7 @@ def login(email, password):
 def logout():
     """Logout from the application."""
     with click_spinner.spinner():
-        result = endpoint.logout()
+        result = get_auth_endpoint().logout()
     if result:
         click.echo("Successfully logged out.")
     else:
@@ -44,7 +49,7 @@ def logout():
 def register(ctx, username, email, password):
     """Register with Duckington Labs."""
     with click_spinner.spinner():
-        result = user_endpoint.register(username, email, password)
+        result = get_user_endpoint().register(username, email, password)
     if result["success"]:
         click.echo("Welcome to Duckington Labs, you've successfully registered as:")
         click.echo(f"  - Username: {result['data']['user_name']}")
@@ -9,3 +9,44 @@ API_BASE_URL = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
 
 # CLI settings
 CLI_VERSION = os.getenv("CLI_VERSION", "0.1.0")
+
+# HTTP connection pool settings
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))
+
+# HTTP retry settings
+HTTP_RETRY_MAX_ATTEMPTS = int(os.getenv("HTTP_RETRY_MAX_ATTEMPTS", "4"))
+HTTP_RETRY_BACKOFF_BASE = float(os.getenv("HTTP_RETRY_BACKOFF_BASE", "0.5"))
+HTTP_RETRY_BACKOFF_MAX = float(os.getenv("HTTP_RETRY_BACKOFF_MAX", "30"))
+
+# HTTP timeout settings, in seconds
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "120"))
+
+# Local state directory for resumable transfers and caches
+QUACK_HOME = os.path.expanduser(os.getenv("QUACK_HOME", "~/.quack"))
+
+# Model file upload settings, sizes in bytes
+CHUNKED_UPLOAD_THRESHOLD = int(os.getenv("CHUNKED_UPLOAD_THRESHOLD", 64 * 1024**2))
+UPLOAD_PART_SIZE = int(os.getenv("UPLOAD_PART_SIZE", 16 * 1024**2))
+UPLOAD_PARALLELISM = int(os.getenv("UPLOAD_PARALLELISM", "8"))
+
+# Content digest used to skip uploading bytes the server already stores
+DIGEST_ALGORITHM = os.getenv("DIGEST_ALGORITHM", "sha256")
+
+# Model file download settings; files of at least two segments are fetched
+# as parallel ranged requests
+DOWNLOAD_SEGMENT_SIZE = int(os.getenv("DOWNLOAD_SEGMENT_SIZE", 32 * 1024**2))
+DOWNLOAD_PARALLELISM = int(os.getenv("DOWNLOAD_PARALLELISM", "8"))
+
+# Bytes fetched per page by paged `model read`
+READ_PAGE_SIZE = int(os.getenv("READ_PAGE_SIZE", 64 * 1024))
+
+# Size cap of the local cache of downloaded model files; 0 turns it off
+FILE_CACHE_MAX_BYTES = int(os.getenv("FILE_CACHE_MAX_BYTES", 10 * 1024**3))
+
+# Compression of model file transfers: auto, zstd, gzip or none
+TRANSFER_COMPRESSION = os.getenv("TRANSFER_COMPRESSION", "none")
+
+# Cap on model file transfer bandwidth in bytes a second; 0 is unlimited
+MAX_TRANSFER_RATE = int(os.getenv("MAX_TRANSFER_RATE", "0"))
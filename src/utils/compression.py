@@ -0,0 +1,200 @@
+"""
+Streaming compression of transfer bodies.
+
+gzip is always available; zstd needs the optional ``zstandard`` package and
+is preferred when it is installed. Compression runs on a background thread
+a few blocks ahead of the network, so CPU work overlaps I/O.
+"""
+
+import queue
+import threading
+import zlib
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+COMPRESSION_BLOCK_SIZE = 1024**2
+
+# blocks a background thread may run ahead of its consumer
+PIPELINE_DEPTH = 4
+
+# fast levels: the link, not the ratio, should stay the bottleneck
+COMPRESSION_LEVELS = {"gzip": 3, "zstd": 3}
+
+# file types that usually shrink: unquantized weights, tokenizers, configs
+# and text; quantized .gguf weights barely do, see benchmarks/compression.py
+COMPRESSIBLE_SUFFIXES = (
+    ".safetensors",
+    ".bin",
+    ".pt",
+    ".pth",
+    ".ckpt",
+    ".onnx",
+    ".npy",
+    ".model",
+    ".json",
+    ".txt",
+    ".yaml",
+    ".yml",
+    ".csv",
+    ".log",
+)
+
+COMPRESSION_CHOICES = ("auto", "zstd", "gzip", "none")
+
+
+class CompressionUnavailable(RuntimeError):
+    """The requested encoding needs a package that is not installed."""
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Encodings this install can produce, preferred first."""
+    return ("zstd", "gzip") if _zstandard() else ("gzip",)
+
+
+def choose_encoding(choice: str, file_name: str) -> Optional[str]:
+    """
+    The encoding to send a file with: `choice` itself, or for "auto" the
+    preferred encoding when the file type usually compresses well.
+
+    :return: None when the file is sent as is
+    """
+    if choice == "none":
+        return None
+    if choice == "auto":
+        if not file_name.lower().endswith(COMPRESSIBLE_SUFFIXES):
+            return None
+        return available_encodings()[0]
+    if choice not in available_encodings():
+        raise CompressionUnavailable(
+            f"{choice} compression needs the zstandard package: "
+            "pip install zstandard"
+        )
+    return choice
+
+
+def compressor(encoding: str, level: Optional[int] = None):
+    """An object whose `compress` and `flush` produce `encoding`."""
+    level = COMPRESSION_LEVELS.get(encoding) if level is None else level
+    if encoding == "gzip":
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if encoding == "zstd" and _zstandard():
+        return _zstandard().ZstdCompressor(level=level).compressobj()
+    raise CompressionUnavailable(f"Cannot compress with {encoding}.")
+
+
+def decompressor(encoding: str):
+    """An object whose `decompress` and `flush` undo `encoding`."""
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.decompressobj()
+    if encoding == "zstd" and _zstandard():
+        return _zstandard().ZstdDecompressor().decompressobj()
+    raise CompressionUnavailable(f"Cannot decompress {encoding}.")
+
+
+def can_decode(encoding: str) -> bool:
+    return encoding in ("gzip", "x-gzip", "deflate") or (
+        encoding == "zstd" and _zstandard() is not None
+    )
+
+
+def compress_blocks(
+    blocks: Iterable[bytes], encoding: str, level: Optional[int] = None
+) -> Iterator[bytes]:
+    codec = compressor(encoding, level)
+    for block in blocks:
+        if compressed := codec.compress(block):
+            yield compressed
+    yield codec.flush()
+
+
+def decompress_blocks(blocks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    codec = decompressor(encoding)
+    for block in blocks:
+        if decompressed := codec.decompress(block):
+            yield decompressed
+    if tail := codec.flush():
+        yield tail
+
+
+_DONE = object()
+
+
+def in_background(blocks: Iterable[bytes], depth: int = PIPELINE_DEPTH):
+    """
+    Produce `blocks` on a background thread, up to `depth` blocks ahead of
+    the consumer. An error while producing is raised to the consumer.
+    """
+    pending: queue.Queue = queue.Queue(depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for block in blocks:
+                if not put(block):
+                    return
+        except Exception as err:
+            put(err)
+        else:
+            put(_DONE)
+
+    thread = threading.Thread(target=produce, name="quack-compress", daemon=True)
+    thread.start()
+    try:
+        while (item := pending.get()) is not _DONE:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class CompressedBody:
+    """
+    A request body compressed on the fly on a background thread.
+
+    It has no length, so it is sent with chunked transfer encoding. Iterating
+    again compresses the source again, so a re-iterable source, such as a
+    `MultipartEncoder` or a buffer, can be retried.
+    """
+
+    def __init__(
+        self,
+        source: Union[bytes, memoryview, Iterable[bytes]],
+        encoding: str,
+        level: Optional[int] = None,
+        block_size: int = COMPRESSION_BLOCK_SIZE,
+    ):
+        self.source = source
+        self.encoding: str = encoding
+        self.level: Optional[int] = level
+        self.block_size: int = block_size
+
+    def _blocks(self) -> Iterator[bytes]:
+        if isinstance(self.source, (bytes, bytearray, memoryview)):
+            view = memoryview(self.source)
+            for offset in range(0, len(view), self.block_size):
+                yield view[offset : offset + self.block_size]
+        else:
+            yield from self.source
+
+    def __iter__(self) -> Iterator[bytes]:
+        return in_background(compress_blocks(self._blocks(), self.encoding, self.level))
@@ -0,0 +1,34 @@
+import threading
+from typing import Dict, Optional
+
+from src.utils.password_handler import PasswordHandler
+
+
+class CredentialProvider:
+    """Keyring-backed credentials, each key read from the backend at most once."""
+
+    def __init__(self, password_handler: PasswordHandler):
+        self.password_handler: PasswordHandler = password_handler
+        self._cache: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = self.password_handler.get_password(key)
+            return self._cache[key]
+
+    def override(self, key: str, value: Optional[str]) -> None:
+        """Replace the in-memory value without touching the keyring."""
+        with self._lock:
+            self._cache[key] = value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self.password_handler.set_password(key, value)
+            self._cache[key] = value
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            self._cache[key] = None
+            return self.password_handler.delete_password(key)
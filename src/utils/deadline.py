@@ -0,0 +1,49 @@
+import threading
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a command has used up its total time budget."""
+
+
+class Deadline:
+    """
+    A total time budget shared by every request a command makes.
+
+    The clock starts on the first call to `remaining`, so time spent in
+    prompts before the first request is not counted.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds: Optional[float] = seconds
+        self._expires_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left in the budget, or None when there is no deadline."""
+        if self.seconds is None:
+            return None
+        with self._lock:
+            if self._expires_at is None:
+                self._expires_at = time.monotonic() + self.seconds
+            return self._expires_at - time.monotonic()
+
+    def check(self) -> Optional[float]:
+        """Return the remaining time, raising once the budget is spent."""
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(f"Deadline of {self.seconds:g}s exceeded")
+        return remaining
+
+
+_deadline = Deadline()
+
+
+def set_deadline(seconds: Optional[float]) -> None:
+    global _deadline
+    _deadline = Deadline(seconds)
+
+
+def get_deadline() -> Deadline:
+    return _deadline
@@ -0,0 +1,232 @@
+import functools
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from src.config.settings import FILE_CACHE_MAX_BYTES, QUACK_HOME
+
+FILE_CACHE_DIR = os.path.join(QUACK_HOME, "cache")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    model_id TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    validator TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model_id, file_name)
+)
+"""
+
+
+class FileCache:
+    """
+    Local copies of downloaded model files, with least-recently-used eviction.
+
+    Each file is stored with the server's validator for that version (its
+    ETag or Last-Modified), and is only served while the server still
+    reports the same validator. The total size stays under `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = FILE_CACHE_MAX_BYTES,
+        timeout: float = 30.0,
+    ):
+        self.directory: str = directory or FILE_CACHE_DIR
+        self.max_bytes: int = max_bytes
+        self.timeout: float = timeout
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, "index.sqlite")
+
+    def _connect(self, create: bool = True) -> Optional[sqlite3.Connection]:
+        """The index, or None when it does not exist yet and `create` is off."""
+        if self._connection is None:
+            if not create and not os.path.exists(self.index_path):
+                return None
+            os.makedirs(os.path.join(self.directory, "blobs"), exist_ok=True)
+            connection = sqlite3.connect(
+                self.index_path, timeout=self.timeout, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _blob_path(self, blob: str) -> str:
+        return os.path.join(self.directory, "blobs", blob)
+
+    def validator(self, model_id: str, file_name: str) -> Optional[str]:
+        """The validator of the cached version of a file, if there is one."""
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return None
+            row = connection.execute(
+                "SELECT validator FROM entries WHERE model_id = ? AND file_name = ?",
+                (model_id, file_name),
+            ).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, model_id: str, file_name: str, validator: str) -> Optional[str]:
+        """Path of the cached file if it matches `validator`; marks it used."""
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return None
+            row = connection.execute(
+                "SELECT blob, size, mtime_ns FROM entries"
+                " WHERE model_id = ? AND file_name = ? AND validator = ?",
+                (model_id, file_name, validator),
+            ).fetchone()
+            if row is None:
+                return None
+            path = self._blob_path(row[0])
+            with connection:
+                # a linked blob is the downloaded file itself, which may have
+                # been edited in place since it was cached
+                if _stat(path) != (row[1], row[2]):
+                    connection.execute("DELETE FROM entries WHERE blob = ?", (row[0],))
+                    return None
+                connection.execute(
+                    "UPDATE entries SET last_used = ? WHERE blob = ?",
+                    (time.time(), row[0]),
+                )
+        return path
+
+    def put(
+        self, model_id: str, file_name: str, validator: str, file_path: str
+    ) -> Optional[str]:
+        """
+        Store a downloaded file, evicting the least recently used files to
+        stay under the size cap.
+
+        The file is hard-linked into the cache when it is on the same
+        filesystem, and copied otherwise; a copy happens outside the lock,
+        which is only held to update the index. A linked entry is dropped
+        once the downloaded file is modified in place.
+
+        :return: the cached path, or None if the file is larger than the cap
+        """
+        size = os.path.getsize(file_path)
+        if size > self.max_bytes:
+            return None
+        key = f"{model_id}\0{file_name}\0{validator}".encode()
+        blob = hashlib.sha256(key).hexdigest()
+        os.makedirs(os.path.join(self.directory, "blobs"), exist_ok=True)
+        tmp_path = f"{self._blob_path(blob)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        _remove(tmp_path)
+        try:
+            os.link(file_path, tmp_path)
+        except OSError:
+            # another filesystem (EXDEV), or one without hard links
+            shutil.copyfile(file_path, tmp_path)
+        os.replace(tmp_path, self._blob_path(blob))
+        size, mtime_ns = _stat(self._blob_path(blob))
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                old = connection.execute(
+                    "SELECT blob FROM entries WHERE model_id = ? AND file_name = ?",
+                    (model_id, file_name),
+                ).fetchone()
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (model_id, file_name, validator, blob, size, mtime_ns, time.time()),
+                )
+            if old and old[0] != blob:
+                _remove(self._blob_path(old[0]))
+            self._evict(connection)
+        return self._blob_path(blob)
+
+    def discard(self, model_id: str, file_name: str) -> None:
+        """Drop the cached copy of a file, if there is one."""
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return
+            with connection:
+                row = connection.execute(
+                    "SELECT blob FROM entries WHERE model_id = ? AND file_name = ?",
+                    (model_id, file_name),
+                ).fetchone()
+                if row is None:
+                    return
+                connection.execute(
+                    "DELETE FROM entries WHERE model_id = ? AND file_name = ?",
+                    (model_id, file_name),
+                )
+            _remove(self._blob_path(row[0]))
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries")
+        total = total.fetchone()[0]
+        rows = connection.execute(
+            "SELECT blob, size FROM entries ORDER BY last_used"
+        ).fetchall()
+        for blob, size in rows:
+            if total <= self.max_bytes:
+                break
+            with connection:
+                connection.execute("DELETE FROM entries WHERE blob = ?", (blob,))
+            _remove(self._blob_path(blob))
+            total -= size
+
+    def size(self) -> int:
+        """Total bytes of cached files."""
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return 0
+            return connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return
+            blobs = connection.execute("SELECT blob FROM entries").fetchall()
+            with connection:
+                connection.execute("DELETE FROM entries")
+            for (blob,) in blobs:
+                _remove(self._blob_path(blob))
+
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@functools.cache
+def get_file_cache() -> FileCache:
+    """The download cache shared by everything in this process."""
+    return FileCache()
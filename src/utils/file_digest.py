@@ -0,0 +1,84 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.config.settings import DIGEST_ALGORITHM
+from src.utils.helpers.mapped_file import mapped_file
+
+DIGEST_BLOCK_SIZE = 1024**2
+
+
+def file_digest(
+    file_path: str, algorithm: str = DIGEST_ALGORITHM, part_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Hash a file in one streaming pass over a memory map.
+
+    :param algorithm: any hashlib algorithm, e.g. sha256 or blake2b
+    :param part_size: also hash each part of this size, as sent by a chunked upload
+    :return: the algorithm, the file's hex digest and the list of part digests
+    """
+    whole = hashlib.new(algorithm)
+    part_digests: List[str] = []
+    with mapped_file(file_path) as view:
+        size = len(view)
+        step = part_size or max(size, 1)
+        for start in range(0, max(size, 1), step):
+            # without parts, hash each block once rather than twice
+            part = hashlib.new(algorithm) if part_size else None
+            end = min(start + step, size)
+            for offset in range(start, end, DIGEST_BLOCK_SIZE):
+                with view[offset : min(offset + DIGEST_BLOCK_SIZE, end)] as block:
+                    whole.update(block)
+                    if part is not None:
+                        part.update(block)
+            if part is not None:
+                part_digests.append(part.hexdigest())
+    return {
+        "algorithm": algorithm,
+        "digest": whole.hexdigest(),
+        "part_digests": part_digests,
+    }
+
+
+def digest_files(
+    file_paths: Iterable[str],
+    algorithm: str = DIGEST_ALGORITHM,
+    workers: Optional[int] = None,
+    on_done: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Hash many files at once in a pool of processes, one file per process
+    at a time, so hashing is spread over every core.
+
+    :param workers: processes to use, all cores by default
+    :param on_done: called with each file's path as its hash completes
+    :return: each file's `file_digest`, or the `OSError` that hashing it raised
+    """
+    file_paths = sorted(file_paths, key=_size, reverse=True)  # largest first
+    results: Dict[str, Any] = {}
+    if not file_paths:
+        return results
+    workers = min(workers or os.cpu_count() or 1, len(file_paths))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(file_digest, file_path, algorithm): file_path
+            for file_path in file_paths
+        }
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                results[file_path] = future.result()
+            except OSError as err:
+                results[file_path] = err
+            if on_done:
+                on_done(file_path)
+    return results
+
+
+def _size(file_path: str) -> int:
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
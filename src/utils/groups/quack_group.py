@@ -1,13 +1,46 @@
+"""
+Utility module for extending click.Group using custom formatters.
+"""
+
+import importlib
 import io
+from typing import Dict, Optional
 
 import click
-from rich.console import Console as rConsole
-
-from src.utils.formatters.quack_formatter import MainframeFormatter
 
 
 class QuackGroup(click.Group):
+    def __init__(
+        self, *args, lazy_subcommands: Optional[Dict[str, str]] = None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        # command name -> "package.module.attr", imported on first lookup
+        self.lazy_subcommands: Dict[str, str] = dict(lazy_subcommands or {})
+
+    def list_commands(self, ctx):
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        import_path = self.lazy_subcommands.pop(cmd_name)
+        module_name, attr = import_path.rsplit(".", 1)
+        cmd = getattr(importlib.import_module(module_name), attr)
+        if not isinstance(cmd, click.Command):
+            raise ValueError(f"{import_path} is not a click command")
+        self.add_command(cmd, cmd_name)
+        return cmd
+
     def format_help(self, ctx, formatter):
+        # rich and pyfiglet are only needed to render help, keep them off the
+        # import path of regular invocations
+        from rich.console import Console as rConsole
+
+        from src.utils.formatters.quack_formatter import MainframeFormatter
+
         sio = io.StringIO()
         console = rConsole(file=sio, force_terminal=True)
         help_formatter = MainframeFormatter(console)
@@ -26,15 +59,18 @@ class QuackGroup(click.Group):
 
         help_formatter.format_options(options)
 
-        if self.commands:
+        all_cmds = {
+            name: self.get_command(ctx, name) for name in self.list_commands(ctx)
+        }
+        if all_cmds:
             commands = {
                 name: cmd
-                for name, cmd in self.commands.items()
+                for name, cmd in all_cmds.items()
                 if not isinstance(cmd, click.Group)
             }
             subcommands = {
                 name: cmd
-                for name, cmd in self.commands.items()
+                for name, cmd in all_cmds.items()
                 if isinstance(cmd, click.Group)
             }
 
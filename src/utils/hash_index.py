@@ -0,0 +1,133 @@
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.config.settings import DIGEST_ALGORITHM, QUACK_HOME
+from src.utils.file_digest import file_digest
+
+HASH_INDEX_PATH = os.path.join(QUACK_HOME, "hash-index.sqlite")
+
+# Files modified this recently may still change within the same mtime tick,
+# so their digests are not recorded.
+RACY_WINDOW_NS = 2 * 10**9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    path TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    part_size INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    part_digests TEXT NOT NULL,
+    PRIMARY KEY (path, algorithm, part_size)
+)
+"""
+
+
+class HashIndex:
+    """
+    On-disk cache of file digests, so unchanged files are never re-hashed.
+
+    Entries are keyed by absolute path and checked against the file's size,
+    mtime and inode. The index is an SQLite database in WAL mode; its file
+    locks let several quack processes read and update it at once.
+    """
+
+    def __init__(self, path: Optional[str] = None, timeout: float = 30.0):
+        self.path: str = path or HASH_INDEX_PATH
+        self.timeout: float = timeout
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def lookup(
+        self, file_path: str, algorithm: str = DIGEST_ALGORITHM, part_size: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """The recorded digest of a file, if the file is unchanged since."""
+        stat = os.stat(file_path)
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT size, mtime_ns, inode, digest, part_digests FROM digests"
+                    " WHERE path = ? AND algorithm = ? AND part_size = ?",
+                    (os.path.abspath(file_path), algorithm, part_size),
+                )
+                .fetchone()
+            )
+        if row is None or row[:3] != (stat.st_size, stat.st_mtime_ns, stat.st_ino):
+            return None
+        return {
+            "algorithm": algorithm,
+            "digest": row[3],
+            "part_digests": json.loads(row[4]),
+        }
+
+    def record(
+        self, file_path: str, stat: os.stat_result, digest: Dict[str, Any], part_size=0
+    ) -> None:
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    os.path.abspath(file_path),
+                    digest["algorithm"],
+                    part_size,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    stat.st_ino,
+                    digest["digest"],
+                    json.dumps(digest["part_digests"]),
+                ),
+            )
+
+    def digest(
+        self,
+        file_path: str,
+        algorithm: str = DIGEST_ALGORITHM,
+        part_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        `file_digest` of a file, read from the index when the file is unchanged.
+        """
+        found = self.lookup(file_path, algorithm, part_size or 0)
+        if found is not None:
+            return found
+        before = os.stat(file_path)
+        result = file_digest(file_path, algorithm, part_size)
+        after = os.stat(file_path)
+        unchanged = (before.st_size, before.st_mtime_ns) == (
+            after.st_size,
+            after.st_mtime_ns,
+        )
+        if unchanged and time.time_ns() - after.st_mtime_ns >= RACY_WINDOW_NS:
+            self.record(file_path, after, result, part_size or 0)
+        return result
+
+
+@functools.cache
+def get_hash_index() -> HashIndex:
+    """The hash index shared by everything in this process."""
+    return HashIndex()
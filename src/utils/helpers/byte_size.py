@@ -0,0 +1,53 @@
+import re
+
+import click
+
+UNITS = {
+    "": 1,
+    "b": 1,
+    "k": 1024,
+    "kb": 1000,
+    "kib": 1024,
+    "m": 1024**2,
+    "mb": 1000**2,
+    "mib": 1024**2,
+    "g": 1024**3,
+    "gb": 1000**3,
+    "gib": 1024**3,
+}
+
+
+def parse_byte_size(text: str) -> int:
+    """Parse a size such as `1048576`, `512k`, `16MiB` or `1.5GB` into bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*", str(text))
+    if not match or match.group(2).lower() not in UNITS:
+        raise ValueError(f"invalid size {text!r}")
+    return int(float(match.group(1)) * UNITS[match.group(2).lower()])
+
+
+def format_byte_size(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class ByteSize(click.ParamType):
+    """Click parameter for a byte size, with optional unit suffix."""
+
+    name = "size"
+
+    def __init__(self, minimum: int = 1):
+        self.minimum: int = minimum
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, int):
+            size = value
+        else:
+            try:
+                size = parse_byte_size(value)
+            except ValueError as err:
+                self.fail(str(err), param, ctx)
+        if size < self.minimum:
+            self.fail(f"must be at least {self.minimum} bytes", param, ctx)
+        return size
@@ -1,6 +1,8 @@
 from typing import Callable
 from functools import wraps
-from requests.exceptions import HTTPError, ConnectionError
+from requests.exceptions import HTTPError, ConnectionError, Timeout
+
+from src.utils.deadline import DeadlineExceeded
 
 
 def handle_api_errors(func: Callable) -> Callable:
@@ -16,6 +18,13 @@ def handle_api_errors(func: Callable) -> Callable:
                 "status_code": http_err.response.status_code,
                 "response": http_err.response.json(),
             }
+        except (Timeout, DeadlineExceeded) as timeout_err:
+            return {
+                "success": False,
+                "error": "Timeout",
+                "message": str(timeout_err),
+                "response": {"detail": "Request timed out"},
+            }
         except ConnectionError as conn_err:
             return {
                 "success": False,
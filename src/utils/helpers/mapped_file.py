@@ -0,0 +1,22 @@
+import mmap
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def mapped_file(file_path: str) -> Iterator[memoryview]:
+    """
+    Map a file read-only and yield a view of its bytes.
+
+    Slices of the view read straight from the page cache without copying.
+    Release any slices before the block ends. Empty files cannot be mapped,
+    so they give an empty view.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(0, 2)
+        if file.tell() == 0:
+            yield memoryview(b"")
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                yield view
@@ -0,0 +1,22 @@
+class AdaptiveInterval:
+    """
+    Polling interval that backs off while nothing changes.
+
+    The interval grows by `factor` after every quiet round, up to `maximum`,
+    and drops back to `initial` as soon as a round observes progress.
+    """
+
+    def __init__(
+        self, initial: float = 1.0, maximum: float = 15.0, factor: float = 1.5
+    ):
+        self.initial: float = initial
+        self.maximum: float = maximum
+        self.factor: float = factor
+        self.current: float = initial
+
+    def next(self, progressed: bool = False) -> float:
+        if progressed:
+            self.current = self.initial
+        interval = self.current
+        self.current = min(self.maximum, self.current * self.factor)
+        return interval
@@ -0,0 +1,117 @@
+import os
+import uuid
+from typing import BinaryIO, Callable, Iterator, Optional
+
+MULTIPART_BLOCK_SIZE = 1024**2
+
+
+class _MultipartBody:
+    """The framing of a multipart/form-data body holding a single file."""
+
+    def __init__(
+        self,
+        field_name: str,
+        file_name: str,
+        content_type: str = "application/octet-stream",
+        block_size: int = MULTIPART_BLOCK_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+    ):
+        self.block_size: int = block_size
+        self.progress: Optional[Callable[[int], None]] = progress
+        self.boundary: str = uuid.uuid4().hex
+        file_name = file_name.replace('"', "%22")
+        self._head: bytes = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; '
+            f'filename="{file_name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self._tail: bytes = f"\r\n--{self.boundary}--\r\n".encode()
+        self._sent: int = 0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _advance(self, size: int) -> None:
+        self._sent += size
+        if self.progress:
+            self.progress(size)
+
+
+class MultipartEncoder(_MultipartBody):
+    """
+    A multipart/form-data body that streams one file in fixed-size blocks.
+
+    Memory use stays at one block whatever the size of the file. The length
+    is known up front, so the body is sent with a Content-Length rather than
+    chunked, and iterating again starts over, so a failed request can be
+    retried.
+    """
+
+    def __init__(
+        self,
+        field_name: str,
+        file_path: str,
+        file_name: Optional[str] = None,
+        content_type: str = "application/octet-stream",
+        block_size: int = MULTIPART_BLOCK_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+    ):
+        super().__init__(
+            field_name,
+            file_name or os.path.basename(file_path),
+            content_type,
+            block_size,
+            progress,
+        )
+        self.file_path: str = file_path
+        self.file_size: int = os.path.getsize(file_path)
+
+    def __len__(self) -> int:
+        return len(self._head) + self.file_size + len(self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self._sent:
+            # a retry sends the file again, so take back the earlier progress
+            self._advance(-self._sent)
+        yield self._head
+        with open(self.file_path, "rb") as file:
+            while block := file.read(self.block_size):
+                yield block
+                self._advance(len(block))
+        yield self._tail
+
+
+class MultipartStreamEncoder(_MultipartBody):
+    """
+    A multipart/form-data body read from a stream of unknown length, such
+    as a pipe on stdin.
+
+    It has no length, so it is sent with chunked transfer encoding. A stream
+    cannot be rewound, so the body can only be iterated once and a request
+    that fails part way through cannot be retried.
+    """
+
+    def __init__(
+        self,
+        field_name: str,
+        stream: BinaryIO,
+        file_name: str,
+        content_type: str = "application/octet-stream",
+        block_size: int = MULTIPART_BLOCK_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+    ):
+        super().__init__(field_name, file_name, content_type, block_size, progress)
+        self.stream: BinaryIO = stream
+        self._started: bool = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self._started:
+            raise IOError("A stream upload cannot be retried once it has started.")
+        self._started = True
+        yield self._head
+        while block := self.stream.read(self.block_size):
+            yield block
+            self._advance(len(block))
+        yield self._tail
@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from rich.progress import (
+    BarColumn,
+    DownloadColumn,
+    Progress,
+    TaskID,
+    TextColumn,
+    TimeRemainingColumn,
+    TransferSpeedColumn,
+)
+
+
+def transfer_columns():
+    return (
+        TextColumn("[bold]{task.description}"),
+        BarColumn(),
+        DownloadColumn(binary_units=True),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+    )
+
+
+class TransferTask:
+    """Thread-safe handle on one progress bar; call it with bytes transferred."""
+
+    def __init__(self, progress: Progress, task: TaskID):
+        self.progress: Progress = progress
+        self.task: TaskID = task
+
+    def __call__(self, size: int) -> None:
+        self.progress.update(self.task, advance=size)
+
+    def set_total(self, total: Optional[int]) -> None:
+        self.progress.update(self.task, total=total)
+
+
+@contextmanager
+def transfer_progress(
+    description: str, total: Optional[int] = None
+) -> Iterator[TransferTask]:
+    """
+    Show a byte progress bar with throughput and ETA while the block runs.
+
+    Yields a callable that advances the bar by a number of bytes.
+    """
+    with Progress(*transfer_columns()) as progress:
+        yield TransferTask(progress, progress.add_task(description, total=total))
@@ -0,0 +1,106 @@
+"""
+Bandwidth caps for model-file transfers.
+
+One `TokenBucket` is shared by every connection of a command, so parallel
+parts and files together stay under the cap.
+"""
+
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+# bytes sent or received between checks of the bucket
+THROTTLE_BLOCK_SIZE = 64 * 1024
+
+
+class TokenBucket:
+    """
+    A byte-rate limit with a burst allowance of `burst` bytes.
+
+    Callers take tokens up front and then sleep off any shortfall outside
+    the lock, so concurrent callers queue up fairly behind each other and
+    the total rate across threads stays at `rate`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate: float = rate
+        self.burst: float = max(burst or rate, THROTTLE_BLOCK_SIZE)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens: float = self.burst
+        self._updated: float = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: int) -> float:
+        """
+        Take `amount` bytes' worth of tokens, waiting until they are earned.
+
+        :return: the seconds waited
+        """
+        with self._lock:
+            now = self.clock()
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+Source = Union[bytes, memoryview, Iterable[bytes]]
+
+
+def throttled(
+    blocks: Source,
+    bucket: TokenBucket,
+    block_size: int = THROTTLE_BLOCK_SIZE,
+) -> Iterator[bytes]:
+    """Yield `blocks` in pieces of at most `block_size`, no faster than `bucket`."""
+    if isinstance(blocks, (bytes, bytearray, memoryview)):
+        blocks = [blocks]
+    for block in blocks:
+        view = memoryview(block)
+        for offset in range(0, len(view), block_size):
+            piece = view[offset : offset + block_size]
+            bucket.acquire(len(piece))
+            yield piece
+
+
+class ThrottledBody:
+    """
+    A request body sent no faster than a `TokenBucket` allows. Iterating
+    again starts over, so the request can be retried if the source can.
+    """
+
+    def __init__(self, source: Source, bucket: TokenBucket):
+        self.source = source
+        self.bucket: TokenBucket = bucket
+
+    def __iter__(self) -> Iterator[bytes]:
+        return throttled(self.source, self.bucket)
+
+
+class SizedThrottledBody(ThrottledBody):
+    """A `ThrottledBody` of known length, sent with a Content-Length."""
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+
+def throttle(body: Source, bucket: Optional[TokenBucket]) -> Source:
+    """`body` capped by `bucket`, or `body` itself without one."""
+    if bucket is None:
+        return body
+    if hasattr(body, "__len__"):
+        return SizedThrottledBody(body, bucket)
+    return ThrottledBody(body, bucket)
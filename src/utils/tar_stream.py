@@ -0,0 +1,75 @@
+import os
+import tarfile
+from typing import Callable, Iterator, List, Optional
+
+TAR_BLOCK_SIZE = 1024**2
+
+
+class TarStream:
+    """
+    A tar archive of files, generated block by block as it is sent.
+
+    Nothing is written to disk and memory use stays at one block. Headers
+    are built up front, so the archive's length is known and it is sent with
+    a Content-Length; iterating again starts over, so a failed request can
+    be retried.
+    """
+
+    def __init__(
+        self,
+        file_paths: List[str],
+        block_size: int = TAR_BLOCK_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+    ):
+        self.block_size: int = block_size
+        self.progress: Optional[Callable[[int], None]] = progress
+        self.members = []
+        for file_path in file_paths:
+            stat = os.stat(file_path)
+            info = tarfile.TarInfo(os.path.basename(file_path))
+            info.size = stat.st_size
+            info.mtime = int(stat.st_mtime)
+            info.mode = 0o644
+            header = info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+            self.members.append((file_path, header, info.size))
+        self._sent: int = 0
+
+    @property
+    def file_size(self) -> int:
+        """Total bytes of the files in the archive."""
+        return sum(size for _, _, size in self.members)
+
+    def __len__(self) -> int:
+        return (
+            sum(len(header) + _padded(size) for _, header, size in self.members)
+            + 2 * tarfile.BLOCKSIZE
+        )
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self._sent:
+            # a retry sends the files again, so take back the earlier progress
+            self._advance(-self._sent)
+        for file_path, header, size in self.members:
+            yield header
+            remaining = size
+            with open(file_path, "rb") as file:
+                while remaining:
+                    block = file.read(min(self.block_size, remaining))
+                    if not block:
+                        raise IOError(f"{file_path} shrank while it was being sent")
+                    remaining -= len(block)
+                    yield block
+                    self._advance(len(block))
+            if padding := _padded(size) - size:
+                yield bytes(padding)
+        # two zero blocks mark the end of the archive
+        yield bytes(2 * tarfile.BLOCKSIZE)
+
+    def _advance(self, size: int) -> None:
+        self._sent += size
+        if self.progress:
+            self.progress(size)
+
+
+def _padded(size: int) -> int:
+    return -(-size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
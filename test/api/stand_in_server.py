@@ -0,0 +1,417 @@
+"""
+In-process stand-in for the model file endpoints of the API.
+
+Used by tests and benchmarks to exercise the transfer paths over real HTTP
+without a backend. Files are kept in memory.
+"""
+
+import hashlib
+import io
+import json
+import posixpath
+import re
+import tarfile
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote
+
+from src.api.api_client import APIClient
+from src.utils.compression import compress_blocks, decompress_blocks
+from src.utils.credential_provider import CredentialProvider
+
+
+class StandInState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # model_id -> {"model_name": str, "files": {file_name: bytes}}
+        self.models = {}
+        # upload_id -> session dict with a "parts" {part: bytes} mapping
+        self.uploads = {}
+        # part digest -> bytes, for sessions opened with part digests
+        self.parts_by_digest = {}
+        # most body bytes sent per download response before hanging up
+        self.download_limit = None
+        # whether downloads honour Range headers
+        self.accept_ranges = True
+        # Range header of every download request, None when absent
+        self.ranges = []
+        # number of part PUTs to accept before failing the rest with 503
+        self.fail_parts_after = None
+        # number of request bodies received with chunked transfer encoding
+        self.chunked_bodies = 0
+        # content codings accepted on request bodies and used on downloads
+        self.encodings = set()
+        # (method, path) of each request or download body that was compressed
+        self.encoded = []
+        self.requests = []
+
+    def model(self, model_name=None, model_id=None):
+        if model_id is None:
+            for existing_id, model in self.models.items():
+                if model["model_name"] == model_name:
+                    return existing_id, model
+            model_id = f"model-{uuid.uuid4().hex[:8]}"
+        model = self.models.setdefault(
+            model_id,
+            {"model_name": model_name or model_id, "files": {}, "modified": {}},
+        )
+        return model_id, model
+
+    def find_content(self, algorithm, digest):
+        for model in self.models.values():
+            for content in model["files"].values():
+                if hashlib.new(algorithm, content).hexdigest() == digest:
+                    return content
+        return None
+
+    def store(self, model_name, model_id, file_name, content):
+        model_id, model = self.model(model_name, model_id)
+        now = datetime.now(timezone.utc)
+        model["files"][file_name] = content
+        model["modified"][file_name] = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return {
+            "model_name": model["model_name"],
+            "model_id": model_id,
+            "upload_date": now.strftime("%Y-%m-%dT%H:%M:%S.%f%z"),
+        }
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    routes = [
+        ("POST", r"/models", "upload_file"),
+        ("PUT", r"/models", "upload_file"),
+        ("POST", r"/models/archive", "upload_archive"),
+        ("POST", r"/models/uploads", "create_upload"),
+        ("POST", r"/models/uploads/check", "check_upload"),
+        ("GET", r"/models/uploads/(?P<upload_id>[^/]+)", "upload_status"),
+        (
+            "PUT",
+            r"/models/uploads/(?P<upload_id>[^/]+)/parts/(?P<part>\d+)",
+            "put_part",
+        ),
+        (
+            "POST",
+            r"/models/uploads/(?P<upload_id>[^/]+)/complete",
+            "complete_upload",
+        ),
+        ("GET", r"/models/(?P<model_id>[^/]+)", "get_model"),
+        (
+            "GET",
+            r"/models/(?P<model_id>[^/]+)/(?P<file_name>[^/]+)/download",
+            "download_file",
+        ),
+        ("DELETE", r"/models/(?P<model_id>[^/]+)/(?P<file_name>[^/]+)", "delete_file"),
+    ]
+
+    @property
+    def state(self) -> StandInState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        path, _, query = self.path.partition("?")
+        self.query = {k: v[0] for k, v in parse_qs(query).items()}
+        with self.state.lock:
+            self.state.requests.append((method, path))
+        encoding = self.headers.get("Content-Encoding")
+        if encoding and encoding not in self.state.encodings:
+            self.read_raw_body()
+            return self.send_json(
+                415,
+                {"detail": f"Unsupported Content-Encoding {encoding}"},
+                {"Accept-Encoding": ", ".join(sorted(self.state.encodings))},
+            )
+        for route_method, pattern, handler in self.routes:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                return getattr(self, handler)(**match.groupdict())
+        self.read_body()
+        self.send_json(404, {"detail": "Not found"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def read_raw_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            return self.read_chunked_body()
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def read_body(self):
+        body = self.read_raw_body()
+        encoding = self.headers.get("Content-Encoding")
+        if encoding:
+            with self.state.lock:
+                self.state.encoded.append((self.command, self.path))
+            body = b"".join(decompress_blocks([body], encoding))
+        return body
+
+    def read_chunked_body(self):
+        with self.state.lock:
+            self.state.chunked_bodies += 1
+        chunks = []
+        while size := int(self.rfile.readline().split(b";")[0], 16):
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+        while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+            pass  # trailers
+        return b"".join(chunks)
+
+    def read_json(self):
+        body = self.read_body()
+        return json.loads(body) if body else {}
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_multipart_file(self):
+        """The name and bytes of the `file` field of a multipart/form-data body."""
+        head = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode()
+        message = BytesParser(policy=HTTP).parsebytes(head + self.read_body())
+        for part in message.iter_parts():
+            if part.get_param("name", header="content-disposition") == "file":
+                return part.get_filename(), part.get_payload(decode=True)
+        return None, None
+
+    def upload_file(self):
+        file_name, content = self.read_multipart_file()
+        if file_name is None:
+            return self.send_json(422, {"detail": "Missing file"})
+        with self.state.lock:
+            result = self.state.store(
+                self.query.get("model_name"),
+                self.query.get("model_id"),
+                file_name,
+                content,
+            )
+        self.send_json(200, result)
+
+    def upload_archive(self):
+        """Unpack a tar stream of files into a model."""
+        if self.headers.get("Content-Type") != "application/x-tar":
+            self.read_body()
+            return self.send_json(415, {"detail": "Expected application/x-tar"})
+        body = self.read_body()
+        try:
+            with tarfile.open(fileobj=io.BytesIO(body), mode="r:") as archive:
+                members = [
+                    (member.name, archive.extractfile(member).read())
+                    for member in archive
+                    if member.isfile()
+                ]
+        except tarfile.TarError as err:
+            return self.send_json(400, {"detail": f"Invalid archive: {err}"})
+        if any(name != posixpath.basename(name) for name, _ in members):
+            return self.send_json(400, {"detail": "Archive members must be files"})
+        with self.state.lock:
+            result = {}
+            for name, content in members:
+                result = self.state.store(
+                    self.query.get("model_name"),
+                    result.get("model_id", self.query.get("model_id")),
+                    name,
+                    content,
+                )
+        self.send_json(200, {**result, "files": [name for name, _ in members]})
+
+    def create_upload(self):
+        request = self.read_json()
+        upload_id = uuid.uuid4().hex
+        request.setdefault("algorithm", "sha256")
+        with self.state.lock:
+            known = {
+                part: self.state.parts_by_digest[digest]
+                for part, digest in enumerate(request.get("part_digests", []))
+                if digest in self.state.parts_by_digest
+            }
+            self.state.uploads[upload_id] = {**request, "parts": known}
+        self.send_json(
+            200,
+            {
+                "upload_id": upload_id,
+                "part_size": request["part_size"],
+                "parts": sorted(known),
+            },
+        )
+
+    def check_upload(self):
+        request = self.read_json()
+        with self.state.lock:
+            content = self.state.find_content(request["algorithm"], request["digest"])
+            if content is None or len(content) != request["file_size"]:
+                return self.send_json(200, {"exists": False})
+            result = self.state.store(
+                request["model_name"],
+                request["model_id"],
+                request["file_name"],
+                content,
+            )
+        self.send_json(200, {"exists": True, **result})
+
+    def upload_status(self, upload_id):
+        session = self.state.uploads.get(upload_id)
+        if session is None:
+            return self.send_json(404, {"detail": "Upload not found"})
+        self.send_json(200, {"upload_id": upload_id, "parts": sorted(session["parts"])})
+
+    def put_part(self, upload_id, part):
+        chunk = self.read_body()
+        session = self.state.uploads.get(upload_id)
+        if session is None:
+            return self.send_json(404, {"detail": "Upload not found"})
+        with self.state.lock:
+            if self.state.fail_parts_after is not None:
+                if self.state.fail_parts_after <= 0:
+                    return self.send_json(503, {"detail": "Unavailable"})
+                self.state.fail_parts_after -= 1
+            session["parts"][int(part)] = chunk
+            digest = hashlib.new(session["algorithm"], chunk).hexdigest()
+            self.state.parts_by_digest[digest] = chunk
+        self.send_json(200, {"part": int(part), "size": len(chunk)})
+
+    def complete_upload(self, upload_id):
+        self.read_body()
+        with self.state.lock:
+            session = self.state.uploads.pop(upload_id, None)
+        if session is None:
+            return self.send_json(404, {"detail": "Upload not found"})
+        content = b"".join(session["parts"][p] for p in sorted(session["parts"]))
+        if len(content) != session["file_size"]:
+            return self.send_json(400, {"detail": "Upload incomplete"})
+        result = self.state.store(
+            session["model_name"], session["model_id"], session["file_name"], content
+        )
+        self.send_json(200, result)
+
+    def delete_file(self, model_id, file_name):
+        with self.state.lock:
+            model = self.state.models.get(model_id)
+            if model is None or model["files"].pop(file_name, None) is None:
+                return self.send_json(404, {"detail": "File not found"})
+            del model["modified"][file_name]
+        self.send_json(200, None)
+
+    def download_file(self, model_id, file_name):
+        model = self.state.models.get(model_id)
+        content = model and model["files"].get(unquote(file_name))
+        if content is None:
+            return self.send_json(404, {"detail": "File not found"})
+        header = self.headers.get("Range")
+        with self.state.lock:
+            self.state.ranges.append(header)
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", header or "")
+        status, start, end = 200, 0, len(content)
+        if match and content and any(match.groups()) and self.state.accept_ranges:
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2) or len(content) - 1) + 1, len(content))
+            else:  # suffix range: the last N bytes
+                start = max(0, len(content) - int(match.group(2)))
+            if start >= len(content):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(content)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            status = 206
+        body = content[start:end]
+        accepted = self.headers.get("Accept-Encoding", "").split(",")
+        encoding = next(
+            (e for e in sorted(self.state.encodings) if e in map(str.strip, accepted)),
+            None,
+        )
+        if encoding:
+            body = b"".join(compress_blocks([body], encoding))
+            with self.state.lock:
+                self.state.encoded.append(("GET", self.path))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", f'"{hashlib.sha256(content).hexdigest()[:16]}"')
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end - 1}/{len(content)}")
+        self.end_headers()
+        limit = self.state.download_limit
+        if limit is not None and limit < len(body):
+            self.wfile.write(body[:limit])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def get_model(self, model_id):
+        model = self.state.models.get(model_id)
+        if model is None:
+            return self.send_json(404, {"detail": "Model not found"})
+        files = [
+            {
+                "file_name": name,
+                "file_size": len(content),
+                "last_modified": model["modified"][name],
+                "algorithm": "sha256",
+                "digest": hashlib.sha256(content).hexdigest(),
+            }
+            for name, content in model["files"].items()
+        ]
+        self.send_json(
+            200,
+            {"model_name": model["model_name"], "model_id": model_id, "files": files},
+        )
+
+
+@contextmanager
+def run_stand_in_server():
+    """Serve the stand-in on a free local port; yields the server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    server.state = StandInState()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class NoPasswords:
+    """Password handler with an empty keyring."""
+
+    def get_password(self, key):
+        return None
+
+
+def stand_in_client(server, **kwargs) -> APIClient:
+    """An unauthenticated client for the stand-in server."""
+    return APIClient(
+        base_url=server.url, credentials=CredentialProvider(NoPasswords()), **kwargs
+    )
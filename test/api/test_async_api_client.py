@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.api.async_api_client import AsyncAPIClient, gather_limited
+
+
+@pytest.fixture
+def mock_client():
+    return Mock()
+
+
+@pytest.fixture
+def async_client(mock_client):
+    client = AsyncAPIClient(mock_client, max_workers=4)
+    yield client
+    client.close()
+
+
+def test_get_delegates_to_sync_client(async_client, mock_client):
+    mock_client.get.return_value = {"data": "get_test"}
+    result = asyncio.run(async_client.get("machines", params={"a": 1}))
+    assert result == {"data": "get_test"}
+    mock_client.get.assert_called_once_with("machines", params={"a": 1}, headers=None)
+
+
+@pytest.mark.parametrize("method", ["post", "put", "delete"])
+def test_methods_delegate_to_sync_client(async_client, mock_client, method):
+    getattr(mock_client, method).return_value = {"data": method}
+    result = asyncio.run(getattr(async_client, method)("endpoint", data={"k": "v"}))
+    assert result == {"data": method}
+    getattr(mock_client, method).assert_called_once_with("endpoint", data={"k": "v"})
+
+
+def test_requests_run_off_the_event_loop_thread(async_client, mock_client):
+    mock_client.get.side_effect = lambda *a, **k: threading.current_thread().name
+    assert asyncio.run(async_client.get("x")).startswith("quack-http")
+
+
+def test_gather_limited_preserves_order():
+    async def echo(value):
+        await asyncio.sleep(0.01 * (5 - value))
+        return value
+
+    results = asyncio.run(gather_limited((echo(i) for i in range(5)), 3))
+    assert results == list(range(5))
+
+
+def test_gather_limited_bounds_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def work():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    asyncio.run(gather_limited([work() for _ in range(10)], 3))
+    assert peak == 3
+
+
+def test_fan_out_overlaps_blocking_calls(async_client, mock_client):
+    mock_client.get.side_effect = lambda *a, **k: time.sleep(0.1)
+
+    async def main():
+        return await gather_limited([async_client.get(str(i)) for i in range(4)], 4)
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    assert time.perf_counter() - start < 0.3
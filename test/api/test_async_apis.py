@@ -0,0 +1,47 @@
+import asyncio
+import inspect
+from unittest.mock import Mock
+
+import pytest
+
+from src.api.async_api_client import AsyncAPIClient
+from src.api.async_apis import AsyncAuthAPI, AsyncMachineAPI, AsyncModelFileAPI
+from src.api.machine_api import MachineAPI
+from src.api.model_file_api import ModelFileAPI
+
+
+@pytest.fixture
+def mock_client():
+    return Mock()
+
+
+@pytest.fixture
+def async_client(mock_client):
+    client = AsyncAPIClient(mock_client, max_workers=4)
+    yield client
+    client.close()
+
+
+def test_async_apis_mirror_sync_methods(async_client):
+    for async_cls, sync_cls in (
+        (AsyncMachineAPI, MachineAPI),
+        (AsyncModelFileAPI, ModelFileAPI),
+    ):
+        api = async_cls(async_client)
+        for name, _ in inspect.getmembers(sync_cls, inspect.isfunction):
+            if not name.startswith("_"):
+                assert inspect.iscoroutinefunction(getattr(api, name)), name
+
+
+def test_async_machine_api_call(async_client, mock_client):
+    mock_client.post.return_value = {"status": "started"}
+    api = AsyncMachineAPI(async_client)
+    result = asyncio.run(api.start_machine("123"))
+    assert result == {"success": True, "data": {"status": "started"}}
+    mock_client.post.assert_called_once_with("machine/start/123", idempotent=True)
+
+
+def test_async_auth_api_call(async_client, mock_client):
+    mock_client.get.return_value = []
+    result = asyncio.run(AsyncAuthAPI(async_client).list_api_keys())
+    assert result == {"success": True, "data": []}
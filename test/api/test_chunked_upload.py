@@ -0,0 +1,156 @@
+import os
+
+import pytest
+
+from src.api.chunked_upload import ChunkedUploader, UploadSessionStore
+from src.api.retry import RetryPolicy
+from src.utils.rate_limiter import TokenBucket
+from test.api.stand_in_server import run_stand_in_server, stand_in_client
+
+
+@pytest.fixture
+def server():
+    with run_stand_in_server() as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    return stand_in_client(server, retry_policy=RetryPolicy(max_attempts=1))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadSessionStore(str(tmp_path / "uploads"))
+
+
+@pytest.fixture
+def weights(tmp_path):
+    path = tmp_path / "weights.bin"
+    path.write_bytes(bytes(range(256)) * 40)  # 10240 bytes, 10 parts of 1 KiB
+    return path
+
+
+def part_puts(server):
+    return [path for method, path in server.state.requests if method == "PUT"]
+
+
+def test_parallel_parts(server, client, store, weights):
+    uploader = ChunkedUploader(client, part_size=1000, parallelism=4, store=store)
+    result = uploader.upload(str(weights), model_id="m1", file_name="w.bin")
+    assert result["model_id"] == "m1"
+    assert server.state.models["m1"]["files"]["w.bin"] == weights.read_bytes()
+    assert len(part_puts(server)) == 11
+
+
+def test_upload_in_parts(server, client, store, weights):
+    progress = []
+    uploader = ChunkedUploader(client, part_size=1024, parallelism=1, store=store)
+    result = uploader.upload(str(weights), model_name="llama", progress=progress.append)
+
+    model = server.state.models[result["model_id"]]
+    assert model["files"]["weights.bin"] == weights.read_bytes()
+    assert len(part_puts(server)) == 10
+    assert sum(progress) == weights.stat().st_size
+    assert os.listdir(store.directory) == []
+
+
+def test_resume_skips_acknowledged_parts(server, client, store, weights):
+    uploader = ChunkedUploader(client, part_size=1024, store=store)
+    server.state.fail_parts_after = 9
+    with pytest.raises(Exception):
+        uploader.upload(str(weights), model_name="llama")
+    (session_file,) = os.listdir(store.directory)
+    assert len(store.load(session_file[: -len(".json")])["parts"]) == 9
+
+    server.state.fail_parts_after = None
+    server.state.requests.clear()
+    progress = []
+    result = uploader.upload(str(weights), model_name="llama", progress=progress.append)
+
+    assert len(part_puts(server)) == 1
+    assert sum(progress) == weights.stat().st_size
+    model = server.state.models[result["model_id"]]
+    assert model["files"]["weights.bin"] == weights.read_bytes()
+
+
+def test_expired_session_restarts(server, client, store, weights):
+    uploader = ChunkedUploader(client, part_size=1024, store=store)
+    server.state.fail_parts_after = 4
+    with pytest.raises(Exception):
+        uploader.upload(str(weights), model_name="llama")
+    server.state.uploads.clear()
+
+    server.state.fail_parts_after = None
+    server.state.requests.clear()
+    result = uploader.upload(str(weights), model_name="llama")
+
+    assert len(part_puts(server)) == 10
+    model = server.state.models[result["model_id"]]
+    assert model["files"]["weights.bin"] == weights.read_bytes()
+
+
+def test_empty_file(server, client, store, tmp_path):
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    uploader = ChunkedUploader(client, part_size=1024, store=store)
+    result = uploader.upload(str(empty), model_name="llama")
+    assert server.state.models[result["model_id"]]["files"]["empty.bin"] == b""
+
+
+def test_session_store_round_trip(store, weights):
+    key = store.key(str(weights), model_id="m1")
+    assert store.load(key) is None
+    store.save(key, {"upload_id": "u1", "part_size": 1024, "parts": [0, 1]})
+    assert store.load(key)["parts"] == [0, 1]
+    store.delete(key)
+    assert store.load(key) is None
+    store.delete(key)
+
+
+def test_session_key_tracks_file_and_destination(weights):
+    key = UploadSessionStore.key(str(weights), model_id="m1")
+    assert key == UploadSessionStore.key(str(weights), model_id="m1")
+    assert key != UploadSessionStore.key(str(weights), model_id="m2")
+    weights.write_bytes(b"changed")
+    assert key != UploadSessionStore.key(str(weights), model_id="m1")
+
+
+def test_compressed_parts(server, client, store, weights):
+    server.state.encodings = {"gzip"}
+    uploader = ChunkedUploader(
+        client, part_size=4096, parallelism=2, store=store, encoding="gzip"
+    )
+    uploader.upload(str(weights), model_id="m1", file_name="w.bin")
+    assert server.state.models["m1"]["files"]["w.bin"] == weights.read_bytes()
+    assert len(server.state.encoded) == 3
+
+
+def test_rejected_encoding_falls_back(server, client, store, weights):
+    uploader = ChunkedUploader(
+        client, part_size=4096, parallelism=1, store=store, encoding="gzip"
+    )
+    uploader.upload(str(weights), model_id="m1", file_name="w.bin")
+    assert server.state.models["m1"]["files"]["w.bin"] == weights.read_bytes()
+    assert uploader.encoding is None
+    assert len(part_puts(server)) == 4  # one refused, then three as is
+
+
+class CountingBucket(TokenBucket):
+    def __init__(self):
+        super().__init__(1024**3)
+        self.taken = []
+
+    def acquire(self, amount):
+        self.taken.append(amount)
+        return super().acquire(amount)
+
+
+def test_rate_limit_covers_parallel_parts(server, client, store, weights):
+    bucket = CountingBucket()
+    uploader = ChunkedUploader(
+        client, part_size=1024, parallelism=4, store=store, rate_limiter=bucket
+    )
+    uploader.upload(str(weights), model_id="m1", file_name="w.bin")
+    assert server.state.models["m1"]["files"]["w.bin"] == weights.read_bytes()
+    assert sum(bucket.taken) == weights.stat().st_size
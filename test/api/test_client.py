@@ -1,6 +1,9 @@
 import pytest
-from unittest.mock import patch, ANY
-from src.api.api_client import APIClient
+import requests
+from unittest.mock import patch, ANY, Mock, call
+from src.api.api_client import APIClient, get_client, get_credential_provider
+from src.api.retry import RetryPolicy
+from src.utils.deadline import DeadlineExceeded
 
 
 @pytest.fixture
@@ -30,6 +33,8 @@ def test_make_request_with_api_key(api_client):
         data=None,
         params=None,
         files=None,
+        timeout=api_client.timeout,
+        stream=False,
         headers={"X-API-Key": "test_api_key"},
     )
     assert result == {"data": "test"}
@@ -49,6 +54,8 @@ def test_make_request_with_access_token(api_client):
         data=None,
         params=None,
         files=None,
+        timeout=api_client.timeout,
+        stream=False,
         headers={"Authorization": "Bearer test_access_token"},
     )
     assert result == {"data": "test"}
@@ -105,6 +112,8 @@ def test_get_method(api_client):
         params={"param": "value"},
         headers={"Custom-Header": "Value", "X-API-Key": ANY},
         files=None,
+        timeout=api_client.timeout,
+        stream=False,
     )
     assert result == {"data": "get_test"}
 
@@ -120,6 +129,8 @@ def test_post_method(api_client):
         params=None,
         headers={"X-API-Key": ANY},
         files=None,
+        timeout=api_client.timeout,
+        stream=False,
     )
     assert result == {"data": "post_test"}
 
@@ -135,6 +146,8 @@ def test_put_method(api_client):
         params=None,
         headers={"X-API-Key": ANY},
         files=None,
+        timeout=api_client.timeout,
+        stream=False,
     )
     assert result == {"data": "put_test"}
 
@@ -150,6 +163,8 @@ def test_delete_method(api_client):
         params=None,
         headers={"X-API-Key": ANY},
         files=None,
+        timeout=api_client.timeout,
+        stream=False,
     )
     assert result == {"data": "delete_test"}
 
@@ -174,3 +189,173 @@ def test_clear_api_key_returns_false_when_no_key(api_client, mock_password_handl
 
     assert result is False
     mock_password_handler.delete_password.assert_not_called()
+
+
+def test_clear_api_key_reads_keyring_once(api_client, mock_password_handler):
+    mock_password_handler.get_password.return_value = None
+
+    assert api_client.get_api_key() is None
+    assert api_client.clear_api_key() is False
+
+    mock_password_handler.get_password.assert_called_once_with("api_key")
+
+
+def test_init_does_not_read_credentials(mock_password_handler):
+    APIClient()
+    mock_password_handler.get_password.assert_not_called()
+
+
+def test_credentials_read_once_across_requests(api_client, mock_password_handler):
+    mock_password_handler.get_password.return_value = "stored_key"
+    api_client.session.request.return_value.json.return_value = {}
+
+    api_client.get("first")
+    api_client.get("second")
+
+    mock_password_handler.get_password.assert_called_once_with("api_key")
+
+
+def test_get_client_is_shared(mock_password_handler):
+    get_client.cache_clear()
+    get_credential_provider.cache_clear()
+    try:
+        client = get_client()
+        assert get_client() is client
+        assert client.credentials is get_credential_provider()
+        mock_password_handler.get_password.assert_not_called()
+    finally:
+        get_client.cache_clear()
+        get_credential_provider.cache_clear()
+
+
+def _response(status_code, headers=None, body=None):
+    response = Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = body
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+    return response
+
+
+@patch("src.api.api_client.time.sleep")
+def test_retries_transient_status(mock_sleep, api_client):
+    api_client.session.request.side_effect = [
+        _response(503),
+        _response(429, headers={"Retry-After": "2"}),
+        _response(200, body={"data": "ok"}),
+    ]
+
+    result = api_client.get("test_endpoint")
+
+    assert result == {"data": "ok"}
+    assert api_client.session.request.call_count == 3
+    assert api_client.retry_stats.retries == 2
+    assert mock_sleep.call_args_list[-1] == call(2.0)
+
+
+@patch("src.api.api_client.time.sleep")
+def test_long_retry_after_is_not_retried(mock_sleep, api_client):
+    api_client.session.request.side_effect = [
+        _response(429, headers={"Retry-After": "3600"}),
+        _response(200, body={"data": "ok"}),
+    ]
+
+    with pytest.raises(requests.HTTPError):
+        api_client.get("test_endpoint")
+    assert api_client.session.request.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+@patch("src.api.api_client.time.sleep")
+def test_retries_connection_errors(mock_sleep, api_client):
+    api_client.session.request.side_effect = [
+        requests.ConnectionError("reset"),
+        _response(200, body={"data": "ok"}),
+    ]
+
+    assert api_client.get("test_endpoint") == {"data": "ok"}
+    assert api_client.retry_stats.retries == 1
+
+
+@patch("src.api.api_client.time.sleep")
+def test_gives_up_after_max_attempts(mock_sleep, api_client):
+    api_client.retry_policy = RetryPolicy(max_attempts=2)
+    api_client.session.request.side_effect = [_response(502), _response(502)]
+
+    with pytest.raises(requests.HTTPError):
+        api_client.get("test_endpoint")
+    assert api_client.session.request.call_count == 2
+    assert api_client.retry_stats.retries == 1
+
+
+@patch("src.api.api_client.time.sleep")
+def test_post_not_retried_by_default(mock_sleep, api_client):
+    api_client.session.request.side_effect = [_response(503)]
+
+    with pytest.raises(requests.HTTPError):
+        api_client.post("test_endpoint")
+    assert api_client.session.request.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+@patch("src.api.api_client.time.sleep")
+def test_idempotent_post_reuses_key(mock_sleep, api_client):
+    api_client.session.request.side_effect = [
+        _response(503),
+        _response(200, body={"data": "ok"}),
+    ]
+
+    assert api_client.post("machine/start/1", idempotent=True) == {"data": "ok"}
+
+    keys = {
+        c.kwargs["headers"]["Idempotency-Key"]
+        for c in api_client.session.request.call_args_list
+    }
+    assert len(keys) == 1 and None not in keys
+
+
+@patch("src.api.api_client.time.sleep")
+def test_retry_rewinds_files(mock_sleep, api_client):
+    upload = Mock()
+    api_client.session.request.side_effect = [
+        _response(504),
+        _response(200, body={"data": "ok"}),
+    ]
+
+    api_client.put("models", files={"file": ("f.bin", upload, "bin")})
+
+    upload.seek.assert_called_once_with(0)
+
+
+@pytest.fixture
+def deadline():
+    with patch("src.api.api_client.get_deadline") as mock_get_deadline:
+        yield mock_get_deadline.return_value
+
+
+def test_timeout_capped_by_deadline(api_client, deadline):
+    deadline.check.return_value = 3.0
+    api_client.timeout = (10.0, 120.0)
+    api_client.get("test_endpoint")
+    assert api_client.session.request.call_args.kwargs["timeout"] == (3.0, 3.0)
+
+
+def test_deadline_exceeded_before_request(api_client, deadline):
+    deadline.check.side_effect = DeadlineExceeded("spent")
+    with pytest.raises(DeadlineExceeded):
+        api_client.get("test_endpoint")
+    api_client.session.request.assert_not_called()
+
+
+@patch("src.api.api_client.time.sleep")
+def test_no_retry_past_deadline(mock_sleep, api_client, deadline):
+    deadline.check.return_value = 1.0
+    deadline.remaining.return_value = 1.0
+    api_client.session.request.side_effect = [
+        _response(503, headers={"Retry-After": "5"}),
+        _response(200, body={"data": "ok"}),
+    ]
+
+    with pytest.raises(requests.HTTPError):
+        api_client.get("test_endpoint")
+    assert api_client.session.request.call_count == 1
+    mock_sleep.assert_not_called()
@@ -44,6 +44,7 @@ class TestMachineAPI(unittest.TestCase):
         mock_post.assert_called_with(
             "machine/gpu/pull_model",
             data={"machine_id": "123", "model_name": "model_a"},
+            idempotent=True,
         )
 
     @patch.object(APIClient, "delete")
@@ -81,6 +82,7 @@ class TestMachineAPI(unittest.TestCase):
         mock_post.assert_called_with(
             "machine/cpu/pull_model",
             data={"machine_id": "123", "model_name": "model_b"},
+            idempotent=True,
         )
 
     @patch.object(APIClient, "delete")
@@ -119,14 +121,14 @@ class TestMachineAPI(unittest.TestCase):
         mock_post.return_value = {"status": "started"}
         response = self.api.start_machine("123")
         self.assertEqual(response, {"success": True, "data": {"status": "started"}})
-        mock_post.assert_called_with("machine/start/123")
+        mock_post.assert_called_with("machine/start/123", idempotent=True)
 
     @patch.object(APIClient, "post")
     def test_stop_machine(self, mock_post):
         mock_post.return_value = {"status": "stopped"}
         response = self.api.stop_machine("123")
         self.assertEqual(response, {"success": True, "data": {"status": "stopped"}})
-        mock_post.assert_called_with("machine/stop/123")
+        mock_post.assert_called_with("machine/stop/123", idempotent=True)
 
     @patch.object(APIClient, "delete")
     def test_terminate_machine(self, mock_delete):
@@ -1,5 +1,7 @@
+import os
+import tempfile
 import unittest
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 from src.api.api_client import APIClient
 from src.api.model_file_api import ModelFileAPI
 
@@ -8,14 +10,24 @@ class TestModelFileAPI(unittest.TestCase):
     def setUp(self):
         self.api = ModelFileAPI(APIClient())
 
-    @patch("builtins.open", new_callable=mock_open, read_data="test data")
     @patch.object(APIClient, "post")
-    def test_upload_model_file(self, mock_post, mock_file):
+    def test_upload_model_file(self, mock_post):
         mock_post.return_value = {"status": "uploaded"}
-        response = self.api.upload_model_file("test_model", "123", "test.file")
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "test.file")
+            with open(file_path, "wb") as file:
+                file.write(b"test data")
+            response = self.api.upload_model_file("test_model", "123", file_path)
+            mock_post.assert_called_once()
+            args, kwargs = mock_post.call_args
+            body = b"".join(kwargs["body"])
         self.assertEqual(response, {"success": True, "data": {"status": "uploaded"}})
-        mock_post.assert_called_once()
-        mock_file.assert_called_with("test.file", "rb")
+        self.assertEqual(args, ("models",))
+        self.assertEqual(
+            kwargs["params"], {"model_name": "test_model", "model_id": "123"}
+        )
+        self.assertIn(b'name="file"; filename="test.file"', body)
+        self.assertIn(b"\r\n\r\ntest data\r\n", body)
 
     @patch.object(APIClient, "get")
     def test_get_model(self, mock_get):
@@ -40,14 +52,24 @@ class TestModelFileAPI(unittest.TestCase):
         )
         mock_get.assert_called_with("models/123/test.file")
 
-    @patch("builtins.open", new_callable=mock_open, read_data="test data")
     @patch.object(APIClient, "put")
-    def test_update_model_file(self, mock_put, mock_file):
+    def test_update_model_file(self, mock_put):
         mock_put.return_value = {"status": "updated"}
-        response = self.api.update_model_file("test_model", "123", "test.file")
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "test.file")
+            with open(file_path, "wb") as file:
+                file.write(b"test data")
+            response = self.api.update_model_file("test_model", "123", file_path)
+            mock_put.assert_called_once()
+            args, kwargs = mock_put.call_args
+            body = b"".join(kwargs["body"])
         self.assertEqual(response, {"success": True, "data": {"status": "updated"}})
-        mock_put.assert_called_once()
-        mock_file.assert_called_with("test.file", "rb")
+        self.assertEqual(args, ("models",))
+        self.assertEqual(
+            kwargs["params"], {"model_name": "test_model", "model_id": "123"}
+        )
+        self.assertIn(b'name="file"; filename="test.file"', body)
+        self.assertIn(b"\r\n\r\ntest data\r\n", body)
 
     @patch.object(APIClient, "delete")
     def test_delete_model_file(self, mock_delete):
@@ -0,0 +1,228 @@
+import os
+
+import pytest
+
+from src.api.ranged_download import RangedDownloader, read_range
+from src.api.retry import RetryPolicy
+from src.utils.file_cache import FileCache
+from src.utils.rate_limiter import TokenBucket
+from test.api.stand_in_server import run_stand_in_server, stand_in_client
+
+CONTENT = os.urandom(10_000)
+
+
+@pytest.fixture
+def server():
+    with run_stand_in_server() as server:
+        server.state.store("llama", "m1", "weights.bin", CONTENT)
+        yield server
+
+
+def downloader(server, attempts=1, **kwargs):
+    client = stand_in_client(
+        server, retry_policy=RetryPolicy(max_attempts=attempts, backoff_max=0)
+    )
+    return RangedDownloader(client, **kwargs)
+
+
+def test_download_single_stream(server, tmp_path):
+    dest = tmp_path / "weights.bin"
+    sizes, progress = [], []
+    result = downloader(server).download(
+        "m1", "weights.bin", str(dest), progress.append, sizes.append
+    )
+    assert dest.read_bytes() == CONTENT
+    assert result == {
+        "file_name": "weights.bin",
+        "path": str(dest),
+        "size": 10_000,
+        "cached": False,
+    }
+    assert sizes == [10_000]
+    assert sum(progress) == 10_000
+    assert server.state.ranges == ["bytes=0-0", "bytes=0-9999"]
+    assert sorted(os.listdir(tmp_path)) == ["weights.bin"]
+
+
+def test_download_parallel_segments(server, tmp_path):
+    dest = tmp_path / "weights.bin"
+    downloader(server, segment_size=3000, parallelism=4).download(
+        "m1", "weights.bin", str(dest)
+    )
+    assert dest.read_bytes() == CONTENT
+    assert sorted(server.state.ranges[1:]) == [
+        "bytes=0-2999",
+        "bytes=3000-5999",
+        "bytes=6000-8999",
+        "bytes=9000-9999",
+    ]
+
+
+def test_interrupted_download_resumes(server, tmp_path):
+    dest = tmp_path / "weights.bin"
+    server.state.download_limit = 1000
+    with pytest.raises(Exception):
+        downloader(server, segment_size=3000, block_size=100).download(
+            "m1", "weights.bin", str(dest)
+        )
+    assert not dest.exists()
+    assert os.path.exists(f"{dest}.part.json")
+
+    server.state.download_limit = None
+    server.state.ranges.clear()
+    progress = []
+    downloader(server, segment_size=3000, block_size=100).download(
+        "m1", "weights.bin", str(dest), progress.append
+    )
+    assert dest.read_bytes() == CONTENT
+    assert sum(progress) == 10_000
+    assert all(not r.startswith("bytes=0-") for r in server.state.ranges[1:])
+
+
+def test_retries_continue_from_offset(server, tmp_path):
+    dest = tmp_path / "weights.bin"
+    server.state.download_limit = 4000
+    downloader(server, attempts=4, block_size=100).download(
+        "m1", "weights.bin", str(dest)
+    )
+    assert dest.read_bytes() == CONTENT
+    assert server.state.ranges[1:] == [
+        "bytes=0-9999",
+        "bytes=4000-9999",
+        "bytes=8000-9999",
+    ]
+
+
+def test_changed_file_restarts(server, tmp_path):
+    dest = tmp_path / "weights.bin"
+    server.state.download_limit = 1000
+    with pytest.raises(Exception):
+        downloader(server, block_size=100).download("m1", "weights.bin", str(dest))
+    server.state.download_limit = None
+    server.state.store("llama", "m1", "weights.bin", CONTENT[::-1])
+    downloader(server, block_size=100).download("m1", "weights.bin", str(dest))
+    assert dest.read_bytes() == CONTENT[::-1]
+
+
+def test_download_empty_file(server, tmp_path):
+    server.state.store("llama", "m1", "empty.bin", b"")
+    dest = tmp_path / "empty.bin"
+    downloader(server).download("m1", "empty.bin", str(dest))
+    assert dest.read_bytes() == b""
+
+
+@pytest.mark.parametrize("accept_ranges", [True, False])
+def test_read_range(server, accept_ranges):
+    server.state.accept_ranges = accept_ranges
+    client = stand_in_client(server)
+    endpoint = "models/m1/weights.bin/download"
+    assert read_range(client, endpoint, 100, 50) == {
+        "content": CONTENT[100:150],
+        "offset": 100,
+        "size": 10_000,
+    }
+    assert read_range(client, endpoint, 9_990) == {
+        "content": CONTENT[9_990:],
+        "offset": 9_990,
+        "size": 10_000,
+    }
+    assert read_range(client, endpoint, length=30, suffix=True) == {
+        "content": CONTENT[-30:],
+        "offset": 9_970,
+        "size": 10_000,
+    }
+
+
+def test_read_range_past_end(server):
+    client = stand_in_client(server)
+    result = read_range(client, "models/m1/weights.bin/download", 20_000, 10)
+    assert result == {"content": b"", "offset": 20_000, "size": 10_000}
+
+
+def test_repeat_download_is_served_from_cache(server, tmp_path):
+    cache = FileCache(str(tmp_path / "cache"))
+    first = downloader(server, cache=cache).download(
+        "m1", "weights.bin", str(tmp_path / "a.bin")
+    )
+    server.state.ranges.clear()
+    second = downloader(server, cache=cache).download(
+        "m1", "weights.bin", str(tmp_path / "b.bin")
+    )
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert (tmp_path / "b.bin").read_bytes() == CONTENT
+    assert server.state.ranges == ["bytes=0-0"]
+
+
+def test_repeat_download_to_same_path(server, tmp_path):
+    cache = FileCache(str(tmp_path / "cache"))
+    dest = tmp_path / "weights.bin"
+    for _ in range(2):
+        result = downloader(server, cache=cache).download(
+            "m1", "weights.bin", str(dest)
+        )
+    assert result["cached"] is True
+    assert dest.read_bytes() == CONTENT
+
+
+def test_cached_copy_replaces_other_file(server, tmp_path):
+    cache = FileCache(str(tmp_path / "cache"))
+    dest = tmp_path / "weights.bin"
+    downloader(server, cache=cache).download("m1", "weights.bin", str(dest))
+    os.remove(dest)
+    dest.write_bytes(b"stale")
+    result = downloader(server, cache=cache).download("m1", "weights.bin", str(dest))
+    assert result["cached"] is True
+    assert dest.read_bytes() == CONTENT
+    assert sorted(os.listdir(tmp_path)) == ["cache", "weights.bin"]
+
+
+def test_changed_file_bypasses_cache(server, tmp_path):
+    cache = FileCache(str(tmp_path / "cache"))
+    downloader(server, cache=cache).download("m1", "weights.bin", str(tmp_path / "a"))
+    server.state.store("llama", "m1", "weights.bin", CONTENT[::-1])
+    result = downloader(server, cache=cache).download(
+        "m1", "weights.bin", str(tmp_path / "b")
+    )
+    assert result["cached"] is False
+    assert (tmp_path / "b").read_bytes() == CONTENT[::-1]
+    assert cache.size() == 10_000
+
+
+@pytest.mark.parametrize("segment_size", [1024, 1 << 20])
+def test_compressed_download(server, tmp_path, segment_size):
+    server.state.encodings = {"gzip"}
+    text = b"step 1: loss 0.25\n" * 2000
+    server.state.store("llama", "m1", "train.log", text)
+    dest = tmp_path / "train.log"
+    progress = []
+    downloader(server, segment_size=segment_size, encoding="gzip").download(
+        "m1", "train.log", str(dest), progress.append
+    )
+    assert dest.read_bytes() == text
+    assert sum(progress) == len(text)
+    assert len(server.state.encoded) >= 2  # the probe and at least one segment
+
+
+def test_compressed_download_resumes(server, tmp_path):
+    server.state.encodings = {"gzip"}
+    server.state.download_limit = 500
+    dest = tmp_path / "weights.bin"
+    downloader(server, attempts=30, segment_size=4096, encoding="gzip").download(
+        "m1", "weights.bin", str(dest)
+    )
+    assert dest.read_bytes() == CONTENT
+
+
+@pytest.mark.parametrize("encoding", [None, "gzip"])
+def test_rate_limited_download(server, tmp_path, encoding):
+    server.state.encodings = {"gzip"}
+    content = os.urandom(200_000)
+    server.state.store("llama", "m1", "big.bin", content)
+    waits = []
+    bucket = TokenBucket(10_000, burst=65_536, sleep=waits.append)
+    downloader(
+        server, segment_size=50_000, rate_limiter=bucket, encoding=encoding
+    ).download("m1", "big.bin", str(tmp_path / "big.bin"))
+    assert (tmp_path / "big.bin").read_bytes() == content
+    # the last of the parallel segments waits for every byte past the burst
+    assert max(waits) == pytest.approx((200_000 - 65_536) / 10_000, rel=0.05)
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.api.retry import RetryPolicy, RetryStats, parse_retry_after
+
+
+@pytest.fixture
+def policy():
+    return RetryPolicy(max_attempts=4, backoff_base=0.5, backoff_max=4)
+
+
+@pytest.mark.parametrize("method", ["GET", "PUT", "DELETE", "get"])
+def test_allows_idempotent_methods(policy, method):
+    assert policy.allows(method)
+
+
+def test_post_requires_opt_in(policy):
+    assert not policy.allows("POST")
+    assert policy.allows("POST", idempotent=True)
+
+
+@pytest.mark.parametrize("status", [429, 502, 503, 504])
+def test_retries_transient_statuses(policy, status):
+    assert policy.retries_status(status)
+
+
+@pytest.mark.parametrize("status", [400, 401, 404, 500])
+def test_does_not_retry_other_statuses(policy, status):
+    assert not policy.retries_status(status)
+
+
+def test_backoff_uses_full_jitter(policy):
+    with patch("src.api.retry.random.uniform", return_value=0.1) as mock_uniform:
+        assert policy.backoff(2) == 0.1
+    mock_uniform.assert_called_once_with(0, 2.0)
+
+
+def test_backoff_is_capped(policy):
+    with patch("src.api.retry.random.uniform") as mock_uniform:
+        policy.backoff(10)
+    mock_uniform.assert_called_once_with(0, 4)
+
+
+def test_delay_prefers_retry_after(policy):
+    assert policy.delay(0, "3") == 3.0
+
+
+def test_delay_stops_when_retry_after_is_too_long(policy):
+    assert policy.delay(0, "3600") is None
+
+
+def test_delay_falls_back_to_backoff(policy):
+    with patch.object(policy, "backoff", return_value=0.3):
+        assert policy.delay(1, None) == 0.3
+
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(when, usegmt=True)) <= 30
+
+
+@pytest.mark.parametrize("value", [None, "", "soon"])
+def test_parse_retry_after_invalid(value):
+    assert parse_retry_after(value) is None
+
+
+def test_parse_retry_after_negative():
+    assert parse_retry_after("-5") == 0.0
+
+
+def test_retry_stats():
+    stats = RetryStats()
+    stats.record(0.5)
+    stats.record(1.5)
+    assert (stats.retries, stats.delay) == (2, 2.0)
+    stats.reset()
+    assert (stats.retries, stats.delay) == (0, 0.0)
@@ -0,0 +1,32 @@
+from src.api.api_client import APIClient, get_client
+from src.api.auth_api import AuthAPI
+from src.api.machine_api import MachineAPI
+from src.api.model_file_api import ModelFileAPI
+from src.api.session import create_session
+from src.api.user_api import UserAPI
+
+
+def test_create_session_pool_size():
+    session = create_session(pool_connections=2, pool_maxsize=8)
+    for prefix in ("http://", "https://"):
+        adapter = session.get_adapter(f"{prefix}example.com")
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 8
+
+
+def test_create_session_keep_alive():
+    session = create_session()
+    assert session.headers["Connection"] == "keep-alive"
+
+
+def test_client_uses_given_session():
+    session = create_session()
+    client = APIClient(session=session)
+    assert client.session is session
+
+
+def test_api_classes_share_one_transport():
+    client = get_client()
+    apis = [AuthAPI(), UserAPI(), MachineAPI(), ModelFileAPI()]
+    assert all(api.client is client for api in apis)
+    assert len({id(api.client.session) for api in apis}) == 1
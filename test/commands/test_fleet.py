@@ -0,0 +1,224 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import click
+from click.testing import CliRunner
+
+from src.commands.fleet import (
+    FleetCommands,
+    apply,
+    load_manifest,
+    validate_manifest,
+)
+
+MANIFEST = {
+    "machines": [
+        {
+            "name": "eval-1",
+            "hardware_type": "gpu",
+            "machine_type": "g4dn.xlarge",
+            "models": ["llama3:8b", "smollm:135m"],
+        },
+        {"name": "eval-2", "hardware_type": "cpu", "machine_type": "t2.micro"},
+        {"name": "existing", "hardware_type": "cpu", "machine_type": "t2.micro"},
+    ]
+}
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+
+    def test_load_json_and_yaml(self):
+        with self.runner.isolated_filesystem():
+            with open("fleet.json", "w") as f:
+                json.dump(MANIFEST, f)
+            with open("fleet.yaml", "w") as f:
+                f.write("machines:\n  - name: a\n    hardware_type: cpu\n")
+            self.assertEqual(load_manifest("fleet.json"), MANIFEST)
+            self.assertEqual(
+                load_manifest("fleet.yaml"),
+                {"machines": [{"name": "a", "hardware_type": "cpu"}]},
+            )
+
+    def test_load_invalid_json(self):
+        with self.runner.isolated_filesystem():
+            with open("fleet.json", "w") as f:
+                f.write("{")
+            with self.assertRaises(click.ClickException):
+                load_manifest("fleet.json")
+
+    def test_validate_valid_manifest(self):
+        self.assertEqual(validate_manifest(MANIFEST), [])
+
+    def test_validate_reports_problems(self):
+        errors = validate_manifest(
+            {
+                "machines": [
+                    {"name": "a", "hardware_type": "tpu"},
+                    {
+                        "name": "b",
+                        "hardware_type": "cpu",
+                        "machine_type": "g4dn.xlarge",
+                    },
+                    {
+                        "name": "b",
+                        "hardware_type": "cpu",
+                        "machine_type": "t2.micro",
+                        "models": ["llama3:8b"],
+                    },
+                    {"hardware_type": "cpu"},
+                ]
+            }
+        )
+        self.assertEqual(
+            errors,
+            [
+                "a: invalid hardware type 'tpu'.",
+                "b: invalid machine type 'g4dn.xlarge' for cpu.",
+                "b: duplicate machine name.",
+                "b: model llama3:8b not available on cpu.",
+                "machines[3]: missing name.",
+            ],
+        )
+
+    def test_validate_rejects_models_on_fpga(self):
+        errors = validate_manifest(
+            {
+                "machines": [
+                    {
+                        "name": "f",
+                        "hardware_type": "fpga",
+                        "machine_type": "f1.2xlarge",
+                        "models": ["llama3:8b"],
+                    },
+                    {
+                        "name": "g",
+                        "hardware_type": "fpga",
+                        "machine_type": "f1.2xlarge",
+                    },
+                ]
+            }
+        )
+        self.assertEqual(errors, ["f: FPGA pull model not supported yet."])
+
+    def test_validate_requires_machines(self):
+        self.assertEqual(
+            validate_manifest({}), ["Manifest must contain a 'machines' list."]
+        )
+
+
+class TestFleetCommands(unittest.TestCase):
+    def setUp(self):
+        self.fleet = FleetCommands()
+        self.fleet.endpoint = MagicMock()
+        self.endpoint = self.fleet.endpoint
+        self.endpoint.list_user_machines.side_effect = [
+            {
+                "success": True,
+                "data": [{"machine_id": "m0", "machine_name": "existing"}],
+            },
+            {
+                "success": True,
+                "data": [{"machine_id": "m1", "machine_status": "running"}],
+            },
+        ]
+        self.endpoint.create_gpu_machine.return_value = {
+            "success": True,
+            "data": {"machine_id": "m1"},
+        }
+        self.endpoint.create_cpu_machine.return_value = {
+            "success": True,
+            "data": {"machine_id": "m2"},
+        }
+        self.endpoint.pull_gpu_model.return_value = {"success": True, "data": {}}
+
+    def test_dry_run(self):
+        with patch("click.echo") as mock_print:
+            self.assertTrue(self.fleet.apply(MANIFEST, dry_run=True))
+            mock_print.assert_any_call("  = existing: exists, unchanged")
+            mock_print.assert_called_with("\n2 to create, 1 unchanged.")
+        self.endpoint.create_gpu_machine.assert_not_called()
+
+    def test_apply_creates_and_pulls(self):
+        with patch("click.echo") as mock_print:
+            self.assertTrue(self.fleet.apply(MANIFEST, workers=4))
+            mock_print.assert_any_call("  ✔ eval-1: pulled llama3:8b")
+            mock_print.assert_called_with("\n2/2 machines ready, 0 failed.")
+        self.endpoint.create_gpu_machine.assert_called_once_with(
+            "eval-1", "g4dn.xlarge"
+        )
+        self.endpoint.create_cpu_machine.assert_called_once_with("eval-2", "t2.micro")
+        self.assertEqual(
+            sorted(c.args for c in self.endpoint.pull_gpu_model.call_args_list),
+            [("m1", "llama3:8b"), ("m1", "smollm:135m")],
+        )
+        self.endpoint.pull_cpu_model.assert_not_called()
+
+    def test_apply_reports_failures(self):
+        self.endpoint.create_cpu_machine.return_value = {
+            "success": False,
+            "message": "quota",
+        }
+        self.endpoint.pull_gpu_model.return_value = {"success": False}
+        with patch("click.echo") as mock_print, patch("click.secho") as mock_secho:
+            self.assertFalse(self.fleet.apply(MANIFEST))
+            mock_secho.assert_any_call("  ✘ eval-2: create failed. quota", fg="red")
+            mock_secho.assert_any_call(
+                "  ✘ eval-1: failed to pull smollm:135m", fg="red"
+            )
+            mock_print.assert_called_with("\n0/2 machines ready, 2 failed.")
+
+    def test_apply_skips_pull_when_machine_terminated(self):
+        self.endpoint.list_user_machines.side_effect = [
+            {"success": True, "data": []},
+            {
+                "success": True,
+                "data": [{"machine_id": "m1", "machine_status": "terminated"}],
+            },
+        ]
+        with patch("click.echo"), patch("click.secho") as mock_secho:
+            self.assertFalse(self.fleet.apply(MANIFEST))
+            mock_secho.assert_any_call(
+                "  ✘ eval-1: not running, models not pulled", fg="red"
+            )
+        self.endpoint.pull_gpu_model.assert_not_called()
+
+    def test_apply_stops_waiting_when_poll_times_out(self):
+        self.endpoint.list_user_machines.side_effect = [
+            {"success": True, "data": []},
+            {"success": False, "error": "Timeout", "message": "Deadline exceeded"},
+        ]
+        with patch("click.echo") as mock_print, patch("click.secho"):
+            self.assertFalse(self.fleet.apply(MANIFEST))
+            mock_print.assert_called_with("\n2/3 machines ready, 1 failed.")
+        self.assertEqual(self.endpoint.list_user_machines.call_count, 2)
+        self.endpoint.pull_gpu_model.assert_not_called()
+
+
+class TestApplyCommand(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+
+    @patch("src.commands.fleet.FleetCommands")
+    def test_apply_command(self, fleet_commands):
+        fleet_commands.return_value.apply.return_value = True
+        with self.runner.isolated_filesystem():
+            with open("fleet.json", "w") as f:
+                json.dump(MANIFEST, f)
+            result = self.runner.invoke(apply, ["-f", "fleet.json", "--dry-run"])
+        self.assertEqual(result.exit_code, 0)
+        fleet_commands.return_value.apply.assert_called_once_with(
+            MANIFEST, 16, 900.0, True
+        )
+
+    @patch("src.commands.fleet.FleetCommands")
+    def test_apply_command_invalid_manifest(self, fleet_commands):
+        with self.runner.isolated_filesystem():
+            with open("fleet.json", "w") as f:
+                json.dump({"machines": [{"name": "a"}]}, f)
+            result = self.runner.invoke(apply, ["-f", "fleet.json"])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("a: invalid hardware type None.", result.output)
+        fleet_commands.assert_not_called()
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 from click.testing import CliRunner
 
 from src.commands.machine import MachineCommands, machine
+from src.utils.deadline import set_deadline
 
 
 class TestNewMachineCommands(unittest.TestCase):
@@ -367,6 +368,157 @@ class TestNewMachineCommands(unittest.TestCase):
                 )
             )
 
+    def test_select_deduplicates_ids(self):
+        result = self.machine_commands.select(["a", "b", "a"])
+        self.assertEqual(result, ["a", "b"])
+        self.mock_instance.list_user_machines.assert_not_called()
+
+    def test_select_all_and_names(self):
+        self.mock_instance.list_user_machines.return_value = {
+            "success": True,
+            "data": [
+                {"machine_id": "1", "machine_name": "dev-a"},
+                {"machine_id": "2", "machine_name": "dev-b"},
+                {"machine_id": "3", "machine_name": "prod-a"},
+            ],
+        }
+        self.assertEqual(
+            self.machine_commands.select(["3"], names=["dev-*"]), ["3", "1", "2"]
+        )
+        self.assertEqual(
+            self.machine_commands.select(all_machines=True), ["1", "2", "3"]
+        )
+
+    def test_select_list_failure(self):
+        self.mock_instance.list_user_machines.return_value = {"success": False}
+        with patch("click.echo") as mock_print:
+            self.assertIsNone(self.machine_commands.select(all_machines=True))
+            mock_print.assert_called_with("Failed to retrieve list of machines.")
+
+    def test_bulk_stop(self):
+        self.mock_instance.stop_machine.side_effect = lambda machine_id: (
+            {"success": True, "data": {"message": f"{machine_id} stopping"}}
+            if machine_id != "bad"
+            else {"success": False, "message": "not found"}
+        )
+        with patch("click.echo") as mock_print, patch("click.secho") as mock_secho:
+            results = self.machine_commands.bulk("stop", ["a", "bad", "c"], workers=2)
+            mock_print.assert_any_call("  ✔ a: a stopping")
+            mock_print.assert_any_call("  ✔ c: c stopping")
+            mock_secho.assert_called_once_with("  ✘ bad: not found", fg="red")
+            mock_print.assert_called_with("\n2/3 machines stopped, 1 failed.")
+        self.assertEqual(len(results), 3)
+        self.assertEqual(self.mock_instance.stop_machine.call_count, 3)
+
+    @patch("src.commands.machine.time.sleep")
+    def test_wait_single_machine_polls_get_machine(self, mock_sleep):
+        self.mock_instance.get_machine.side_effect = [
+            {"success": True, "data": {"machine_status": "pending"}},
+            {"success": False},
+            {"success": True, "data": {"machine_status": "RUNNING"}},
+        ]
+        with patch("click.echo") as mock_print:
+            self.assertTrue(self.machine_commands.wait(["m1"], "running", 60))
+            mock_print.assert_any_call("  ✔ m1: running")
+        self.assertEqual(self.mock_instance.get_machine.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.mock_instance.list_user_machines.assert_not_called()
+
+    @patch("src.commands.machine.time.sleep")
+    def test_wait_many_machines_batches_polling(self, mock_sleep):
+        self.mock_instance.list_user_machines.side_effect = [
+            {
+                "success": True,
+                "data": [
+                    {"machine_id": "m1", "machine_status": "stopped"},
+                    {"machine_id": "m2", "machine_status": "stopping"},
+                    {"machine_id": "m3", "machine_status": "stopped"},
+                ],
+            },
+        ]
+        self.mock_instance.get_machine.return_value = {
+            "success": True,
+            "data": {"machine_id": "m2", "machine_status": "stopped"},
+        }
+        with patch("click.echo"):
+            self.assertTrue(
+                self.machine_commands.wait(["m1", "m2", "m3"], "stopped", 60)
+            )
+        self.mock_instance.list_user_machines.assert_called_once()
+        self.mock_instance.get_machine.assert_called_once_with("m2")
+
+    @patch("src.commands.machine.time.monotonic")
+    @patch("src.commands.machine.time.sleep")
+    def test_wait_times_out(self, mock_sleep, mock_monotonic):
+        mock_monotonic.side_effect = [0, 5, 11]
+        self.mock_instance.get_machine.return_value = {
+            "success": True,
+            "data": {"machine_status": "pending"},
+        }
+        with patch("click.echo") as mock_print, patch("click.secho"):
+            self.assertFalse(self.machine_commands.wait(["m1"], "running", 10))
+            mock_print.assert_called_with("  • m1: pending")
+        mock_sleep.assert_called_once_with(1.0)
+
+    @patch("src.commands.machine.time.sleep")
+    def test_wait_stops_when_poll_times_out(self, mock_sleep):
+        self.mock_instance.get_machine.side_effect = [
+            {"success": True, "data": {"machine_status": "pending"}},
+            {"success": False, "error": "Timeout", "message": "Deadline exceeded"},
+        ]
+        with patch("click.echo"), patch("click.secho") as mock_secho:
+            self.assertFalse(self.machine_commands.wait(["m1"], "running", 600))
+            mock_secho.assert_called_with(
+                "Timed out waiting for 1 machine(s).", fg="red"
+            )
+        self.assertEqual(self.mock_instance.get_machine.call_count, 2)
+
+    @patch("src.commands.machine.time.sleep")
+    def test_wait_is_capped_by_deadline(self, mock_sleep):
+        self.mock_instance.get_machine.return_value = {
+            "success": True,
+            "data": {"machine_status": "pending"},
+        }
+        set_deadline(0)
+        try:
+            with patch("click.echo"), patch("click.secho"):
+                self.assertFalse(self.machine_commands.wait(["m1"], "running", 600))
+        finally:
+            set_deadline(None)
+        self.mock_instance.get_machine.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("src.commands.machine.time.sleep")
+    def test_wait_fails_when_machine_terminated(self, mock_sleep):
+        self.mock_instance.get_machine.return_value = {
+            "success": True,
+            "data": {"status": "terminated"},
+        }
+        with patch("click.echo"), patch("click.secho") as mock_secho:
+            self.assertFalse(self.machine_commands.wait(["m1"], "running", 10))
+            mock_secho.assert_called_with("  ✘ m1: terminated", fg="red")
+
+    @patch("src.commands.machine.time.sleep")
+    def test_wait_terminated_machine_not_found(self, mock_sleep):
+        self.mock_instance.get_machine.return_value = {
+            "success": False,
+            "error": "HTTP error",
+            "status_code": 404,
+            "response": {"detail": "Machine not found"},
+        }
+        with patch("click.echo"):
+            self.assertTrue(self.machine_commands.wait(["m1"], "terminated", 10))
+        self.mock_instance.get_machine.assert_called_once_with("m1")
+        mock_sleep.assert_not_called()
+
+    def test_wait_terminated_machines_missing_from_list(self):
+        self.mock_instance.list_user_machines.return_value = {
+            "success": True,
+            "data": [{"machine_id": "m2", "machine_status": "terminated"}],
+        }
+        with patch("click.echo"):
+            self.assertTrue(self.machine_commands.wait(["m1", "m2"], "terminated", 10))
+
     def test_get_details_failure(self):
         self.mock_instance.get_machine.return_value = {"success": False}
         with patch("click.echo") as mock_print:
@@ -544,3 +696,92 @@ class TestMachineCommandsInvoke(unittest.TestCase):
         )
         self.assertEqual(result.exit_code, 0)
         mock_get_details.assert_called_once_with("test123")
+
+    @patch("src.commands.machine.MachineCommands.bulk")
+    def test_stop_many_command(self, mock_bulk):
+        result = self.runner.invoke(
+            machine, ["stop", "-id", "a", "-id", "b", "--workers", "4"]
+        )
+        self.assertEqual(result.exit_code, 0)
+        mock_bulk.assert_called_once_with("stop", ["a", "b"], 4)
+
+    @patch("src.commands.machine.MachineCommands.bulk")
+    def test_terminate_from_stdin_command(self, mock_bulk):
+        result = self.runner.invoke(machine, ["terminate", "--stdin"], input="a\nb c\n")
+        self.assertEqual(result.exit_code, 0)
+        mock_bulk.assert_called_once_with("terminate", ["a", "b", "c"], 16)
+
+    @patch("src.commands.machine.MachineCommands.select", return_value=[])
+    def test_start_no_match_command(self, mock_select):
+        result = self.runner.invoke(machine, ["start", "--name", "none-*"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("No machines matched the selection.", result.output)
+        mock_select.assert_called_once_with([], False, ("none-*",))
+
+    @patch("src.commands.machine.MachineCommands.start")
+    def test_start_prompts_for_id(self, mock_start):
+        result = self.runner.invoke(machine, ["start"], input="test123\n")
+        self.assertEqual(result.exit_code, 0)
+        mock_start.assert_called_once_with("test123")
+
+    @patch("src.commands.machine.MachineCommands.wait", return_value=True)
+    @patch("src.commands.machine.MachineCommands.bulk")
+    def test_start_many_and_wait_command(self, mock_bulk, mock_wait):
+        mock_bulk.return_value = [{"success": True}, {"success": True}]
+        result = self.runner.invoke(
+            machine, ["start", "-id", "a", "-id", "b", "--wait"]
+        )
+        self.assertEqual(result.exit_code, 0)
+        mock_wait.assert_called_once_with(["a", "b"], "running", 600.0)
+
+    @patch("src.commands.machine.MachineCommands.wait", return_value=True)
+    @patch("src.commands.machine.MachineCommands.bulk")
+    def test_start_many_partial_failure_exit_code(self, mock_bulk, mock_wait):
+        mock_bulk.return_value = [{"success": True}, {"success": False}]
+        result = self.runner.invoke(
+            machine, ["start", "-id", "a", "-id", "b", "--wait"]
+        )
+        self.assertEqual(result.exit_code, 1)
+        mock_wait.assert_called_once_with(["a"], "running", 600.0)
+
+    @patch("src.commands.machine.MachineCommands.stop")
+    @patch("src.commands.machine.MachineCommands.select", return_value=["a"])
+    def test_stop_one_matched_failure_exit_code(self, mock_select, mock_stop):
+        mock_stop.return_value = {"success": False}
+        result = self.runner.invoke(machine, ["stop", "--all"])
+        self.assertEqual(result.exit_code, 1)
+        mock_stop.assert_called_once_with("a")
+
+    @patch("src.commands.machine.MachineCommands.bulk")
+    def test_terminate_many_failure_exit_code(self, mock_bulk):
+        mock_bulk.return_value = [{"success": False}, {"success": True}]
+        result = self.runner.invoke(machine, ["terminate", "-id", "a", "-id", "b"])
+        self.assertEqual(result.exit_code, 1)
+
+    @patch("src.commands.machine.MachineCommands.wait", return_value=False)
+    @patch("src.commands.machine.MachineCommands.stop")
+    def test_stop_wait_timeout_exit_code(self, mock_stop, mock_wait):
+        mock_stop.return_value = {"success": True}
+        result = self.runner.invoke(
+            machine, ["stop", "-id", "a", "--wait", "--wait-timeout", "5"]
+        )
+        self.assertEqual(result.exit_code, 1)
+        mock_wait.assert_called_once_with(["a"], "stopped", 5.0)
+
+    @patch("src.commands.machine.MachineCommands.wait", return_value=True)
+    @patch("src.commands.machine.MachineCommands.create")
+    def test_create_and_wait_command(self, mock_create, mock_wait):
+        mock_create.return_value = {"machine_id": "new1"}
+        result = self.runner.invoke(
+            machine, ["create", "cpu", "-n", "test", "-t", "t2.micro", "--wait"]
+        )
+        self.assertEqual(result.exit_code, 0)
+        mock_wait.assert_called_once_with(["new1"], "running", 600.0)
+
+    @patch("src.commands.machine.MachineCommands.wait", return_value=False)
+    def test_wait_command(self, mock_wait):
+        result = self.runner.invoke(
+            machine, ["wait", "-id", "a", "-id", "b", "--state", "stopped"]
+        )
+        self.assertEqual(result.exit_code, 1)
+        mock_wait.assert_called_once_with(["a", "b"], "stopped", 600.0)
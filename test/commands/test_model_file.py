@@ -1,9 +1,29 @@
+import io
+import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
+
+import click
+import pytest
 from click.testing import CliRunner
-from src.commands.model_file import model, ModelFileCommands
+from src.api.model_file_api import ModelFileAPI
+from src.commands.model_file import (
+    model,
+    ModelFileCommands,
+    decode_utf8,
+    expand_file_paths,
+    is_large_file,
+    local_files,
+    plan_sync,
+)
+from src.utils.compression import CompressionUnavailable
+from src.utils.file_cache import FileCache
+from src.utils.hash_index import HashIndex
 import traceback
 
+from test.api.stand_in_server import run_stand_in_server, stand_in_client
+
 
 class TestModelFileCommands(unittest.TestCase):
     def setUp(self):
@@ -67,6 +87,36 @@ class TestModelFileCommands(unittest.TestCase):
             self.model_commands.upload("test.txt", "test_model")
             mock_print.assert_called_with("Failed to upload model file: Upload failed")
 
+    def test_upload_large_file_is_chunked(self):
+        self.mock_instance.upload_model_file_chunked.return_value = (
+            self.mock_instance.upload_model_file.return_value
+        )
+        with patch("src.commands.model_file.is_large_file", return_value=True):
+            with patch("click.echo"):
+                self.model_commands.upload(
+                    "big.bin", "test_model", part_size=1024, parallelism=2
+                )
+        self.mock_instance.upload_model_file_chunked.assert_called_once_with(
+            "test_model",
+            None,
+            "big.bin",
+            overwrite=False,
+            part_size=1024,
+            parallelism=2,
+            digest=None,
+            progress=ANY,
+            encoding=None,
+        )
+        self.mock_instance.upload_model_file.assert_not_called()
+
+    def test_is_large_file(self):
+        with tempfile.NamedTemporaryFile() as file:
+            file.write(b"x" * 10)
+            file.flush()
+            self.assertTrue(is_large_file(file.name, threshold=10))
+            self.assertFalse(is_large_file(file.name, threshold=11))
+        self.assertFalse(is_large_file("missing.bin", threshold=0))
+
     def test_list_models_success(self):
         mock_models = [
             {
@@ -143,3 +193,577 @@ class TestModelFileCommands(unittest.TestCase):
     def test_cli_delete_command(self, model_commands):
         result = self.runner.invoke(model, ["delete", "--model-id", "123"])
         self.assertEqual(result.exit_code, 0)
+
+
+@pytest.fixture
+def server():
+    with run_stand_in_server() as server:
+        yield server
+
+
+@pytest.fixture
+def commands(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "src.api.chunked_upload.UPLOAD_SESSION_DIR", str(tmp_path / "uploads")
+    )
+    commands = ModelFileCommands()
+    commands.endpoint = ModelFileAPI(
+        stand_in_client(server),
+        HashIndex(str(tmp_path / "hash-index.sqlite")),
+        FileCache(str(tmp_path / "cache")),
+    )
+    return commands
+
+
+def uploads(server):
+    return [
+        (method, path)
+        for method, path in server.state.requests
+        if method == "PUT" or path in ("/models", "/models/uploads")
+    ]
+
+
+def test_unchanged_small_file_is_not_resent(server, commands, tmp_path):
+    config = tmp_path / "config.json"
+    config.write_text('{"hidden_size": 4096}')
+    commands.upload(str(config), "llama")
+    assert len(uploads(server)) == 1
+
+    server.state.requests.clear()
+    with patch("click.echo") as echo:
+        commands.update(str(config), "llama")
+    echo.assert_any_call("Model file unchanged, upload skipped:")
+    assert uploads(server) == []
+
+    config.write_text('{"hidden_size": 8192}')
+    commands.update(str(config), "llama")
+    assert uploads(server) == [("PUT", "/models")]
+    (model,) = server.state.models.values()
+    assert model["files"]["config.json"] == b'{"hidden_size": 8192}'
+
+
+def test_changed_large_file_sends_only_changed_parts(server, commands, tmp_path):
+    weights = tmp_path / "weights.bin"
+    content = bytearray(bytes(range(256)) * 40)
+    weights.write_bytes(content)
+    with patch("src.commands.model_file.is_large_file", return_value=True):
+        commands.upload(str(weights), "llama", part_size=1024)
+        assert len([m for m, _ in uploads(server) if m == "PUT"]) == 10
+
+        server.state.requests.clear()
+        content[5000] ^= 0xFF
+        weights.write_bytes(content)
+        commands.update(str(weights), "llama", part_size=1024)
+    assert [path for method, path in uploads(server) if method == "PUT"] == [
+        path for method, path in uploads(server) if path.endswith("/parts/4")
+    ]
+    assert len(uploads(server)) == 2
+    (model,) = server.state.models.values()
+    assert model["files"]["weights.bin"] == bytes(content)
+
+
+def test_no_dedup_always_sends(server, commands, tmp_path):
+    config = tmp_path / "config.json"
+    config.write_text("{}")
+    commands.upload(str(config), "llama")
+    server.state.requests.clear()
+    commands.update(str(config), "llama", dedup=False)
+    assert uploads(server) == [("PUT", "/models")]
+
+
+def test_plan_sync(tmp_path):
+    for name in ("same.bin", "grown.bin", "touched.bin", "new.bin"):
+        (tmp_path / name).write_bytes(b"1234")
+        os.utime(tmp_path / name, (1_700_000_000, 1_700_000_000))
+    os.utime(tmp_path / "touched.bin", (1_800_000_000, 1_800_000_000))
+    remote = [
+        {"file_name": name, "file_size": size, "last_modified": "2023-11-14T22:13:20Z"}
+        for name, size in (
+            ("same.bin", 4),
+            ("grown.bin", 3),
+            ("touched.bin", 4),
+            ("gone.bin", 4),
+        )
+    ]
+    local = local_files(str(tmp_path))
+    assert plan_sync(local, remote) == (
+        ["new.bin"],
+        ["grown.bin", "touched.bin"],
+        ["same.bin"],
+        [],
+    )
+    assert plan_sync(local, remote, delete=True)[3] == ["gone.bin"]
+
+
+def test_local_files_skips_directories_and_hidden_files(tmp_path):
+    (tmp_path / "config.json").write_text("{}")
+    (tmp_path / ".DS_Store").write_text("")
+    (tmp_path / "nested").mkdir()
+    assert local_files(str(tmp_path)) == {"config.json": str(tmp_path / "config.json")}
+
+
+def test_sync_directory(server, commands, tmp_path):
+    server.state.store("llama", "m1", "stale.bin", b"old")
+    directory = tmp_path / "llama"
+    directory.mkdir()
+    for name in ("config.json", "tokenizer.json", "weights.bin"):
+        (directory / name).write_text(name)
+        os.utime(directory / name, (1_000_000_000, 1_000_000_000))
+
+    with patch("click.echo") as echo:
+        assert commands.sync(str(directory), "m1", workers=3)
+    echo.assert_any_call("\n3 uploaded, 0 deleted, 0 unchanged, 0 failed.")
+    files = server.state.models["m1"]["files"]
+    assert files["weights.bin"] == b"weights.bin"
+
+    (directory / "config.json").write_text("changed")
+    (directory / "tokenizer.json").unlink()
+    server.state.requests.clear()
+    with patch("click.echo") as echo:
+        assert commands.sync(str(directory), "m1", delete=True)
+    echo.assert_any_call("\n1 uploaded, 2 deleted, 1 unchanged, 0 failed.")
+    assert sorted(files) == ["config.json", "weights.bin"]
+    assert files["config.json"] == b"changed"
+    assert ("PUT", "/models") in server.state.requests
+
+
+def test_sync_dry_run(server, commands, tmp_path):
+    server.state.store("llama", "m1", "stale.bin", b"old")
+    (tmp_path / "config.json").write_text("{}")
+    with patch("click.echo") as echo:
+        assert commands.sync(str(tmp_path), "m1", delete=True, dry_run=True)
+    echo.assert_any_call("\n1 new, 0 changed, 1 to delete, 0 unchanged.")
+    assert sorted(server.state.models["m1"]["files"]) == ["stale.bin"]
+
+
+def test_sync_unknown_model(server, commands, tmp_path):
+    with patch("click.echo"):
+        assert not commands.sync(str(tmp_path), "missing")
+
+
+def test_sync_unexpected_error(commands, tmp_path):
+    failure = {"success": False, "error": "Unexpected error", "message": "boom"}
+    with patch.object(commands.endpoint, "get_model", return_value=failure):
+        with patch("click.echo") as echo:
+            assert not commands.sync(str(tmp_path), "m1")
+    echo.assert_called_with("Failed to get model. boom")
+
+
+def test_expand_file_paths(tmp_path):
+    for name in ("model-1.bin", "model-2.bin", "config.json"):
+        (tmp_path / name).write_text(name)
+    (tmp_path / "nested").mkdir()
+    paths = {name: str(tmp_path / name) for name in os.listdir(tmp_path)}
+    assert expand_file_paths(str(tmp_path)) == sorted(
+        paths[name] for name in ("model-1.bin", "model-2.bin", "config.json")
+    )
+    assert expand_file_paths(str(tmp_path / "model-*")) == [
+        paths["model-1.bin"],
+        paths["model-2.bin"],
+    ]
+    assert expand_file_paths(paths["config.json"]) == [paths["config.json"]]
+    assert expand_file_paths(str(tmp_path / "missing.bin")) == []
+
+
+def test_upload_many_creates_one_model_largest_first(server, commands, tmp_path):
+    for name, size in (("config.json", 10), ("shard-1.bin", 300), ("shard-2.bin", 200)):
+        (tmp_path / name).write_bytes(b"x" * size)
+    paths = expand_file_paths(str(tmp_path))
+
+    with patch("click.echo") as echo:
+        assert commands.upload_many(paths, model_name="llama", workers=1)
+    (model_id,) = server.state.models
+    echo.assert_any_call(f"\n3/3 files uploaded to model {model_id}, 0 failed.")
+    # the smallest file creates the model, then the rest go largest first
+    assert [*server.state.models[model_id]["files"]] == [
+        "config.json",
+        "shard-1.bin",
+        "shard-2.bin",
+    ]
+    posts = [path for method, path in server.state.requests if path == "/models"]
+    assert len(posts) == 3
+
+
+def test_upload_many_reports_failures(server, commands, tmp_path):
+    (tmp_path / "a.bin").write_bytes(b"a")
+    with patch("click.echo"), patch("click.secho") as secho:
+        assert not commands.upload_many(
+            [str(tmp_path / "a.bin"), str(tmp_path / "gone.bin")], model_id="m1"
+        )
+    secho.assert_called_once()
+
+
+def test_cli_upload_directory(tmp_path):
+    (tmp_path / "a.bin").write_bytes(b"a")
+    (tmp_path / "b.bin").write_bytes(b"bb")
+    commands = MagicMock()
+    commands.upload_many.return_value = True
+    with patch("src.commands.model_file.ModelFileCommands", return_value=commands):
+        result = CliRunner().invoke(
+            model, ["upload", "-id", "m1", "-f", str(tmp_path), "-w", "2"]
+        )
+    assert result.exit_code == 0, result.output
+    commands.upload_many.assert_called_once_with(
+        [str(tmp_path / "a.bin"), str(tmp_path / "b.bin")],
+        None,
+        "m1",
+        workers=2,
+        part_size=ANY,
+        parallelism=ANY,
+        dedup=True,
+        compression="none",
+    )
+
+
+def test_cli_upload_no_match(tmp_path):
+    with patch("src.commands.model_file.ModelFileCommands"):
+        result = CliRunner().invoke(
+            model, ["upload", "-id", "m1", "-f", str(tmp_path / "*.bin")]
+        )
+    assert result.exit_code == 2
+    assert "No files match" in result.output
+
+
+def test_download_to_directory(server, commands, tmp_path):
+    server.state.store("llama", "m1", "weights.bin", b"w" * 5000)
+    with patch("click.echo") as echo:
+        assert commands.download("m1", "weights.bin", str(tmp_path), 1024, 4)
+    assert (tmp_path / "weights.bin").read_bytes() == b"w" * 5000
+    echo.assert_called_with(
+        f"Downloaded weights.bin (4.9 KiB) to {tmp_path / 'weights.bin'}"
+    )
+
+
+def test_download_missing_file(server, commands, tmp_path):
+    with patch("click.echo") as echo:
+        assert not commands.download("m1", "missing.bin", str(tmp_path))
+    echo.assert_called_with("Failed to download model file. File not found")
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.fixture
+def log_file(server):
+    lines = [f"step {i}: loss {1 / (i + 1):.4f}\n" for i in range(1000)]
+    server.state.store("llama", "m1", "train.log", "".join(lines).encode())
+    return lines
+
+
+def downloads(server):
+    return [path for _, path in server.state.requests if path.endswith("/download")]
+
+
+def test_pages_are_fetched_lazily(server, commands, log_file):
+    pages = commands.pages("m1", "train.log", page_size=1000)
+    assert next(pages) == "".join(log_file).encode()[:1000]
+    assert len(downloads(server)) == 1
+    assert b"".join(pages) == "".join(log_file).encode()[1000:]
+
+
+def test_head_and_tail_lines(server, commands, log_file):
+    head = commands.head_lines("m1", "train.log", 3, page_size=1000)
+    assert head.decode() == "".join(log_file[:3])
+    assert len(downloads(server)) == 1
+
+    server.state.requests.clear()
+    tail = commands.tail_lines("m1", "train.log", 100, page_size=1000)
+    assert tail.decode() == "".join(log_file[-100:])
+    assert len(downloads(server)) < 5
+
+
+def test_read_byte_range(server, commands, log_file):
+    content = "".join(log_file)
+    with patch("click.echo") as echo:
+        commands.read_paged("m1", "train.log", offset=5, length=30)
+    assert "".join(c.args[0] for c in echo.call_args_list) == content[5:35]
+
+
+def test_reads_use_current_cached_copy(server, commands, log_file, tmp_path):
+    commands.download("m1", "train.log", str(tmp_path))
+    commands.endpoint._current.clear()
+    server.state.requests.clear()
+    with patch("click.echo") as echo:
+        commands.read_paged("m1", "train.log", tail=2)
+    assert "".join(c.args[0] for c in echo.call_args_list) == "".join(log_file[-2:])
+    with patch("click.echo") as echo:
+        commands.read_file("m1", "train.log")
+    echo.assert_called_with("".join(log_file))
+    assert downloads(server) == ["/models/m1/train.log/download"]
+
+
+def test_read_pager(server, commands, log_file):
+    with patch("click.echo_via_pager") as pager:
+        commands.read_paged("m1", "train.log", pager=True)
+    assert "".join(pager.call_args.args[0]) == "".join(log_file)
+
+
+def test_read_missing_file(server, commands):
+    with pytest.raises(click.ClickException, match="File not found"):
+        commands.read_paged("m1", "missing.log", head=10)
+
+
+def test_decode_utf8_across_chunks():
+    encoded = "dück".encode()
+    assert "".join(decode_utf8([encoded[:2], encoded[2:]])) == "dück"
+    assert "".join(decode_utf8([encoded[:2]])) == "d�"
+
+
+def test_cli_read_options_conflict():
+    with patch("src.commands.model_file.ModelFileCommands"):
+        result = CliRunner().invoke(
+            model, ["read", "-id", "m1", "-f", "a.log", "--head", "1", "--tail", "1"]
+        )
+    assert result.exit_code == 2
+    assert "Use only one of" in result.output
+
+
+def test_cli_read_tail():
+    commands = MagicMock()
+    with patch("src.commands.model_file.ModelFileCommands", return_value=commands):
+        result = CliRunner().invoke(
+            model, ["read", "-id", "m1", "-f", "a.log", "--tail", "20"]
+        )
+    assert result.exit_code == 0, result.output
+    commands.read_paged.assert_called_once_with(
+        "m1", "a.log", 0, None, None, 20, pager=False
+    )
+    commands.read_file.assert_not_called()
+
+
+@pytest.fixture
+def shards(server):
+    contents = {f"shard-{i}.bin": os.urandom(1000 * (i + 1)) for i in range(4)}
+    for name, content in contents.items():
+        server.state.store("llama", "m1", name, content)
+    return contents
+
+
+def test_pull_files(server, commands, shards, tmp_path):
+    dest = tmp_path / "pulled"
+    with patch("click.echo") as echo:
+        assert commands.pull_files("m1", str(dest), workers=3, segment_size=1024)
+    assert {name: (dest / name).read_bytes() for name in shards} == shards
+    assert sorted(os.listdir(dest)) == sorted(shards)
+    echo.assert_any_call("\n4 downloaded, 0 unchanged, 0 failed.")
+
+    server.state.requests.clear()
+    os.remove(dest / "shard-0.bin")
+    (dest / "shard-0.bin").write_bytes(b"x" * 1000)  # same size, other bytes
+    with patch("click.echo") as echo:
+        assert commands.pull_files("m1", str(dest))
+    assert (dest / "shard-0.bin").read_bytes() == shards["shard-0.bin"]
+    # only the probe: the current version is copied from the download cache
+    assert downloads(server) == ["/models/m1/shard-0.bin/download"]
+    echo.assert_any_call("\n1 downloaded, 3 unchanged, 0 failed.")
+
+
+def test_pull_files_after_edit_in_place(server, commands, shards, tmp_path):
+    dest = tmp_path / "pulled"
+    with patch("click.echo"):
+        assert commands.pull_files("m1", str(dest))
+    # the cached copy is linked to this file, so the edit reaches it too
+    with open(dest / "shard-0.bin", "r+b") as file:
+        file.write(b"x" * 10)
+    with patch("click.echo") as echo:
+        assert commands.pull_files("m1", str(dest))
+    assert (dest / "shard-0.bin").read_bytes() == shards["shard-0.bin"]
+    echo.assert_any_call("\n1 downloaded, 3 unchanged, 0 failed.")
+
+
+def test_pull_files_rejects_mismatched_download(server, commands, shards, tmp_path):
+    model = commands.endpoint.get_model("m1")
+    model["data"]["files"][0]["digest"] = "0" * 64
+    with patch.object(commands.endpoint, "get_model", return_value=model):
+        with patch("click.echo"), patch("click.secho") as secho:
+            assert not commands.pull_files("m1", str(tmp_path))
+    name = model["data"]["files"][0]["file_name"]
+    secho.assert_called_once_with(f"  ✘ {name}: sha256 digest does not match", fg="red")
+    assert not (tmp_path / name).exists()
+    assert commands.endpoint.cache.validator("m1", name) is None
+
+
+def test_pull_files_unknown_model(server, commands, tmp_path):
+    with patch("click.echo") as echo:
+        assert not commands.pull_files("missing", str(tmp_path / "pulled"))
+    echo.assert_called_with("Failed to get model. Model not found")
+
+
+def test_cli_pull_files(tmp_path):
+    with patch("src.commands.model_file.ModelFileCommands") as commands:
+        commands.return_value.pull_files.return_value = True
+        result = CliRunner().invoke(
+            model, ["pull-files", "-id", "m1", "--dir", str(tmp_path), "-w", "2"]
+        )
+    assert result.exit_code == 0
+    commands.return_value.pull_files.assert_called_once_with(
+        "m1",
+        str(tmp_path),
+        workers=2,
+        segment_size=ANY,
+        parallelism=ANY,
+        use_cache=True,
+        compression="none",
+    )
+
+
+def test_upload_stream_is_sent_chunked(server, commands):
+    content = os.urandom(3 * 1024**2 + 5)
+    with patch("click.echo") as echo:
+        assert commands.upload_stream(io.BytesIO(content), "piped.bin", "llama")
+    echo.assert_any_call("Model file uploaded successfully:")
+    (model,) = server.state.models.values()
+    assert model["files"] == {"piped.bin": content}
+    assert server.state.chunked_bodies == 1
+
+
+def test_cli_upload_from_stdin():
+    with patch("src.commands.model_file.ModelFileCommands") as commands:
+        commands.return_value.upload_stream.return_value = True
+        result = CliRunner().invoke(
+            model,
+            ["upload", "-n", "llama", "-f", "-", "--file-name", "q.bin"],
+            input=b"weights",
+        )
+    assert result.exit_code == 0
+    stream, *args = commands.return_value.upload_stream.call_args.args
+    assert args == ["q.bin", "llama", None, "none"]
+
+
+@pytest.mark.parametrize(
+    "args, message",
+    [
+        (["-n", "llama", "-f", "-"], "--file-name is required"),
+        (["-f", "-", "--file-name", "q.bin"], "--model-name or --model-id"),
+    ],
+)
+def test_cli_upload_from_stdin_usage(args, message):
+    with patch("src.commands.model_file.ModelFileCommands"):
+        result = CliRunner().invoke(model, ["upload", *args], input=b"")
+    assert result.exit_code == 2
+    assert message in result.output
+
+
+@pytest.mark.parametrize("encodings, encoded", [({"gzip"}, 1), (set(), 0)])
+def test_upload_compressed(server, commands, tmp_path, encodings, encoded):
+    server.state.encodings = encodings
+    config = tmp_path / "config.json"
+    config.write_text('{"hidden_size": 4096}\n' * 500)
+    with patch("click.echo") as echo:
+        commands.upload(str(config), "llama", compression="auto")
+    echo.assert_any_call("Model file uploaded successfully:")
+    (model,) = server.state.models.values()
+    assert model["files"]["config.json"] == config.read_bytes()
+    assert len(server.state.encoded) == encoded
+
+
+def test_cli_rejects_unavailable_compression():
+    with patch("src.commands.model_file.choose_encoding") as choose:
+        choose.side_effect = CompressionUnavailable("zstd needs zstandard")
+        result = CliRunner().invoke(
+            model, ["download", "-id", "m1", "-f", "a.bin", "--compress", "zstd"]
+        )
+    assert result.exit_code == 2
+    assert "zstd needs zstandard" in result.output
+
+
+def test_cli_max_rate(tmp_path):
+    with patch("src.commands.model_file.ModelFileCommands") as commands:
+        commands.return_value.pull_files.return_value = True
+        result = CliRunner().invoke(
+            model,
+            ["pull-files", "-id", "m1", "--dir", str(tmp_path), "--max-rate", "2MiB"],
+        )
+    assert result.exit_code == 0, result.output
+    commands.return_value.limit_rate.assert_called_once_with(2 * 1024**2)
+
+
+def test_limit_rate(commands):
+    commands.limit_rate(1000)
+    assert commands.endpoint.rate_limiter.rate == 1000
+    commands.limit_rate(0)
+    assert commands.endpoint.rate_limiter is None
+
+
+@pytest.mark.parametrize("compression", ["none", "auto"])
+def test_upload_archive_in_one_request(server, commands, tmp_path, compression):
+    server.state.encodings = {"gzip"}
+    contents = {f"piece-{i:03}.json": f'{{"id": {i}}}'.encode() for i in range(200)}
+    for name, content in contents.items():
+        (tmp_path / name).write_bytes(content)
+    with patch("click.echo") as echo:
+        assert commands.upload_archive(
+            expand_file_paths(str(tmp_path)), "llama", compression=compression
+        )
+    (model_id,) = server.state.models
+    assert server.state.models[model_id]["files"] == contents
+    assert server.state.requests == [("POST", "/models/archive")]
+    assert len(server.state.encoded) == (compression == "auto")
+    assert echo.call_args.args[0].startswith(
+        f"Uploaded 200 files (2.0 KiB) to model {model_id} in one request"
+    )
+
+
+def test_cli_upload_tar(tmp_path):
+    (tmp_path / "a.bin").write_bytes(b"a")
+    with patch("src.commands.model_file.ModelFileCommands") as commands:
+        commands.return_value.upload_archive.return_value = True
+        result = CliRunner().invoke(
+            model, ["upload", "-id", "m1", "-f", str(tmp_path), "--tar"]
+        )
+    assert result.exit_code == 0, result.output
+    commands.return_value.upload_archive.assert_called_once_with(
+        [str(tmp_path / "a.bin")], None, "m1", "none"
+    )
+
+
+def test_verify(server, commands, shards, tmp_path):
+    for name, content in shards.items():
+        (tmp_path / name).write_bytes(content)
+    (tmp_path / "shard-1.bin").write_bytes(b"x" * 2000)  # same size, other bytes
+    (tmp_path / "shard-2.bin").write_bytes(b"short")
+    (tmp_path / "shard-3.bin").unlink()
+    (tmp_path / "notes.txt").write_text("local only")
+    with patch("click.echo") as echo, patch("click.secho") as secho:
+        assert not commands.verify("m1", str(tmp_path), workers=2)
+    assert [c.args[0] for c in secho.call_args_list] == [
+        "  ✘ shard-1.bin: sha256 digest does not match",
+        "  ✘ shard-2.bin: size 5 does not match 3000",
+        "  - shard-3.bin: missing locally",
+    ]
+    echo.assert_any_call("  ✔ shard-0.bin")
+    echo.assert_any_call(
+        "\n1 verified, 2 mismatched, 1 missing locally, 1 not on the server."
+    )
+
+
+def test_verify_matching_directory(server, commands, shards, tmp_path):
+    for name, content in shards.items():
+        (tmp_path / name).write_bytes(content)
+    with patch("click.echo") as echo:
+        assert commands.verify("m1", str(tmp_path))
+    echo.assert_any_call(
+        "\n4 verified, 0 mismatched, 0 missing locally, 0 not on the server."
+    )
+
+
+def test_verify_without_remote_size(server, commands, shards, tmp_path):
+    for name, content in shards.items():
+        (tmp_path / name).write_bytes(content)
+    model = commands.endpoint.get_model("m1")
+    for file in model["data"]["files"]:
+        file["file_size"] = None
+    with patch.object(commands.endpoint, "get_model", return_value=model):
+        with patch("click.echo") as echo:
+            assert commands.verify("m1", str(tmp_path))
+    echo.assert_any_call(
+        "\n4 verified, 0 mismatched, 0 missing locally, 0 not on the server."
+    )
+
+
+def test_cli_verify(tmp_path):
+    with patch("src.commands.model_file.ModelFileCommands") as commands:
+        commands.return_value.verify.return_value = False
+        result = CliRunner().invoke(
+            model, ["verify", "-id", "m1", "--dir", str(tmp_path), "-w", "3"]
+        )
+    assert result.exit_code == 1
+    commands.return_value.verify.assert_called_once_with("m1", str(tmp_path), 3)
@@ -15,7 +15,8 @@ class TestUserAuth(unittest.TestCase):
         self.mock_instance = self.mock_auth_api.return_value
 
         self.endpoint = patch(
-            "src.commands.user_auth.endpoint", self.mock_instance
+            "src.commands.user_auth.get_auth_endpoint",
+            return_value=self.mock_instance,
         ).start()
 
         # Create and setup mock_user_api
@@ -24,13 +25,13 @@ class TestUserAuth(unittest.TestCase):
         self.mock_user_instance = self.mock_user_api.return_value
 
         self.user_endpoint = patch(
-            "src.commands.user_auth.user_endpoint", self.mock_user_instance
+            "src.commands.user_auth.get_user_endpoint",
+            return_value=self.mock_user_instance,
         ).start()
 
     def tearDown(self):
         """Clean up after each test method."""
-        self.auth_patcher.stop()
-        self.endpoint.stop()
+        patch.stopall()
 
     def test_login_success(self):
         """Test successful login."""
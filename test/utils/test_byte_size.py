@@ -0,0 +1,36 @@
+import click
+import pytest
+
+from src.utils.helpers.byte_size import ByteSize, format_byte_size, parse_byte_size
+
+
+@pytest.mark.parametrize(
+    "text, size",
+    [
+        ("1048576", 1048576),
+        ("512k", 512 * 1024),
+        ("16MiB", 16 * 1024**2),
+        ("16 MB", 16 * 1000**2),
+        ("1.5GiB", int(1.5 * 1024**3)),
+    ],
+)
+def test_parse_byte_size(text, size):
+    assert parse_byte_size(text) == size
+
+
+@pytest.mark.parametrize("text", ["", "MiB", "12 parsecs", "-1"])
+def test_parse_byte_size_invalid(text):
+    with pytest.raises(ValueError):
+        parse_byte_size(text)
+
+
+def test_format_byte_size():
+    assert format_byte_size(512) == "512 B"
+    assert format_byte_size(1536) == "1.5 KiB"
+    assert format_byte_size(3 * 1024**3) == "3.0 GiB"
+
+
+def test_byte_size_param():
+    assert ByteSize().convert("2k", None, None) == 2048
+    with pytest.raises(click.BadParameter):
+        ByteSize(minimum=1024).convert("1", None, None)
@@ -0,0 +1,82 @@
+import gzip
+import threading
+import zlib
+
+import pytest
+
+from src.utils.compression import (
+    CompressedBody,
+    CompressionUnavailable,
+    _zstandard,
+    choose_encoding,
+    compress_blocks,
+    decompress_blocks,
+    in_background,
+)
+
+TEXT = b'{"vocab": {"hello": 1, "world": 2}}\n' * 5000
+
+
+def test_gzip_round_trip():
+    blocks = [TEXT[i : i + 1000] for i in range(0, len(TEXT), 1000)]
+    compressed = b"".join(compress_blocks(blocks, "gzip"))
+    assert len(compressed) < len(TEXT) // 10
+    assert gzip.decompress(compressed) == TEXT
+    assert b"".join(decompress_blocks([compressed[:10], compressed[10:]], "gzip")) == (
+        TEXT
+    )
+
+
+def test_choose_encoding():
+    assert choose_encoding("none", "model.safetensors") is None
+    assert choose_encoding("gzip", "weights.zip") == "gzip"
+    assert choose_encoding("auto", "weights.zip") is None
+    assert choose_encoding("auto", "Model.SAFETENSORS") in ("zstd", "gzip")
+
+
+@pytest.mark.skipif(_zstandard() is not None, reason="zstandard is installed")
+def test_zstd_needs_zstandard():
+    with pytest.raises(CompressionUnavailable, match="pip install zstandard"):
+        choose_encoding("zstd", "model.gguf")
+    assert choose_encoding("auto", "model.safetensors") == "gzip"
+
+
+def test_compressed_body_can_be_sent_again():
+    body = CompressedBody(memoryview(TEXT), "gzip", block_size=4096)
+    first, second = b"".join(body), b"".join(body)
+    assert gzip.decompress(first) == gzip.decompress(second) == TEXT
+
+
+def test_compression_runs_in_background():
+    threads = []
+
+    def blocks():
+        threads.append(threading.current_thread().name)
+        yield TEXT
+
+    compressed = b"".join(in_background(compress_blocks(blocks(), "gzip")))
+    assert zlib.decompress(compressed, 16 + zlib.MAX_WBITS) == TEXT
+    assert threads == ["quack-compress"]
+
+
+def test_background_error_reaches_consumer():
+    def blocks():
+        yield b"a"
+        raise OSError("disk gone")
+
+    with pytest.raises(OSError, match="disk gone"):
+        b"".join(in_background(blocks()))
+
+
+def test_abandoned_consumer_stops_producer():
+    produced = []
+
+    def blocks():
+        for i in range(1000):
+            produced.append(i)
+            yield b"x"
+
+    stream = in_background(blocks(), depth=2)
+    next(stream)
+    stream.close()
+    assert len(produced) < 10
@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import Mock
+from src.utils.credential_provider import CredentialProvider
+
+
+@pytest.fixture
+def password_handler():
+    handler = Mock()
+    handler.get_password.return_value = "stored_value"
+    handler.delete_password.return_value = True
+    return handler
+
+
+@pytest.fixture
+def provider(password_handler):
+    return CredentialProvider(password_handler)
+
+
+def test_get_reads_keyring_once(provider, password_handler):
+    assert provider.get("api_key") == "stored_value"
+    assert provider.get("api_key") == "stored_value"
+    password_handler.get_password.assert_called_once_with("api_key")
+
+
+def test_get_caches_missing_value(provider, password_handler):
+    password_handler.get_password.return_value = None
+    assert provider.get("access_token") is None
+    assert provider.get("access_token") is None
+    password_handler.get_password.assert_called_once_with("access_token")
+
+
+def test_construction_does_not_touch_keyring(password_handler):
+    CredentialProvider(password_handler)
+    password_handler.get_password.assert_not_called()
+
+
+def test_override_skips_keyring(provider, password_handler):
+    provider.override("api_key", "in_memory")
+    assert provider.get("api_key") == "in_memory"
+    password_handler.get_password.assert_not_called()
+    password_handler.set_password.assert_not_called()
+
+
+def test_set_writes_through(provider, password_handler):
+    provider.set("api_key", "new_value")
+    assert provider.get("api_key") == "new_value"
+    password_handler.set_password.assert_called_once_with("api_key", "new_value")
+    password_handler.get_password.assert_not_called()
+
+
+def test_delete(provider, password_handler):
+    provider.set("api_key", "new_value")
+    assert provider.delete("api_key") is True
+    assert provider.get("api_key") is None
+    password_handler.delete_password.assert_called_once_with("api_key")
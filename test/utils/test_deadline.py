@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    get_deadline,
+    set_deadline,
+)
+
+
+def test_no_deadline():
+    deadline = Deadline()
+    assert deadline.remaining() is None
+    assert deadline.check() is None
+
+
+@patch("src.utils.deadline.time.monotonic")
+def test_clock_starts_on_first_use(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    deadline = Deadline(10)
+    mock_monotonic.return_value = 150.0
+    assert deadline.remaining() == 10.0
+    mock_monotonic.return_value = 154.0
+    assert deadline.remaining() == 6.0
+
+
+@patch("src.utils.deadline.time.monotonic")
+def test_check_raises_when_spent(mock_monotonic):
+    mock_monotonic.return_value = 0.0
+    deadline = Deadline(5)
+    deadline.check()
+    mock_monotonic.return_value = 5.0
+    with pytest.raises(DeadlineExceeded):
+        deadline.check()
+
+
+def test_set_deadline():
+    try:
+        set_deadline(30)
+        assert get_deadline().seconds == 30
+    finally:
+        set_deadline(None)
+    assert get_deadline().remaining() is None
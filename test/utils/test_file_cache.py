@@ -0,0 +1,107 @@
+import errno
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.file_cache import FileCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = FileCache(str(tmp_path / "cache"), max_bytes=3000)
+    yield cache
+    cache.close()
+
+
+def write(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(os.urandom(size))
+    return str(path)
+
+
+def test_lookup_matches_validator(cache, tmp_path):
+    source = write(tmp_path, "a.bin", 1000)
+    cache.put("m1", "a.bin", '"v1"', source)
+    assert cache.validator("m1", "a.bin") == '"v1"'
+    with open(cache.lookup("m1", "a.bin", '"v1"'), "rb") as file:
+        assert file.read() == open(source, "rb").read()
+    assert cache.lookup("m1", "a.bin", '"v2"') is None
+    assert cache.lookup("m2", "a.bin", '"v1"') is None
+
+
+def test_put_links_on_same_filesystem(cache, tmp_path):
+    source = write(tmp_path, "a.bin", 1000)
+    path = cache.put("m1", "a.bin", "v", source)
+    assert os.path.samefile(path, source)
+
+
+def test_put_copies_across_filesystems(cache, tmp_path):
+    source = write(tmp_path, "a.bin", 1000)
+    cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+    with patch("src.utils.file_cache.os.link", side_effect=cross_device):
+        path = cache.put("m1", "a.bin", "v", source)
+    assert not os.path.samefile(path, source)
+    assert open(path, "rb").read() == open(source, "rb").read()
+    assert os.listdir(tmp_path / "cache" / "blobs") == [os.path.basename(path)]
+
+
+def test_changed_blob_is_dropped(cache, tmp_path):
+    source = write(tmp_path, "a.bin", 1000)
+    cache.put("m1", "a.bin", "v", source)
+    with open(source, "ab") as file:
+        file.write(b"edited")
+    assert cache.lookup("m1", "a.bin", "v") is None
+
+
+def test_empty_cache_is_not_created(tmp_path):
+    cache = FileCache(str(tmp_path / "cache"))
+    assert cache.validator("m1", "a.bin") is None
+    assert cache.size() == 0
+    assert not os.path.exists(tmp_path / "cache")
+
+
+def test_new_version_replaces_old(cache, tmp_path):
+    cache.put("m1", "a.bin", '"v1"', write(tmp_path, "a.bin", 1000))
+    cache.put("m1", "a.bin", '"v2"', write(tmp_path, "a.bin", 500))
+    assert cache.size() == 500
+    assert cache.lookup("m1", "a.bin", '"v1"') is None
+    assert len(os.listdir(tmp_path / "cache" / "blobs")) == 1
+
+
+def test_least_recently_used_is_evicted(cache, tmp_path):
+    for name in ("a", "b", "c"):
+        cache.put("m1", name, "v", write(tmp_path, name, 1000))
+    cache.lookup("m1", "a", "v")
+    cache.put("m1", "d", "v", write(tmp_path, "d", 1000))
+    assert cache.size() == 3000
+    assert cache.lookup("m1", "b", "v") is None
+    assert all(cache.lookup("m1", name, "v") for name in ("a", "c", "d"))
+
+
+def test_file_over_cap_is_not_cached(cache, tmp_path):
+    assert cache.put("m1", "big", "v", write(tmp_path, "big", 4000)) is None
+    assert cache.size() == 0
+
+
+def test_missing_blob_is_dropped(cache, tmp_path):
+    os.remove(cache.put("m1", "a", "v", write(tmp_path, "a", 1000)))
+    assert cache.lookup("m1", "a", "v") is None
+    assert cache.validator("m1", "a") is None
+
+
+def test_discard(cache, tmp_path):
+    cache.put("m1", "a", "v", write(tmp_path, "a", 1000))
+    cache.put("m1", "b", "v", write(tmp_path, "b", 1000))
+    cache.discard("m1", "a")
+    cache.discard("m1", "missing")
+    assert cache.lookup("m1", "a", "v") is None
+    assert cache.size() == 1000
+    assert len(os.listdir(tmp_path / "cache" / "blobs")) == 1
+
+
+def test_clear(cache, tmp_path):
+    cache.put("m1", "a", "v", write(tmp_path, "a", 1000))
+    cache.clear()
+    assert cache.size() == 0
+    assert os.listdir(tmp_path / "cache" / "blobs") == []
@@ -0,0 +1,57 @@
+import hashlib
+
+import pytest
+
+from src.utils.file_digest import digest_files, file_digest
+
+
+@pytest.fixture
+def weights(tmp_path):
+    path = tmp_path / "weights.bin"
+    path.write_bytes(bytes(range(256)) * 10)
+    return path
+
+
+@pytest.mark.parametrize("algorithm", ["sha256", "blake2b"])
+def test_file_digest(weights, algorithm):
+    content = weights.read_bytes()
+    result = file_digest(str(weights), algorithm)
+    assert result == {
+        "algorithm": algorithm,
+        "digest": hashlib.new(algorithm, content).hexdigest(),
+        "part_digests": [],
+    }
+
+
+def test_file_digest_parts(weights, monkeypatch):
+    monkeypatch.setattr("src.utils.file_digest.DIGEST_BLOCK_SIZE", 100)
+    content = weights.read_bytes()
+    result = file_digest(str(weights), part_size=1024)
+    assert result["digest"] == hashlib.sha256(content).hexdigest()
+    assert result["part_digests"] == [
+        hashlib.sha256(content[i : i + 1024]).hexdigest() for i in (0, 1024, 2048)
+    ]
+
+
+def test_file_digest_empty_file(tmp_path):
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    result = file_digest(str(empty), part_size=1024)
+    assert result["digest"] == hashlib.sha256(b"").hexdigest()
+    assert result["part_digests"] == [hashlib.sha256(b"").hexdigest()]
+
+
+def test_digest_files_in_processes(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"shard-{i}.bin"
+        path.write_bytes(bytes([i]) * (1000 * (i + 1)))
+        paths.append(str(path))
+    done = []
+    results = digest_files(
+        [*paths, str(tmp_path / "gone.bin")], workers=2, on_done=done.append
+    )
+    for path in paths:
+        assert results[path] == file_digest(path)
+    assert isinstance(results[str(tmp_path / "gone.bin")], OSError)
+    assert sorted(done) == sorted(results)
@@ -0,0 +1,75 @@
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.file_digest import file_digest
+from src.utils.hash_index import HashIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = HashIndex(str(tmp_path / "index" / "hash-index.sqlite"))
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def weights(tmp_path):
+    path = tmp_path / "weights.bin"
+    path.write_bytes(b"w" * 3000)
+    os.utime(path, ns=(10**18, 10**18))  # old enough to be recorded
+    return path
+
+
+def test_unchanged_file_is_not_rehashed(index, weights):
+    with patch("src.utils.hash_index.file_digest", wraps=file_digest) as hashed:
+        first = index.digest(str(weights), part_size=1024)
+        second = index.digest(str(weights), part_size=1024)
+    assert first == second == file_digest(str(weights), part_size=1024)
+    assert hashed.call_count == 1
+
+
+def test_changed_file_is_rehashed(index, weights):
+    index.digest(str(weights))
+    weights.write_bytes(b"v" * 3000)
+    os.utime(weights, ns=(10**18 + 1, 10**18 + 1))
+    assert index.digest(str(weights)) == file_digest(str(weights))
+
+
+def test_entries_are_per_part_size(index, weights):
+    index.digest(str(weights))
+    assert index.lookup(str(weights), part_size=1024) is None
+    assert len(index.digest(str(weights), part_size=1024)["part_digests"]) == 3
+
+
+def test_recently_modified_file_is_not_recorded(index, tmp_path):
+    fresh = tmp_path / "fresh.bin"
+    fresh.write_bytes(b"x")
+    index.digest(str(fresh))
+    assert index.lookup(str(fresh)) is None
+
+
+def test_index_is_shared_between_instances(index, weights):
+    index.digest(str(weights))
+    other = HashIndex(index.path)
+    assert other.lookup(str(weights)) == file_digest(str(weights))
+    other.close()
+
+
+def test_concurrent_use(index, tmp_path):
+    paths = []
+    for i in range(8):
+        path = tmp_path / f"file{i}.bin"
+        path.write_bytes(bytes([i]) * 100)
+        os.utime(path, ns=(10**18, 10**18))
+        paths.append(str(path))
+    threads = [
+        threading.Thread(target=index.digest, args=(path,)) for path in paths * 2
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(index.lookup(path) == file_digest(path) for path in paths)
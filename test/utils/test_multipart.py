@@ -0,0 +1,82 @@
+import tracemalloc
+from email.parser import BytesParser
+from email.policy import HTTP
+
+import pytest
+
+from src.utils.multipart import MultipartEncoder, MultipartStreamEncoder
+
+
+def parse(encoder, body):
+    head = f"Content-Type: {encoder.content_type}\r\n\r\n".encode()
+    (part,) = BytesParser(policy=HTTP).parsebytes(head + body).iter_parts()
+    return part
+
+
+@pytest.fixture
+def weights(tmp_path):
+    path = tmp_path / "weights.bin"
+    path.write_bytes(bytes(range(256)) * 100)
+    return path
+
+
+def test_encodes_file_field(weights):
+    encoder = MultipartEncoder("file", str(weights), block_size=1000)
+    body = b"".join(encoder)
+    assert len(body) == len(encoder)
+    part = parse(encoder, body)
+    assert part.get_param("name", header="content-disposition") == "file"
+    assert part.get_filename() == "weights.bin"
+    assert part.get_payload(decode=True) == weights.read_bytes()
+
+
+def test_streams_fixed_blocks(weights):
+    blocks = [*MultipartEncoder("file", str(weights), block_size=1000)]
+    assert [len(block) for block in blocks[1:-2]] == [1000] * 25
+    assert len(blocks[-2]) == 600
+
+
+def test_progress_restarts_on_retry(weights):
+    sent = []
+    encoder = MultipartEncoder("file", str(weights), progress=sent.append)
+    for _ in range(2):
+        body = b"".join(encoder)
+    assert sum(sent) == weights.stat().st_size
+    assert parse(encoder, body).get_payload(decode=True) == weights.read_bytes()
+
+
+def test_file_name_is_quoted(weights):
+    encoder = MultipartEncoder("file", str(weights), file_name='a"b.bin')
+    assert b'filename="a%22b.bin"' in b"".join(encoder)
+
+
+def test_memory_stays_flat(tmp_path):
+    big = tmp_path / "big.bin"
+    with open(big, "wb") as file:
+        file.truncate(64 * 1024**2)
+    encoder = MultipartEncoder("file", str(big), block_size=1024**2)
+    tracemalloc.start()
+    try:
+        size = sum(len(block) for block in encoder)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert size == len(encoder)
+    assert peak < 4 * 1024**2
+
+
+def test_stream_encoder_has_no_length(weights):
+    with open(weights, "rb") as stream:
+        encoder = MultipartStreamEncoder("file", stream, "piped.bin", block_size=1000)
+        assert not hasattr(encoder, "__len__")
+        part = parse(encoder, b"".join(encoder))
+    assert part.get_filename() == "piped.bin"
+    assert part.get_payload(decode=True) == weights.read_bytes()
+
+
+def test_stream_encoder_cannot_retry(weights):
+    with open(weights, "rb") as stream:
+        encoder = MultipartStreamEncoder("file", stream, "piped.bin")
+        b"".join(encoder)
+        with pytest.raises(IOError):
+            b"".join(encoder)
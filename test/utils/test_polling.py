@@ -0,0 +1,14 @@
+from src.utils.helpers.polling import AdaptiveInterval
+
+
+def test_interval_backs_off_to_maximum():
+    interval = AdaptiveInterval(initial=1, maximum=3, factor=2)
+    assert [interval.next() for _ in range(4)] == [1, 2, 3, 3]
+
+
+def test_interval_resets_on_progress():
+    interval = AdaptiveInterval(initial=1, maximum=8, factor=2)
+    interval.next()
+    interval.next()
+    assert interval.next(progressed=True) == 1
+    assert interval.next() == 2
@@ -0,0 +1,13 @@
+from src.utils.progress import transfer_progress
+
+
+def test_transfer_progress(capsys):
+    with transfer_progress("weights.bin", total=2048) as advance:
+        advance(1024)
+        advance(1024)
+    assert "weights.bin" in capsys.readouterr().out
+
+
+def test_transfer_progress_unknown_total():
+    with transfer_progress("stdin") as advance:
+        advance(10)
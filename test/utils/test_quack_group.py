@@ -0,0 +1,87 @@
+import json
+import subprocess
+import sys
+
+import click
+from click.testing import CliRunner
+
+from src.commands import COMMANDS
+from src.main import quack
+from src.utils.deadline import get_deadline, set_deadline
+from src.utils.groups.quack_group import QuackGroup
+
+
+HEAVY_MODULES = ("requests", "rich", "pyfiglet", "click_spinner", "keyring")
+
+
+def _loaded_modules(*args, modules=HEAVY_MODULES):
+    code = (
+        "import json, sys\n"
+        "from src.main import quack\n"
+        "try:\n"
+        f"    quack({list(args)!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(json.dumps([m for m in {modules!r} if m in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_manifest_entries_resolve_to_commands():
+    ctx = click.Context(quack)
+    for name in COMMANDS:
+        cmd = quack.get_command(ctx, name)
+        assert isinstance(cmd, click.Command)
+        assert cmd.name == name
+
+
+def test_list_commands_includes_lazy_commands():
+    group = QuackGroup(lazy_subcommands={"metrics": "src.commands.metrics.metrics"})
+    group.add_command(click.Command("eager"))
+    assert group.list_commands(click.Context(group)) == ["eager", "metrics"]
+
+
+def test_get_command_unknown_name():
+    group = QuackGroup(lazy_subcommands={})
+    assert group.get_command(click.Context(group), "missing") is None
+
+
+def test_lazy_command_invokes():
+    group = QuackGroup(lazy_subcommands={"metrics": "src.commands.metrics.metrics"})
+    result = CliRunner().invoke(group, ["metrics"])
+    assert result.exit_code == 0
+    assert "Function not yet supported." in result.output
+
+
+def test_version_does_not_import_heavy_modules():
+    assert _loaded_modules("--version") == []
+
+
+def test_command_imports_only_its_module():
+    loaded = _loaded_modules("metrics")
+    assert "requests" not in loaded
+    assert "keyring" not in loaded
+    # machine commands must not pay for the model-file transfer stack
+    loaded = _loaded_modules(
+        "machine",
+        "--help",
+        modules=("src.api.model_file_api", "src.utils.hash_index", "sqlite3", "mmap"),
+    )
+    assert loaded == []
+
+
+def test_deadline_option_sets_deadline():
+    try:
+        result = CliRunner().invoke(quack, ["--deadline", "12.5", "metrics"])
+        assert result.exit_code == 0
+        assert get_deadline().seconds == 12.5
+    finally:
+        set_deadline(None)
+
+
+def test_deadline_option_rejects_zero():
+    result = CliRunner().invoke(quack, ["--deadline", "0", "metrics"])
+    assert result.exit_code == 2
@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.rate_limiter import (
+    SizedThrottledBody,
+    ThrottledBody,
+    TokenBucket,
+    throttle,
+    throttled,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_burst_then_steady_rate(clock):
+    bucket = TokenBucket(100_000, burst=100_000, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire(100_000) == 0
+    assert bucket.acquire(50_000) == pytest.approx(0.5)
+    assert clock.now == pytest.approx(0.5)
+
+
+def test_idle_time_refills_up_to_burst(clock):
+    bucket = TokenBucket(100_000, burst=100_000, clock=clock, sleep=clock.sleep)
+    bucket.acquire(100_000)
+    clock.now += 60
+    assert bucket.acquire(100_000) == 0
+    assert bucket.acquire(100_000) == pytest.approx(1.0)
+
+
+def test_throttled_splits_into_pieces(clock):
+    bucket = TokenBucket(1_000_000, clock=clock, sleep=clock.sleep)
+    pieces = [*throttled([b"a" * 200_000, b"b" * 10], bucket, block_size=65_536)]
+    assert [len(p) for p in pieces] == [65_536, 65_536, 65_536, 3_392, 10]
+    assert b"".join(pieces) == b"a" * 200_000 + b"b" * 10
+
+
+def test_throttle_keeps_length():
+    bucket = TokenBucket(1_000_000)
+    assert throttle(b"abc", None) == b"abc"
+    sized = throttle(memoryview(b"abc"), bucket)
+    assert isinstance(sized, SizedThrottledBody) and len(sized) == 3
+    unsized = throttle(iter([b"abc"]), bucket)
+    assert type(unsized) is ThrottledBody and not hasattr(unsized, "__len__")
+
+
+def test_shared_across_threads():
+    bucket = TokenBucket(1_000_000, burst=65_536)
+    started = time.monotonic()
+
+    def send():
+        for _ in throttled(b"x" * 100_000, bucket):
+            pass
+
+    threads = [threading.Thread(target=send) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 400 KB at 1 MB/s, less the 64 KiB burst
+    assert time.monotonic() - started >= 0.3
@@ -0,0 +1,46 @@
+import io
+import tarfile
+
+import pytest
+
+from src.utils.tar_stream import TarStream
+
+
+@pytest.fixture
+def files(tmp_path):
+    contents = {
+        "config.json": b'{"hidden_size": 4096}',
+        "tokenizer.model": bytes(range(256)) * 10,
+        "empty.txt": b"",
+        "a-rather-long-file-name-" + "x" * 120 + ".bin": b"long",
+    }
+    for name, content in contents.items():
+        (tmp_path / name).write_bytes(content)
+    return {str(tmp_path / name): content for name, content in contents.items()}
+
+
+def test_archive_unpacks(files):
+    stream = TarStream([*files], block_size=100)
+    body = b"".join(stream)
+    assert len(body) == len(stream)
+    with tarfile.open(fileobj=io.BytesIO(body)) as archive:
+        unpacked = {m.name: archive.extractfile(m).read() for m in archive}
+    assert unpacked == {path.rsplit("/", 1)[1]: c for path, c in files.items()}
+    assert stream.file_size == sum(len(c) for c in files.values())
+
+
+def test_progress_restarts_on_retry(files):
+    sent = []
+    stream = TarStream([*files], progress=sent.append)
+    b"".join(stream)
+    b"".join(stream)
+    assert sum(sent) == stream.file_size
+
+
+def test_file_shrinking_mid_stream_fails(files):
+    path = next(p for p, c in files.items() if c)
+    stream = TarStream([path])
+    with open(path, "wb"):
+        pass
+    with pytest.raises(IOError, match="shrank"):
+        b"".join(stream)